@@ -0,0 +1,199 @@
+# recommend/management/commands/bench_llm.py
+"""
+질문 목록을 동시성 단계별로 Ollama 에 재생하고 처리량 곡선을 출력한다.
+
+    python manage.py bench_llm --concurrency 1,2,4,8
+    python manage.py bench_llm --stub --num-predict 64,128,256
+    python manage.py bench_llm --prompt-pad 0,500,1500 --out bench_llm.json
+
+--stub 을 주면 실제 Ollama 대신 토큰 수에 비례해 sleep 하는 가짜 서버를 띄운다.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from recommend.services import llm
+from recommend.services.conversation import estimate_tokens
+from recommend.services.metrics import percentile, stats_from_response, summarize
+
+DEFAULT_QUESTIONS = Path(__file__).resolve().parents[2] / "data" / "bench_questions.txt"
+
+
+def load_questions(path: Path) -> list[str]:
+    with path.open("r", encoding="utf-8") as f:
+        return [
+            line.strip() for line in f
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+# ---------------------------------------------------
+# 가짜 Ollama 서버
+# ---------------------------------------------------
+class _StubOllama:
+    """
+    /api/chat 흉내. 동시에 parallel 개까지만 처리하고 나머지는 대기시켜서
+    실제 서버처럼 동시성이 올라가면 지연이 늘어나는 모양을 만든다.
+    """
+
+    def __init__(self, parallel: int, prompt_tps: float, eval_tps: float):
+        self.slots = threading.Semaphore(parallel)
+        self.prompt_tps = prompt_tps
+        self.eval_tps = eval_tps
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                data = stub.respond(body)
+                raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/chat"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def respond(self, body: dict) -> dict:
+        prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in body.get("messages", []))
+        output_tokens = int(body.get("options", {}).get("num_predict", 256))
+        prompt_s = prompt_tokens / self.prompt_tps
+        eval_s = output_tokens / self.eval_tps
+        with self.slots:
+            time.sleep(prompt_s + eval_s)
+        ns = 1_000_000_000
+        return {
+            "model": body.get("model", ""),
+            "message": {"role": "assistant", "content": "(stub) " + "토큰 " * output_tokens},
+            "done": True,
+            "prompt_eval_count": prompt_tokens,
+            "eval_count": output_tokens,
+            "load_duration": 0,
+            "prompt_eval_duration": int(prompt_s * ns),
+            "eval_duration": int(eval_s * ns),
+            "total_duration": int((prompt_s + eval_s) * ns),
+        }
+
+    def close(self):
+        self.server.shutdown()
+
+
+class Command(BaseCommand):
+    help = "질문 목록을 동시성별로 Ollama 에 재생해서 지연/처리량을 측정한다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--questions", type=Path, default=DEFAULT_QUESTIONS)
+        parser.add_argument("--stock", default="삼성전자", help="system 프롬프트에 넣을 종목명")
+        parser.add_argument("--concurrency", default="1,2,4,8")
+        parser.add_argument("--num-predict", default="256")
+        parser.add_argument("--prompt-pad", default="0", help="프롬프트 길이 실험용 추가 글자 수 목록")
+        parser.add_argument("--repeat", type=int, default=1, help="질문 목록 반복 횟수")
+        parser.add_argument("--url", default=None, help="Ollama /api/chat URL (기본: llm.OLLAMA_API_URL)")
+        parser.add_argument("--stub", action="store_true", help="가짜 Ollama 서버 사용")
+        parser.add_argument("--stub-parallel", type=int, default=2)
+        parser.add_argument("--stub-prompt-tps", type=float, default=2000.0)
+        parser.add_argument("--stub-eval-tps", type=float, default=400.0)
+        parser.add_argument("--out", type=Path, default=None, help="결과 JSON 저장 경로")
+
+    def handle(self, *args, **opts):
+        questions = load_questions(opts["questions"]) * opts["repeat"]
+        stub = None
+        if opts["stub"]:
+            stub = _StubOllama(opts["stub_parallel"], opts["stub_prompt_tps"], opts["stub_eval_tps"])
+            llm.OLLAMA_API_URL = stub.url
+        elif opts["url"]:
+            llm.OLLAMA_API_URL = opts["url"]
+
+        system_prompt = llm.build_system_prompt(opts["stock"])
+        results = []
+        try:
+            for pad in _int_list(opts["prompt_pad"]):
+                padding = "\n" + "참고 자료 " * (pad // 6) if pad else ""
+                for num_predict in _int_list(opts["num_predict"]):
+                    for concurrency in _int_list(opts["concurrency"]):
+                        row = self._run_level(
+                            questions, system_prompt + padding, num_predict, concurrency
+                        )
+                        row["prompt_pad"] = pad
+                        results.append(row)
+                        self._print_row(row)
+        finally:
+            if stub:
+                stub.close()
+
+        if opts["out"]:
+            with opts["out"].open("w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Saved benchmark results to: {opts['out']}")
+
+    def _run_level(self, questions, system_prompt, num_predict, concurrency) -> dict:
+        # LLM_METRICS 는 최근 MAX_RECORDS 건만 들고 있는 공용 버퍼라서, 이 단계의 결과는 여기서 따로 모은다
+        records = []
+        errors = 0
+        lock = threading.Lock()
+
+        def one(question):
+            nonlocal errors
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": question},
+            ]
+            t = time.perf_counter()
+            try:
+                data = llm.chat(messages, num_predict=num_predict, route="bench")
+            except Exception as e:
+                with lock:
+                    errors += 1
+                self.stderr.write(f"[bench] 요청 실패: {e}")
+                return
+            stats = stats_from_response(data, (time.perf_counter() - t) * 1000, route="bench")
+            with lock:
+                records.append(stats)
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, questions))
+        elapsed = time.perf_counter() - t0
+
+        output_tokens = sum(r.output_tokens for r in records)
+        row = {
+            "concurrency": concurrency,
+            "num_predict": num_predict,
+            "requests": len(questions),
+            "errors": errors,
+            "elapsed_s": elapsed,
+            "requests_per_sec": len(records) / elapsed if elapsed else 0.0,
+            "output_tokens_per_sec": output_tokens / elapsed if elapsed else 0.0,
+            "wall_ms_p99": percentile([r.wall_ms for r in records], 99),
+        }
+        row.update(summarize(records))
+        return row
+
+    def _print_row(self, row: dict):
+        self.stdout.write(
+            f"pad={row['prompt_pad']:>5} num_predict={row['num_predict']:>4} "
+            f"conc={row['concurrency']:>3} | "
+            f"{row['requests_per_sec']:6.2f} req/s "
+            f"{row['output_tokens_per_sec']:8.1f} out tok/s | "
+            f"prompt={row.get('prompt_tokens_avg', 0):6.0f}tok "
+            f"ttft p50={row.get('ttft_ms_p50', 0):7.0f}ms "
+            f"wall p50={row.get('wall_ms_p50', 0):7.0f}ms p95={row.get('wall_ms_p95', 0):7.0f}ms "
+            f"errors={row['errors']}"
+        )
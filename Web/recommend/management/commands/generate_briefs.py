@@ -0,0 +1,112 @@
+# recommend/management/commands/generate_briefs.py
+"""
+analyze.py 가 company_scores.json 을 갱신한 뒤 실행하는 배치 작업.
+기사가 많이 잡힌 상위 N개 종목의 짧은 AI 브리핑을 미리 만들어 data/briefs.json 에 저장한다.
+
+    python manage.py generate_briefs --top 200 --concurrency 2
+    python manage.py generate_briefs --companies 삼성전자,SK하이닉스
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recommend.services import llm
+from recommend.services.briefs import load_briefs, make_version_tag, save_briefs
+from recommend.services.sentiment import get_all_scores, get_scores_version
+
+BRIEF_QUESTION = (
+    "이 종목의 최근 뉴스 흐름을 바탕으로 오늘의 투자 브리핑을 작성해라. "
+    "호재/악재 요인과 주의할 리스크를 포함해서 5문장 이내로."
+)
+BRIEF_NUM_PREDICT = 200
+# 중간 저장 간격 (끊겨도 다시 돌리면 이어서 생성)
+SAVE_EVERY = 20
+
+
+def pick_companies(top_n: int) -> list[str]:
+    """
+    기사 수(커버리지) 기준 상위 N개. 같으면 점수 절댓값이 큰 쪽을 우선.
+    """
+    scores = get_all_scores()
+    ranked = sorted(
+        scores.items(),
+        key=lambda kv: (kv[1].get("total_articles", 0), abs(kv[1].get("company_score", 0))),
+        reverse=True,
+    )
+    return [name for name, _ in ranked[:top_n]]
+
+
+def generate_brief(name: str) -> str:
+    messages = [
+        {"role": "system", "content": llm.build_system_prompt(name)},
+        {"role": "user", "content": llm.build_user_message(BRIEF_QUESTION, name)},
+    ]
+    data = llm.chat(
+        messages,
+        num_predict=BRIEF_NUM_PREDICT,
+        model=llm.FULL_MODEL_NAME,
+        route="brief",
+        timeout=300,
+    )
+    return llm.answer_text(data)
+
+
+class Command(BaseCommand):
+    help = "상위 종목의 AI 브리핑을 미리 생성해서 data/briefs.json 에 저장한다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=100, help="브리핑할 종목 수")
+        parser.add_argument("--companies", default="", help="쉼표로 구분한 종목명 (지정하면 --top 무시)")
+        parser.add_argument("--concurrency", type=int, default=2, help="동시에 보낼 Ollama 요청 수")
+        parser.add_argument("--force", action="store_true", help="같은 버전 브리핑이 있어도 다시 생성")
+
+    def handle(self, *args, **opts):
+        scores_version = get_scores_version()
+        if not scores_version:
+            raise CommandError("회사 점수(data/company_scores.json)가 로드되지 않아 브리핑 버전을 정할 수 없습니다.")
+        version = make_version_tag(scores_version, llm.FULL_MODEL_NAME)
+        if opts["companies"]:
+            names = [n.strip() for n in opts["companies"].split(",") if n.strip()]
+        else:
+            names = pick_companies(opts["top"])
+
+        # 같은 버전으로 이미 만든 브리핑은 재사용 (중간에 끊겼다 다시 돌릴 때)
+        existing = load_briefs()
+        briefs = {}
+        if existing.get("version") == version and not opts["force"]:
+            briefs = dict(existing.get("briefs", {}))
+        todo = [n for n in names if n not in briefs]
+
+        self.stdout.write(
+            f"Generating briefs: version={version} targets={len(names)} "
+            f"todo={len(todo)} concurrency={opts['concurrency']}"
+        )
+
+        t0 = time.perf_counter()
+        failed = 0
+        with ThreadPoolExecutor(max_workers=opts["concurrency"]) as pool:
+            futures = {pool.submit(generate_brief, name): name for name in todo}
+            for idx, future in enumerate(as_completed(futures), start=1):
+                name = futures[future]
+                try:
+                    text = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"[WARN] {name} 브리핑 실패: {e}")
+                    continue
+                if text:
+                    briefs[name] = {
+                        "text": text,
+                        "generated_at": datetime.now().isoformat(timespec="seconds"),
+                    }
+                self.stdout.write(f"[{idx}/{len(todo)}] {name}")
+                if idx % SAVE_EVERY == 0:
+                    save_briefs(version, llm.FULL_MODEL_NAME, briefs)
+
+        save_briefs(version, llm.FULL_MODEL_NAME, briefs)
+        self.stdout.write(
+            f"Saved {len(briefs)} briefs (failed={failed}) "
+            f"in {time.perf_counter() - t0:.1f}s"
+        )
@@ -0,0 +1,101 @@
+# recommend/services/article_labels.py
+"""
+crawling/article_store.py 가 만든 기사별 감성 라벨 저장소(labeled_articles.sqlite3) 읽기 전용 리더.
+(스키마는 crawling/article_store.py 참고. 바꾸면 두 파일을 같이 고칠 것)
+
+(company, label, published_at) 인덱스로 "최근 악재 기사" 조회가 코퍼스를 읽지 않고 1ms 안팎에 끝난다.
+sqlite3 연결은 스레드끼리 공유할 수 없어서 요청 스레드마다 하나씩 연다.
+analyze.py 가 파일을 새로 만들어 교체하면 열린 연결은 예전 파일(inode)을 계속 보므로,
+RELOAD_CHECK_INTERVAL 마다 stat 해서 inode / mtime 이 바뀌었으면 다시 연다. (sentiment.ScoreStore 와 같은 방식)
+"""
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DB_PATH = BASE_DIR / "data" / "labeled_articles.sqlite3"
+
+RECENT_LIMIT = 3
+TITLE_MAX_CHARS = 80
+
+# 파일이 바뀌었는지 stat 으로 확인하는 간격(초)
+RELOAD_CHECK_INTERVAL = 5.0
+
+_local = threading.local()
+
+
+def _stat_key() -> tuple | None:
+    try:
+        st = os.stat(DB_PATH)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns)
+
+
+def _connect() -> sqlite3.Connection | None:
+    conn = getattr(_local, "conn", None)
+    now = time.monotonic()
+    if conn is not None and now - _local.last_check < RELOAD_CHECK_INTERVAL:
+        return conn
+
+    stat_key = _stat_key()
+    if conn is not None:
+        _local.last_check = now
+        if stat_key == _local.stat_key:
+            return conn
+        conn.close()
+        _local.conn = None
+        print("[article_labels] 라벨 저장소가 바뀌어서 다시 엽니다.")
+    if stat_key is None:
+        return None
+
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    _local.conn = conn
+    _local.stat_key = stat_key
+    _local.last_check = now
+    return conn
+
+
+def latest_articles(company: str, label: str | None = None, limit: int = RECENT_LIMIT) -> list[dict]:
+    """
+    회사의 최근 기사 (재전송 기사 제외, 발행 시각 내림차순).
+    label: 'positive' / 'negative' / 'neutral' / None(전체)
+    저장소가 없으면 빈 목록.
+    """
+    conn = _connect()
+    if conn is None:
+        return []
+
+    sql = "SELECT published_at, title, url, label, confidence FROM labeled_articles WHERE company = ?"
+    params: list = [company]
+    if label:
+        sql += " AND label = ?"
+        params.append(label)
+    sql += " AND duplicate_of IS NULL ORDER BY published_at DESC LIMIT ?"
+    params.append(limit)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    except sqlite3.Error as e:
+        print(f"[article_labels] 조회 실패: {e}")
+        return []
+    return [dict(r) for r in rows]
+
+
+def format_recent_negatives(company: str, limit: int = RECENT_LIMIT) -> str | None:
+    """
+    LLM 프롬프트에 넣을 최근 악재 기사 제목 목록.
+    """
+    rows = latest_articles(company, "negative", limit)
+    if not rows:
+        return None
+    lines = []
+    for r in rows:
+        title = r["title"]
+        if len(title) > TITLE_MAX_CHARS:
+            title = title[:TITLE_MAX_CHARS] + "…"
+        day = (r["published_at"] or "")[:10]
+        lines.append(f"- ({day}) {title}" if day else f"- {title}")
+    return "\n".join(lines)
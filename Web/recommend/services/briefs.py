@@ -0,0 +1,68 @@
+# recommend/services/briefs.py
+"""
+generate_briefs 명령이 미리 만들어 둔 종목별 AI 브리핑 조회.
+"이 종목 어때?" 같은 일반 질문은 라이브 생성 대신 여기서 바로 답한다.
+"""
+import json
+import os
+from pathlib import Path
+
+from .sentiment import get_scores_version
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BRIEFS_PATH = BASE_DIR / "data" / "briefs.json"
+
+# 브리핑 프롬프트를 바꾸면 올려서 예전 브리핑이 안 쓰이게 한다
+BRIEF_PROMPT_VERSION = "v1"
+
+_cache = {"mtime": None, "data": {}}
+
+
+def make_version_tag(scores_version: str, model: str) -> str:
+    return f"{scores_version}:{BRIEF_PROMPT_VERSION}:{model}"
+
+
+def load_briefs() -> dict:
+    """
+    briefs.json 을 읽는다. 파일이 바뀐 경우(mtime)에만 다시 파싱.
+    """
+    try:
+        mtime = os.stat(BRIEFS_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if _cache["mtime"] != mtime:
+        try:
+            with BRIEFS_PATH.open("r", encoding="utf-8") as f:
+                _cache["data"] = json.load(f)
+        except Exception as e:
+            print(f"[briefs] briefs.json 로딩 중 오류: {e}")
+            _cache["data"] = {}
+        _cache["mtime"] = mtime
+    return _cache["data"]
+
+
+def get_brief(name: str, model: str) -> str | None:
+    """
+    현재 점수 스냅샷 + 프롬프트 버전 + 모델로 만든 브리핑이 있으면 본문, 없거나 오래됐으면 None.
+    점수가 로드되지 않았으면(버전 없음) 어떤 브리핑이 맞는지 알 수 없으므로 None.
+    """
+    scores_version = get_scores_version()
+    if not scores_version:
+        return None
+    data = load_briefs()
+    if data.get("version") != make_version_tag(scores_version, model):
+        return None
+    brief = data.get("briefs", {}).get(name)
+    return brief.get("text") if brief else None
+
+
+def save_briefs(version: str, model: str, briefs: dict, path: Path | None = None):
+    """
+    임시 파일에 쓴 뒤 교체해서, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 한다.
+    """
+    path = path or BRIEFS_PATH
+    payload = {"version": version, "model": model, "briefs": briefs}
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,117 @@
+# recommend/services/conversation.py
+from dataclasses import dataclass, field, asdict
+from typing import Callable
+
+# 한 번의 요청에 들어가는 프롬프트(system + 요약 + 최근 대화 + 질문) 토큰 예산
+MAX_PROMPT_TOKENS = 1536
+# 요약으로 접지 않고 원문 그대로 유지할 최근 메시지 수 (user/assistant 각각 1개로 계산)
+KEEP_RECENT_MESSAGES = 4
+# 누적 요약문이 너무 길어지지 않도록 자르는 길이
+SUMMARY_MAX_CHARS = 800
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 대략적인 토큰 수 추정.
+    한국어는 대체로 1.5글자당 1토큰 정도라서 넉넉하게 잡는다.
+    """
+    if not text:
+        return 0
+    return int(len(text) / 1.5) + 1
+
+
+@dataclass
+class ConversationState:
+    """
+    세션 하나의 대화 상태.
+    Django 세션(JSON)에 그대로 넣을 수 있도록 기본 타입만 들고 있는다.
+
+    - system 메시지와 summary 는 요약이 일어날 때만 바뀌므로
+      매 턴마다 프롬프트 앞부분(prefix)이 그대로 유지된다.
+      → Ollama가 같은 prefix의 KV 캐시를 재사용해서 prompt eval 시간이 늘지 않음
+    """
+    stock_name: str = ""
+    summary: str = ""
+    messages: list[dict] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "ConversationState":
+        if not data:
+            return cls()
+        return cls(
+            stock_name=data.get("stock_name", ""),
+            summary=data.get("summary", ""),
+            messages=list(data.get("messages", [])),
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def reset(self, stock_name: str = ""):
+        self.stock_name = stock_name
+        self.summary = ""
+        self.messages = []
+
+    def build_messages(self, system_prompt: str, question: str) -> list[dict]:
+        """
+        Ollama /api/chat 에 넘길 messages 구성.
+        순서: system → (이전 대화 요약) → 최근 대화 원문 → 이번 질문
+        """
+        messages = [{"role": "system", "content": system_prompt}]
+        if self.summary:
+            messages.append(
+                {"role": "system", "content": f"[이전 대화 요약]\n{self.summary}"}
+            )
+        messages.extend(self.messages)
+        messages.append({"role": "user", "content": question})
+        return messages
+
+    def prompt_tokens(self, system_prompt: str, question: str) -> int:
+        return sum(
+            estimate_tokens(m["content"])
+            for m in self.build_messages(system_prompt, question)
+        )
+
+    def add_turn(self, question: str, answer: str):
+        self.messages.append({"role": "user", "content": question})
+        self.messages.append({"role": "assistant", "content": answer})
+
+    def compact(
+        self,
+        system_prompt: str,
+        question: str,
+        summarize: Callable[[str, list[dict]], str],
+        max_tokens: int = MAX_PROMPT_TOKENS,
+    ):
+        """
+        예산을 넘으면 오래된 대화를 요약문으로 접는다.
+        매 턴마다 조금씩 접으면 prefix가 계속 바뀌어서 캐시가 깨지므로,
+        넘쳤을 때 최근 KEEP_RECENT_MESSAGES 개만 남기고 한 번에 접는다.
+
+        summarize(이전 요약, 접을 메시지들) -> 새 요약
+        """
+        if self.prompt_tokens(system_prompt, question) <= max_tokens:
+            return
+
+        if len(self.messages) > KEEP_RECENT_MESSAGES:
+            old = self.messages[:-KEEP_RECENT_MESSAGES]
+            self.messages = self.messages[-KEEP_RECENT_MESSAGES:]
+            self.summary = summarize(self.summary, old)[-SUMMARY_MAX_CHARS:]
+
+        # 그래도 넘치면 (질문/답변 자체가 긴 경우) 오래된 메시지부터 버린다
+        while self.messages and self.prompt_tokens(system_prompt, question) > max_tokens:
+            self.messages = self.messages[2:]
+
+
+def extractive_summary(previous: str, messages: list[dict]) -> str:
+    """
+    LLM 요약이 실패했을 때 쓰는 단순 요약.
+    각 메시지의 첫 문장만 모아서 이어 붙인다.
+    """
+    lines = [previous] if previous else []
+    for m in messages:
+        who = "사용자" if m["role"] == "user" else "AI"
+        first = m["content"].strip().split("\n")[0]
+        first = first.split(". ")[0][:120]
+        lines.append(f"- {who}: {first}")
+    return "\n".join(lines)
@@ -1,20 +1,40 @@
 # recommend/services/llm.py
+import re
+import time
+from dataclasses import dataclass
+
 import requests
-from .sentiment import format_sentiment_summary
+from .sentiment import format_sentiment_summary, get_company_score, score_headline
+from .article_labels import format_recent_negatives
+from .conversation import ConversationState, extractive_summary
+from .retrieval import retrieve_snippets
+from .metrics import LLM_METRICS, stats_from_response
+from .briefs import get_brief
 
 OLLAMA_API_URL = "http://localhost:11434/api/chat"
 MODEL_NAME = "bllossom-3b-kor"
 
+# 짧은 질문용 모델 / 열린 분석용 모델.
+# 더 작은 모델(예: 양자화 버전)을 받아두면 FAST_MODEL_NAME 만 바꾸면 된다.
+FAST_MODEL_NAME = MODEL_NAME
+FULL_MODEL_NAME = MODEL_NAME
+
+# 모델 + KV 캐시를 메모리에 붙잡아 두는 시간. 캐시가 살아있어야 prefix 재사용이 됨
+KEEP_ALIVE = "30m"
+# 컨텍스트 길이를 고정해 둬야 요청마다 모델이 다시 로드되지 않는다
+NUM_CTX = 2048
+
 
-def ask_invest_ai(question: str, stock_name: str | None = None) -> str:
+def build_system_prompt(stock_name: str | None = None) -> str:
     """
-    question: 사용자가 입력한 질문
-    stock_name: 현재 선택된 종목명 (예: '삼성전자')
+    system 프롬프트 생성.
+    같은 종목이면 항상 같은 문자열이 나와야 Ollama prefix 캐시가 재사용된다.
     """
-
     sentiment_text = None
+    negatives_text = None
     if stock_name:
         sentiment_text = format_sentiment_summary(stock_name)
+        negatives_text = format_recent_negatives(stock_name)
 
     system_prompt = (
         "너는 'AI 주식 투자 시뮬레이터' 서비스의 한국 주식 투자 상담 AI다.\n"
@@ -25,24 +45,289 @@ def ask_invest_ai(question: str, stock_name: str | None = None) -> str:
 
     if sentiment_text:
         system_prompt += f"\n[뉴스 분석 요약]\n{sentiment_text}\n[요약 끝]\n"
+    if negatives_text:
+        # 분석 데이터를 새로 복사할 때만 바뀌므로 system 에 둬도 prefix 캐시가 유지된다
+        system_prompt += f"\n[최근 악재 기사]\n{negatives_text}\n[목록 끝]\n"
+
+    return system_prompt
+
+
+# 질문 안에 따옴표로 붙여 넣은 기사 제목 (예: '"삼성전자, 사상 최대 실적" 이거 호재야?')
+HEADLINE_PATTERN = re.compile(r"[\"“”'‘’]([^\"“”'‘’]{8,200})[\"“”'‘’]")
+LABEL_NAMES = {"positive": "호재", "negative": "악재", "neutral": "중립"}
+
+
+def extract_headline(question: str) -> str | None:
+    match = HEADLINE_PATTERN.search(question)
+    return match.group(1).strip() if match else None
+
+
+def build_user_message(question: str, stock_name: str | None = None) -> str:
+    """
+    질문에 관련 기사 발췌를 붙인다.
+    발췌는 질문마다 달라지므로 system 이 아니라 user 메시지 쪽에 넣어야
+    앞부분 prefix 캐시가 깨지지 않는다.
+    질문에 기사 제목을 붙여 넣었으면 감성 분류 서버로 바로 채점한 결과도 붙인다.
+    """
+    blocks = []
+
+    headline = extract_headline(question)
+    if headline:
+        scored = score_headline(headline)
+        if scored:
+            blocks.append(
+                f"[기사 감성 분석]\n'{headline}' → {LABEL_NAMES[scored['label']]} "
+                f"(KR-FinBERT 확신도 {scored['score']:.2f})\n[분석 끝]"
+            )
+
+    if stock_name:
+        snippets = retrieve_snippets(stock_name, question)
+        if snippets:
+            joined = "\n".join(f"- {s}" for s in snippets)
+            blocks.append(f"[관련 기사 발췌]\n{joined}\n[발췌 끝]")
+
+    if not blocks:
+        return question
+    return "\n\n".join(blocks) + f"\n\n{question}"
 
+
+def chat(
+    messages: list[dict],
+    num_predict: int = 256,
+    model: str = MODEL_NAME,
+    route: str = "",
+    timeout: int = 60,
+) -> dict:
+    """
+    Ollama /api/chat 호출 후 응답 JSON 그대로 반환. 답변 본문은 answer_text(data).
+    응답 통계(토큰 수, 소요 시간)는 LLM_METRICS 에 기록된다. 실패하면 예외를 그대로 올린다.
+    """
     payload = {
-        "model": MODEL_NAME,
+        "model": model,
         "stream": False,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": question},
-        ],
+        "keep_alive": KEEP_ALIVE,
+        "messages": messages,
         "options": {
             "temperature": 0.3,
-            "num_predict": 256,
+            "num_predict": num_predict,
+            "num_ctx": NUM_CTX,
         },
     }
+    t0 = time.perf_counter()
+    resp = requests.post(OLLAMA_API_URL, json=payload, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.json()
+    wall_ms = (time.perf_counter() - t0) * 1000
+    LLM_METRICS.record(stats_from_response(data, wall_ms, route=route))
+    return data
+
 
+def answer_text(data: dict) -> str:
+    return data.get("message", {}).get("content", "").strip()
+
+
+def summarize_turns(previous: str, messages: list[dict]) -> str:
+    """
+    오래된 대화를 짧은 요약으로 접는다. (ConversationState.compact 에서 사용)
+    LLM 호출이 실패하면 단순 발췌 요약으로 대신한다.
+    """
+    dialog = "\n".join(
+        f"{'사용자' if m['role'] == 'user' else 'AI'}: {m['content']}"
+        for m in messages
+    )
+    prompt = (
+        "아래 이전 요약과 대화를 합쳐서, 이후 상담에 필요한 사실과 사용자 관심사만 "
+        "3~5줄로 요약해라.\n"
+        f"[이전 요약]\n{previous or '없음'}\n[대화]\n{dialog}"
+    )
     try:
-        resp = requests.post(OLLAMA_API_URL, json=payload, timeout=60)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("message", {}).get("content", "").strip()
+        data = chat([{"role": "user", "content": prompt}], num_predict=128, model=FAST_MODEL_NAME, route="summary")
+        summary = answer_text(data)
+        if summary:
+            return summary
+    except Exception as e:
+        print(f"[llm] 대화 요약 실패, 발췌 요약 사용: {e}")
+    return extractive_summary(previous, messages)
+
+
+# ---------------------------------------------------
+# 질문 난이도별 라우팅
+# ---------------------------------------------------
+@dataclass(frozen=True)
+class Route:
+    name: str
+    model: str | None      # None 이면 LLM 없이 데이터로 바로 답함
+    num_predict: int
+    use_retrieval: bool
+
+
+ROUTES = {
+    "data": Route("data", None, 0, False),
+    "brief": Route("brief", None, 0, False),
+    "fast": Route("fast", FAST_MODEL_NAME, 128, False),
+    "full": Route("full", FULL_MODEL_NAME, 256, True),
+}
+
+# 이 길이 이하의 질문은 분석 키워드가 없으면 fast 로 보낸다
+SHORT_QUESTION_CHARS = 25
+
+# 있으면 무조건 full 로 보내는 열린 분석 키워드
+ANALYSIS_KEYWORDS = (
+    "왜", "어때", "전략", "분석", "전망", "비교", "리스크", "위험", "사도", "팔아",
+    "매수", "매도", "투자", "영향", "장기", "단기", "포트폴리오", "추천", "설명",
+)
+
+# (키워드들, 시세 키, 표시 이름, 단위) — 시세 데이터로 바로 답할 수 있는 질문
+QUOTE_FIELDS = (
+    (("등락률", "변동률", "몇 퍼센트", "몇%"), "change_rate", "전일 대비 등락률", "%"),
+    (("전일 대비", "얼마나 올", "얼마나 떨어", "얼마나 내"), "change", "전일 대비", "원"),
+    (("시가",), "open", "시가", "원"),
+    (("고가",), "high", "고가", "원"),
+    (("저가",), "low", "저가", "원"),
+    (("거래량",), "volume", "거래량", "주"),
+    (("현재가", "주가", "가격", "얼마야", "얼마에"), "price", "현재가", "원"),
+)
+# 시세 키워드를 포함하지만 다른 뜻인 말. 이런 말이 있으면 시세로 바로 답하지 않는다 ("시가총액" ≠ 시가)
+QUOTE_NON_FIELDS = ("시가총액", "시총", "저가매수", "저가주", "고가주", "주가지수")
+# 미리 만든 종목 브리핑으로 답할 수 있는 일반적인 질문
+BRIEF_KEYWORDS = ("어때", "어떤가", "괜찮아", "괜찮을까", "전망", "브리핑", "요약해")
+# 종목 이름 + 브리핑 키워드 외에 이것만 남으면 일반적인 질문으로 본다 (긴 말 먼저)
+BRIEF_FILLERS = ("요즘", "지금", "오늘", "앞으로", "좀", "요", "은", "는", "이", "가")
+SENTIMENT_KEYWORDS = ("뉴스 점수", "감성 점수", "호재 몇", "악재 몇", "기사 몇")
+
+
+def match_quote_fields(q: str) -> list[tuple[str, str, str]]:
+    """
+    (공백 뺀) 질문에 나온 시세 항목들 (시세 키, 표시 이름, 단위). QUOTE_FIELDS 순서.
+    긴 키워드부터 맞추고 맞은 부분은 지워서, 짧은 키워드가 긴 말 안에서 다시 잡히지 않게 한다.
+    시세 데이터에 없는 항목(시가총액 등)을 묻는 질문이면 빈 목록 (→ LLM 으로)
+    """
+    if any(word in q for word in QUOTE_NON_FIELDS):
+        return []
+    keywords = sorted(
+        ((k.replace(" ", ""), i) for i, (ks, *_) in enumerate(QUOTE_FIELDS) for k in ks),
+        key=lambda x: -len(x[0]),
+    )
+    found = set()
+    for k, i in keywords:
+        if k in q:
+            found.add(i)
+            q = q.replace(k, "|")
+    return [QUOTE_FIELDS[i][1:] for i in sorted(found)]
+
+
+def brief_for_generic_question(question: str, stock_name: str | None) -> str | None:
+    """
+    "삼성전자 요즘 어때?" 처럼 종목 이름 + 일반적인 물음뿐인 질문이면 미리 만든 브리핑.
+    다른 내용("배당 정책 어때")이 붙어 있거나 브리핑이 없으면 None.
+    """
+    if not stock_name or not any(k in question for k in BRIEF_KEYWORDS):
+        return None
+    rest = question.replace(stock_name, "")
+    for word in BRIEF_KEYWORDS + BRIEF_FILLERS:
+        rest = rest.replace(word, "")
+    if re.sub(r"[\s?!.~,]", "", rest):
+        return None
+    return get_brief(stock_name, FULL_MODEL_NAME)
+
+
+def answer_from_data(question: str, stock_name: str | None, quote: dict | None) -> str | None:
+    """
+    시세/뉴스 점수만으로 답할 수 있는 단순 조회 질문이면 템플릿 답변, 아니면 None.
+    """
+    if not stock_name:
+        return None
+    q = question.replace(" ", "")
+
+    if quote:
+        parts = []
+        for key, label, unit in match_quote_fields(q):
+            if quote.get(key) not in (None, ""):
+                parts.append(f"{label} {quote[key]}{unit}")
+        if parts:
+            return f"{stock_name} 시세 — " + ", ".join(parts) + " (직전 조회 기준)"
+
+    if any(k.replace(" ", "") in q for k in SENTIMENT_KEYWORDS):
+        if get_company_score(stock_name):
+            return format_sentiment_summary(stock_name)
+    return None
+
+
+def route_question(question: str, stock_name: str | None, quote: dict | None) -> tuple[Route, str | None]:
+    """
+    (Route, 바로 쓸 답변) 반환. 답변은 data/brief 라우트일 때만 채워진다.
+    분석 키워드가 있으면 full 이 기본이고, 종목 이름 + "어때" 같은 일반적인 질문만 브리핑으로 답한다.
+    """
+    has_analysis = any(k in question for k in ANALYSIS_KEYWORDS)
+    short = len(question) <= SHORT_QUESTION_CHARS
+
+    if not has_analysis and short:
+        answer = answer_from_data(question, stock_name, quote)
+        if answer:
+            return ROUTES["data"], answer
+
+    brief = brief_for_generic_question(question, stock_name)
+    if brief:
+        return ROUTES["brief"], brief
+
+    if not has_analysis and short:
+        return ROUTES["fast"], None
+    return ROUTES["full"], None
+
+
+def ask_invest_ai(
+    question: str,
+    stock_name: str | None = None,
+    conversation: ConversationState | None = None,
+    quote: dict | None = None,
+) -> str:
+    """
+    question: 사용자가 입력한 질문
+    stock_name: 현재 선택된 종목명 (예: '삼성전자')
+    conversation: 세션별 대화 상태. 주면 이전 대화를 이어서 답하고 이번 턴을 기록한다.
+    quote: 직전에 조회한 시세 (kis.get_stock_price 결과). 단순 조회 질문은 이걸로 바로 답한다.
+    """
+    route, ready_answer = route_question(question, stock_name, quote)
+    print(
+        f"[router] route={route.name} model={route.model or '-'} "
+        f"num_predict={route.num_predict} len={len(question)}"
+    )
+
+    if conversation is not None and conversation.stock_name != (stock_name or ""):
+        # 종목이 바뀌면 system 프롬프트(뉴스 요약)가 달라지므로 대화를 새로 시작
+        conversation.reset(stock_name or "")
+
+    if ready_answer is not None:
+        if conversation is not None:
+            conversation.add_turn(question, ready_answer)
+        return ready_answer
+
+    system_prompt = build_system_prompt(stock_name)
+    if route.use_retrieval:
+        user_message = build_user_message(question, stock_name)
+    else:
+        user_message = question
+
+    if conversation is None:
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+    else:
+        conversation.compact(system_prompt, user_message, summarize_turns)
+        messages = conversation.build_messages(system_prompt, user_message)
+
+    try:
+        data = chat(
+            messages,
+            num_predict=route.num_predict,
+            model=route.model,
+            route=route.name,
+        )
+        answer = answer_text(data)
     except Exception as e:
         return f"AI 서버 오류: {e}"
+
+    if conversation is not None:
+        conversation.add_turn(question, answer)
+    return answer
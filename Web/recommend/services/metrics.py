@@ -0,0 +1,113 @@
+# recommend/services/metrics.py
+"""
+Ollama 응답에 들어있는 통계(prompt_eval_count, eval_count, *_duration)를
+요청마다 모아두는 곳. 시간 단위는 Ollama 가 ns 로 주는 걸 ms 로 바꿔서 저장한다.
+"""
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+
+# 프로세스당 최근 몇 건까지 들고 있을지
+MAX_RECORDS = 1000
+
+
+@dataclass
+class LLMCallStats:
+    model: str
+    prompt_tokens: int
+    output_tokens: int
+    load_ms: float
+    prompt_eval_ms: float
+    eval_ms: float
+    total_ms: float      # Ollama 가 잰 전체 시간
+    wall_ms: float       # 우리 쪽에서 잰 HTTP 왕복 시간
+    ttft_ms: float       # 첫 토큰까지 (모델 로드 + prompt eval)
+    tokens_per_sec: float
+    route: str = ""
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _ms(ns) -> float:
+    return (ns or 0) / 1_000_000
+
+
+def stats_from_response(data: dict, wall_ms: float, route: str = "") -> LLMCallStats:
+    """
+    /api/chat (stream=False) 응답 JSON 에서 통계만 뽑는다.
+    """
+    eval_ms = _ms(data.get("eval_duration"))
+    output_tokens = data.get("eval_count", 0) or 0
+    load_ms = _ms(data.get("load_duration"))
+    prompt_eval_ms = _ms(data.get("prompt_eval_duration"))
+    return LLMCallStats(
+        model=data.get("model", ""),
+        prompt_tokens=data.get("prompt_eval_count", 0) or 0,
+        output_tokens=output_tokens,
+        load_ms=load_ms,
+        prompt_eval_ms=prompt_eval_ms,
+        eval_ms=eval_ms,
+        total_ms=_ms(data.get("total_duration")),
+        wall_ms=wall_ms,
+        ttft_ms=load_ms + prompt_eval_ms,
+        tokens_per_sec=(output_tokens / (eval_ms / 1000)) if eval_ms else 0.0,
+        route=route,
+    )
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class MetricsRecorder:
+    def __init__(self, max_records: int = MAX_RECORDS):
+        self._records: deque[LLMCallStats] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, stats: LLMCallStats):
+        with self._lock:
+            self._records.append(stats)
+        print(
+            f"[llm] model={stats.model} route={stats.route or '-'} "
+            f"prompt={stats.prompt_tokens}tok out={stats.output_tokens}tok "
+            f"ttft={stats.ttft_ms:.0f}ms {stats.tokens_per_sec:.1f}tok/s "
+            f"wall={stats.wall_ms:.0f}ms"
+        )
+
+    def snapshot(self) -> list[LLMCallStats]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> dict:
+        records = self.snapshot()
+        return summarize(records)
+
+
+def summarize(records: list[LLMCallStats]) -> dict:
+    if not records:
+        return {"count": 0}
+    wall = [r.wall_ms for r in records]
+    ttft = [r.ttft_ms for r in records]
+    return {
+        "count": len(records),
+        "prompt_tokens_avg": sum(r.prompt_tokens for r in records) / len(records),
+        "output_tokens_avg": sum(r.output_tokens for r in records) / len(records),
+        "tokens_per_sec_avg": sum(r.tokens_per_sec for r in records) / len(records),
+        "ttft_ms_p50": percentile(ttft, 50),
+        "ttft_ms_p95": percentile(ttft, 95),
+        "wall_ms_p50": percentile(wall, 50),
+        "wall_ms_p95": percentile(wall, 95),
+    }
+
+
+# 프로세스 전역 recorder
+LLM_METRICS = MetricsRecorder()
@@ -0,0 +1,222 @@
+# recommend/services/retrieval.py
+"""
+crawling/build_news_index.py 로 만든 기사 인덱스에서
+선택된 종목의 관련 기사 발췌(top-k)를 찾는다.
+
+- embeddings.npy 는 mmap 으로 열어서 워커끼리 page cache 를 공유
+- 종목별 행 범위만 내적하므로 검색 자체는 1ms 미만, 대부분은 질의 임베딩 시간
+- 질의 임베딩은 EMBED_TIMEOUT_MS 안에 끝나야 쓰고, 넘거나 실패하면 기다리지 않고 종목 대표 벡터(그 종목 청크 평균)로
+  찾는다. 그러면 EMBED_BACKOFF_SECONDS 동안은 임베딩을 부르지 않음. 같은 질의의 임베딩은 캐시
+- 벡터 검색(내적 + 청크 읽기)은 SEARCH_BUDGET_MS 안에 끝나야 정상. 넘으면 로그에 남긴다
+- 인덱스 / 파일 오류는 삼키고 빈 목록을 돌려준다 (답변은 발췌 없이 만들어짐)
+
+인덱스 위치는 NEWS_INDEX_DIR 환경 변수로 바꿀 수 있다.
+(crawling/build_news_index.py --out 과 같은 경로를 주면 복사 없이 바로 읽음)
+빌더는 새 버전 디렉터리를 만들고 심볼릭 링크를 바꿔 끼우므로, RELOAD_CHECK_INTERVAL 마다 meta.json 을 stat 해서
+바뀌었으면 링크가 가리키는 새 디렉터리를 다시 연다. (열려 있던 예전 버전 파일은 건드리지 않음)
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import requests
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+INDEX_DIR = Path(os.environ.get("NEWS_INDEX_DIR") or BASE_DIR / "data" / "news_index")
+
+OLLAMA_EMBED_URL = "http://localhost:11434/api/embed"
+TOP_K = 3
+SNIPPET_MAX_CHARS = 200
+# 질의 임베딩(Ollama bge-m3, CPU) 제한 시간. 이보다 늦으면 기다리지 않고 종목 대표 벡터로 검색
+EMBED_TIMEOUT_MS = int(os.environ.get("NEWS_EMBED_TIMEOUT_MS") or 400)
+# 임베딩을 뺀 벡터 검색 예산. 종목 행 범위만 내적하므로 보통 1ms 안팎
+SEARCH_BUDGET_MS = 20
+EMBED_BACKOFF_SECONDS = 60
+QUERY_CACHE_SIZE = 1024
+# 인덱스가 바뀌었는지 stat 으로 확인하는 간격(초)
+RELOAD_CHECK_INTERVAL = 5.0
+
+
+class NewsIndex:
+    def __init__(self, index_dir: Path):
+        # 링크가 다른 버전으로 바뀌어도 chunks.jsonl 을 같은 버전에서 읽도록 실제 디렉터리로 고정
+        index_dir = index_dir.resolve()
+        with (index_dir / "meta.json").open("r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.embeddings = np.load(index_dir / "embeddings.npy", mmap_mode="r")
+        self.offsets = np.load(index_dir / "chunk_offsets.npy", mmap_mode="r")
+        self.chunks_path = index_dir / "chunks.jsonl"
+        self.companies = self.meta.get("companies", {})
+        self.model = self.meta.get("model")
+        self._centroids: dict[str, np.ndarray] = {}
+
+    def centroid(self, company: str) -> np.ndarray | None:
+        """
+        종목 청크 임베딩 평균 (질의 임베딩을 못 쓸 때 검색 벡터). 종목당 한 번 계산해서 보관
+        """
+        vec = self._centroids.get(company)
+        if vec is None:
+            span = self.companies.get(company)
+            if not span:
+                return None
+            start, end = span
+            vec = np.asarray(self.embeddings[start:end], dtype=np.float32).mean(axis=0)
+            norm = np.linalg.norm(vec)
+            vec = vec / norm if norm else vec
+            self._centroids[company] = vec
+        return vec
+
+    def _read_chunk(self, f, row: int) -> dict:
+        start = int(self.offsets[row])
+        end = int(self.offsets[row + 1])
+        f.seek(start)
+        return json.loads(f.read(end - start).decode("utf-8"))
+
+    def search(self, company: str, query_vec: np.ndarray, k: int = TOP_K) -> list[dict]:
+        span = self.companies.get(company)
+        if not span:
+            return []
+        start, end = span
+        block = self.embeddings[start:end]
+        scores = block @ query_vec.astype(block.dtype)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        with self.chunks_path.open("rb") as f:
+            for i in top:
+                chunk = self._read_chunk(f, start + int(i))
+                chunk["score"] = float(scores[i])
+                results.append(chunk)
+        return results
+
+
+def _meta_key() -> tuple | None:
+    try:
+        st = os.stat(INDEX_DIR / "meta.json")
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns)
+
+
+_INDEX: NewsIndex | None = None
+_index_key: tuple | None = None
+_index_lock = threading.Lock()
+_last_check = float("-inf")
+
+
+def get_index() -> NewsIndex | None:
+    """
+    지금 인덱스. meta.json 이 바뀌었으면 새로 열고, 못 열면 기존 인덱스를 그대로 쓴다.
+    """
+    global _INDEX, _index_key, _last_check
+    now = time.monotonic()
+    if now - _last_check < RELOAD_CHECK_INTERVAL:
+        return _INDEX
+    # 다른 스레드가 확인 중이면 기다리지 않고 기존 인덱스 사용
+    if not _index_lock.acquire(blocking=False):
+        return _INDEX
+    try:
+        _last_check = now
+        key = _meta_key()
+        if key is None:
+            if _index_key != ():
+                print(f"[retrieval] 인덱스를 찾을 수 없습니다: {INDEX_DIR}")
+            _index_key = ()
+            return _INDEX
+        if key == _index_key:
+            return _INDEX
+        _index_key = key
+        try:
+            index = NewsIndex(INDEX_DIR)
+        except Exception as e:
+            print(f"[retrieval] 인덱스 로딩 중 오류, 기존 인덱스 유지: {e}")
+            return _INDEX
+        print(f"[retrieval] 기사 인덱스 {'다시 ' if _INDEX else ''}로드 ({index.meta.get('count', 0)}개 청크)")
+        _INDEX = index
+        return _INDEX
+    finally:
+        _index_lock.release()
+
+
+_query_cache: "OrderedDict[tuple[str, str], np.ndarray]" = OrderedDict()
+_cache_lock = threading.Lock()
+_embed_skip_until = 0.0
+
+
+def embed_query(text: str, model: str) -> np.ndarray | None:
+    """
+    질의 임베딩. 캐시에 있으면 바로, 없으면 EMBED_TIMEOUT_MS 안에서만 Ollama 에 요청.
+    늦거나 실패하면 None 이고 EMBED_BACKOFF_SECONDS 동안은 요청하지 않는다.
+    """
+    global _embed_skip_until
+    key = (model, text)
+    with _cache_lock:
+        vec = _query_cache.get(key)
+        if vec is not None:
+            _query_cache.move_to_end(key)
+            return vec
+    if time.monotonic() < _embed_skip_until:
+        return None
+
+    try:
+        resp = requests.post(
+            OLLAMA_EMBED_URL,
+            json={"model": model, "input": [text]},
+            timeout=EMBED_TIMEOUT_MS / 1000,
+        )
+        resp.raise_for_status()
+        vec = np.asarray(resp.json()["embeddings"][0], dtype=np.float32)
+    except Exception as e:
+        print(f"[retrieval] 질의 임베딩 실패, {EMBED_BACKOFF_SECONDS}초 동안 종목 대표 벡터로 검색: {e}")
+        _embed_skip_until = time.monotonic() + EMBED_BACKOFF_SECONDS
+        return None
+    norm = np.linalg.norm(vec)
+    vec = vec / norm if norm else vec
+
+    with _cache_lock:
+        _query_cache[key] = vec
+        if len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return vec
+
+
+def retrieve_snippets(stock_name: str, question: str, k: int = TOP_K) -> list[str]:
+    """
+    종목 + 질문에 맞는 기사 발췌문 목록. 인덱스가 없거나 실패하면 빈 리스트.
+    """
+    try:
+        index = get_index()
+        if not index or stock_name not in index.companies:
+            return []
+
+        t0 = time.perf_counter()
+        query_vec = embed_query(f"{stock_name} {question}", index.model)
+        mode = "query"
+        if query_vec is None:
+            query_vec = index.centroid(stock_name)
+            mode = "centroid"
+        t1 = time.perf_counter()
+        hits = index.search(stock_name, query_vec, k)
+        search_ms = (time.perf_counter() - t1) * 1000
+    except Exception as e:
+        print(f"[retrieval] 검색 실패, 발췌 없이 답변: {e}")
+        return []
+    embed_ms = (t1 - t0) * 1000
+    over = f", 검색 예산 {SEARCH_BUDGET_MS}ms 초과" if search_ms > SEARCH_BUDGET_MS else ""
+    print(
+        f"[retrieval] {stock_name}: {len(hits)}개 발췌 "
+        f"({mode}, embed {embed_ms:.1f}ms, search {search_ms:.1f}ms{over})"
+    )
+
+    snippets = []
+    for hit in hits:
+        date = (hit.get("published_at") or "")[:10]
+        body = hit.get("text", "").split("\n", 1)[-1][:SNIPPET_MAX_CHARS]
+        snippets.append(f"({date}) {hit.get('title', '')}: {body}")
+    return snippets
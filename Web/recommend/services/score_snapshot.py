@@ -0,0 +1,18 @@
+# recommend/services/score_snapshot.py
+"""
+crawling/analyze.py 가 만든 company_scores.bin 읽기 전용 리더.
+형식과 리더(ColumnarScores)는 crawling/score_snapshot.py 한 곳에만 있고, 여기서는 그 모듈을 그대로 가져다 쓴다.
+
+mmap 으로 열기 때문에 JSON 파싱이 없고, 여러 워커 프로세스가 page cache 사본 하나를 같이 쓴다.
+"""
+import sys
+from pathlib import Path
+
+# 저장소 루트의 crawling/ (Web 과 같은 단계에 있음). 웹 모듈 이름을 가리지 않도록 sys.path 맨 뒤에 붙인다
+CRAWLING_DIR = Path(__file__).resolve().parents[3] / "crawling"
+if str(CRAWLING_DIR) not in sys.path:
+    sys.path.append(str(CRAWLING_DIR))
+
+from score_snapshot import COLUMNS, ColumnarScores, read_version  # noqa: E402
+
+__all__ = ["COLUMNS", "ColumnarScores", "read_version"]
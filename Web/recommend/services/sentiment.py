@@ -1,30 +1,179 @@
+import hashlib
 import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 
+import requests
+
+from .score_snapshot import ColumnarScores, read_version
+
 # recommend 폴더 기준
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # 윈도우에서 확장자 숨겨져서 'company_scores'로 보이더라도
 # 실제 파일명은 company_scores.json 인 경우가 많음
 DATA_PATH = BASE_DIR / "data" / "company_scores.json"
+# analyze.py 가 같이 만드는 컬럼형 스냅샷. JSON 보다 오래되지 않았으면 JSON 대신 mmap 으로 읽는다
+BIN_PATH = BASE_DIR / "data" / "company_scores.bin"
+
+# 파일이 바뀌었는지 stat 으로 확인하는 간격(초)
+RELOAD_CHECK_INTERVAL = 5.0
+
+# crawling/sentiment_server.py 주소. 서버가 떠 있지 않으면 score_headline 은 None 을 돌려준다
+SENTIMENT_SERVER_URL = "http://127.0.0.1:8765"
+# 웹 요청 안에서 부르는 것이라 오래 기다리지 않는다
+HEADLINE_TIMEOUT = 2.0
+_LABEL_POINTS = {"positive": 1, "negative": -1, "neutral": 0}
+
+
+@dataclass(frozen=True)
+class ScoreSnapshot:
+    """
+    한 번 로드한 점수 파일. 만들어진 뒤로는 절대 수정하지 않는다.
+    version: 파일 내용 해시 (캐시 키에 붙여서 점수가 바뀌면 캐시가 무효화되게 함)
+    """
+    version: str = ""
+    scores: dict | ColumnarScores = field(default_factory=dict)
+    stat_key: tuple | None = None   # (경로, mtime_ns, size) — 바뀌었는지 비교용
+
+
+def _stat_key(path: Path) -> tuple | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _load_snapshot(path: Path) -> ScoreSnapshot:
+    stat_key = _stat_key(path)
+    if path.suffix == ".bin":
+        # mmap 만 하고 파싱은 없음. 버전은 파일 헤더에 들어있다
+        scores = ColumnarScores(path)
+        return ScoreSnapshot(version=scores.version, scores=scores, stat_key=stat_key)
+
+    raw = path.read_bytes()
+    scores = json.loads(raw.decode("utf-8"))
+    return ScoreSnapshot(
+        version=hashlib.sha1(raw).hexdigest()[:12],
+        scores=scores,
+        stat_key=stat_key,
+    )
+
+
+class ScoreStore:
+    """
+    company_scores.json(또는 .bin) 을 들고 있다가, 파일이 바뀌면 백그라운드에서 새로 읽어서 통째로 교체한다.
+
+    - 읽기 쪽은 self._snapshot 참조 하나만 읽으므로 락이 없다.
+      (파이썬에서 속성 대입은 원자적이라 반쯤 바뀐 상태를 볼 일이 없음)
+    - 파일 확인은 RELOAD_CHECK_INTERVAL 마다 stat 한 번. 파싱은 별도 스레드에서 하므로
+      요청 처리 중에 JSON 파싱 시간을 기다리지 않는다.
+    - analyze.py 가 파일을 쓰는 도중에 읽어서 파싱이 실패하면 기존 스냅샷을 그대로 쓰고 다음 확인 때 다시 시도.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        bin_path: Path | None = None,
+        check_interval: float = RELOAD_CHECK_INTERVAL,
+    ):
+        self.path = path
+        self.bin_path = bin_path
+        self.check_interval = check_interval
+        self._reload_lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._snapshot = ScoreSnapshot()
+        # (JSON stat, bin stat) → JSON 내용이 bin 과 같은지. JSON 이 bin 보다 새로울 때만 확인
+        self._bin_check: tuple[tuple, tuple, bool] | None = None
+
+        try:
+            self._snapshot = _load_snapshot(self._source())
+            print(f"[sentiment] 회사 점수 {len(self._snapshot.scores)}개 로드 완료 (version={self._snapshot.version})")
+        except FileNotFoundError:
+            print(f"[sentiment] 파일을 찾을 수 없습니다: {path}")
+        except Exception as e:
+            print(f"[sentiment] JSON 로딩 중 오류: {e}")
 
-try:
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        COMPANY_SCORES = json.load(f)
-    print(f"[sentiment] 회사 점수 {len(COMPANY_SCORES)}개 로드 완료")
-except FileNotFoundError:
-    print(f"[sentiment] 파일을 찾을 수 없습니다: {DATA_PATH}")
-    COMPANY_SCORES = {}
-except Exception as e:
-    print(f"[sentiment] JSON 로딩 중 오류: {e}")
-    COMPANY_SCORES = {}
+    def _source(self) -> Path:
+        """
+        bin 과 JSON 중 최신 쪽. bin 이 JSON 보다 나중에 쓰였으면 bin,
+        JSON 이 더 새로우면(JSON 만 새로 복사한 경우 등) 내용 해시가 bin 버전과 같을 때만 bin.
+        """
+        bin_key = _stat_key(self.bin_path) if self.bin_path is not None else None
+        if bin_key is None:
+            return self.path
+        json_key = _stat_key(self.path)
+        if json_key is None or bin_key[1] >= json_key[1]:
+            return self.bin_path
+
+        check = self._bin_check
+        if check is None or check[:2] != (json_key, bin_key):
+            try:
+                same = hashlib.sha1(self.path.read_bytes()).hexdigest()[:12] == read_version(self.bin_path)
+            except Exception:
+                same = False
+            check = self._bin_check = (json_key, bin_key, same)
+            if not same:
+                print(f"[sentiment] {self.bin_path.name} 가 {self.path.name} 보다 오래돼서 JSON 을 읽습니다.")
+        return self.bin_path if check[2] else self.path
+
+    def current(self) -> ScoreSnapshot:
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            self._maybe_reload()
+        return self._snapshot
+
+    def _maybe_reload(self):
+        stat_key = _stat_key(self._source())
+        if stat_key is None or stat_key == self._snapshot.stat_key:
+            return
+        # 이미 다른 스레드가 다시 읽는 중이면 그냥 기존 스냅샷 사용
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        threading.Thread(target=self._reload, daemon=True).start()
+
+    def _reload(self):
+        try:
+            snapshot = _load_snapshot(self._source())
+            if snapshot.version != self._snapshot.version:
+                self._snapshot = snapshot
+                print(f"[sentiment] 회사 점수 다시 로드 ({len(snapshot.scores)}개, version={snapshot.version})")
+            else:
+                # 내용은 같고 mtime 만 바뀐 경우. stat 만 갱신해서 계속 다시 읽지 않게 함
+                self._snapshot = ScoreSnapshot(self._snapshot.version, self._snapshot.scores, snapshot.stat_key)
+        except Exception as e:
+            print(f"[sentiment] 점수 다시 로드 실패, 기존 점수 유지: {e}")
+        finally:
+            self._reload_lock.release()
+
+
+SCORE_STORE = ScoreStore(DATA_PATH, BIN_PATH)
+
+
+def get_scores_version() -> str:
+    """
+    현재 로드된 점수 스냅샷 버전. 캐시 키에 붙여서 점수가 바뀌면 캐시가 무효화되게 한다.
+    """
+    return SCORE_STORE.current().version
+
+
+def get_all_scores() -> dict | ColumnarScores:
+    """
+    {회사 이름: 점수 데이터} 전체. (배치 작업용, 수정하지 말 것)
+    """
+    return SCORE_STORE.current().scores
 
 
 def get_company_score(name: str):
     """
     회사 이름으로 점수 데이터 가져오기. 없으면 None.
     """
-    return COMPANY_SCORES.get(name)
+    return SCORE_STORE.current().scores.get(name)
 
 
 def format_sentiment_summary(name: str) -> str | None:
@@ -57,3 +206,27 @@ def format_sentiment_summary(name: str) -> str | None:
         f"호재 {pos}개, 악재 {neg}개, 중립 {neu}개이며 "
         f"종합 점수는 {score}점으로 '{label}' 상태입니다."
     )
+
+
+def score_headline(title: str, content: str = "") -> dict | None:
+    """
+    새 기사 제목(+본문)을 감성 분류 서버로 바로 채점.
+    company_scores.json 에 없는 종목의 속보처럼 배치 분석을 기다릴 수 없을 때 쓴다.
+    반환: {"label": 'positive'/'negative'/'neutral', "score": 확신도, "point": -1/0/+1} 또는 None
+    """
+    try:
+        resp = requests.post(
+            f"{SENTIMENT_SERVER_URL}/classify",
+            json={"articles": [{"title": title, "content": content}]},
+            timeout=HEADLINE_TIMEOUT,
+        )
+        resp.raise_for_status()
+        result = resp.json()["results"][0]
+    except Exception as e:
+        print(f"[sentiment] 헤드라인 감성 분석 실패: {e}")
+        return None
+
+    label = (result.get("label") or "").lower()
+    if label not in _LABEL_POINTS:
+        return None
+    return {"label": label, "score": float(result.get("score", 0.0)), "point": _LABEL_POINTS[label]}
@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from .kis import get_stock_price
 from .services.llm import ask_invest_ai
+from .services.conversation import ConversationState
 
 
 def main(request):
@@ -51,6 +52,13 @@ def main(request):
                     context["api_error"] = True
                     context["api_message"] = result["message"]
                 else:
+                    # LLM 질문 폼에는 종목명이 없으므로 세션에 기억해 둔다
+                    request.session["stock_name"] = result["stock_name"]
+                    # 단순 시세 질문은 LLM 없이 이 값으로 바로 답한다
+                    request.session["quote"] = {
+                        key: result.get(key, "")
+                        for key in ("price", "change", "change_rate", "open", "high", "low", "volume")
+                    }
                     context["stock_name"] = result["stock_name"]
                     context["stock_code"] = result["stock_code"]
                     context["price"] = result["price"]
@@ -72,10 +80,18 @@ def main(request):
         if "llm_question" in request.POST:
             # ⭐ 여기부터 전부 if 안으로 들여쓰기 되어 있어야 함 (공백 4칸)
             question = request.POST.get("llm_question", "").strip()
-            stock_name = context.get("stock_name") or ""  # 직전에 검색한 종목명
+            # 직전에 검색한 종목명 (같은 요청에 없으면 세션에서)
+            stock_name = context.get("stock_name") or request.session.get("stock_name", "")
 
             if question:
-                context["ai_answer"] = ask_invest_ai(question, stock_name=stock_name)
+                conversation = ConversationState.from_dict(request.session.get("conversation"))
+                context["ai_answer"] = ask_invest_ai(
+                    question,
+                    stock_name=stock_name,
+                    conversation=conversation,
+                    quote=request.session.get("quote"),
+                )
+                request.session["conversation"] = conversation.to_dict()
             else:
                 context["api_error"] = True
                 context["api_message"] = "AI에게 물어볼 내용을 입력해 주세요."
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# manage.py 와 같은 위치(Web/)를 import 경로에 넣어서 recommend 패키지를 그대로 import 한다
+WEB_DIR = Path(__file__).resolve().parent.parent
+if str(WEB_DIR) not in sys.path:
+    sys.path.insert(0, str(WEB_DIR))
@@ -0,0 +1,93 @@
+from recommend.services.conversation import (
+    KEEP_RECENT_MESSAGES,
+    SUMMARY_MAX_CHARS,
+    ConversationState,
+    estimate_tokens,
+    extractive_summary,
+)
+
+SYSTEM = "시스템 프롬프트"
+
+
+def make_state(turns: int, text: str = "질문") -> ConversationState:
+    state = ConversationState(stock_name="삼성전자")
+    for i in range(turns):
+        state.add_turn(f"{text} {i}", f"답변 {i}")
+    return state
+
+
+def test_compact_under_budget_keeps_everything():
+    state = make_state(3)
+    calls = []
+    state.compact(SYSTEM, "새 질문", lambda prev, old: calls.append(old) or "요약", max_tokens=10_000)
+    assert calls == []
+    assert len(state.messages) == 6
+    assert state.summary == ""
+
+
+def test_compact_folds_old_messages_into_summary_once():
+    state = make_state(10)
+    folded = []
+
+    def summarize(previous, old):
+        folded.append(list(old))
+        return "요약"
+
+    budget = state.prompt_tokens(SYSTEM, "새 질문") - 1
+    state.compact(SYSTEM, "새 질문", summarize, max_tokens=budget)
+
+    assert len(folded) == 1
+    assert len(folded[0]) == 20 - KEEP_RECENT_MESSAGES
+    assert folded[0][0] == {"role": "user", "content": "질문 0"}
+    assert state.messages == make_state(10).messages[-KEEP_RECENT_MESSAGES:]
+    assert state.summary == "요약"
+    # 요약이 들어간 뒤에도 prefix 는 system → 요약 순서
+    built = state.build_messages(SYSTEM, "새 질문")
+    assert built[0]["content"] == SYSTEM
+    assert built[1]["content"].endswith("요약")
+    assert built[-1] == {"role": "user", "content": "새 질문"}
+
+
+def test_compact_passes_previous_summary_and_truncates_it():
+    state = make_state(6)
+    state.summary = "이전"
+    seen = []
+
+    def summarize(previous, old):
+        seen.append(previous)
+        return "가" * (SUMMARY_MAX_CHARS + 100)
+
+    state.compact(SYSTEM, "q", summarize, max_tokens=1)
+    assert seen == ["이전"]
+    assert len(state.summary) <= SUMMARY_MAX_CHARS
+
+
+def test_compact_drops_oldest_pairs_when_recent_turns_alone_overflow():
+    state = ConversationState()
+    state.add_turn("긴 질문 " * 200, "답변 0")
+    state.add_turn("짧은 질문", "답변 1")
+    budget = state.prompt_tokens(SYSTEM, "q") - 100
+    called = []
+    state.compact(SYSTEM, "q", lambda prev, old: called.append(old) or "", max_tokens=budget)
+    # 최근 KEEP_RECENT_MESSAGES 개 이하라 요약은 안 하고, 오래된 쌍부터 버린다
+    assert called == []
+    assert state.messages == [
+        {"role": "user", "content": "짧은 질문"},
+        {"role": "assistant", "content": "답변 1"},
+    ]
+    assert state.prompt_tokens(SYSTEM, "q") <= budget
+
+
+def test_state_round_trips_through_session_dict():
+    state = make_state(2)
+    state.summary = "요약"
+    assert ConversationState.from_dict(state.to_dict()) == state
+    assert ConversationState.from_dict(None) == ConversationState()
+
+
+def test_extractive_summary_keeps_first_sentence_per_message():
+    text = extractive_summary("이전", [
+        {"role": "user", "content": "첫 문장. 둘째 문장"},
+        {"role": "assistant", "content": "한 줄\n두 줄"},
+    ])
+    assert text == "이전\n- 사용자: 첫 문장\n- AI: 한 줄"
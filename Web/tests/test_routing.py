@@ -0,0 +1,73 @@
+import pytest
+
+from recommend.services import llm
+
+QUOTE = {"price": "71000", "open": "70500", "high": "71500", "low": "70000", "volume": "1234567", "change_rate": "1.2"}
+
+
+@pytest.fixture(autouse=True)
+def no_data_files(monkeypatch):
+    # 브리핑 / 점수 파일 상태와 상관없이 라우팅 규칙만 본다
+    monkeypatch.setattr(llm, "get_brief", lambda name, model: None)
+    monkeypatch.setattr(llm, "get_company_score", lambda name: None)
+
+
+def route_name(question, stock_name="삼성전자", quote=QUOTE):
+    route, _ = llm.route_question(question, stock_name, quote)
+    return route.name
+
+
+def test_quote_question_answered_from_data():
+    route, answer = llm.route_question("삼성전자 시가 알려줘", "삼성전자", QUOTE)
+    assert route.name == "data"
+    assert answer == "삼성전자 시세 — 시가 70500원 (직전 조회 기준)"
+
+
+def test_longest_keyword_wins_over_substring():
+    # 긴 키워드("전일 대비", "얼마나 올")가 먼저 지워져서 같은 말 안의 짧은 키워드가 다시 잡히지 않는다
+    assert llm.match_quote_fields("등락률얼마야") == [("change_rate", "전일 대비 등락률", "%"), ("price", "현재가", "원")]
+    assert llm.match_quote_fields("전일대비얼마나올랐어") == [("change", "전일 대비", "원")]
+
+
+@pytest.mark.parametrize("question", ["삼성전자 시가총액 얼마야", "시총 얼마야", "저가매수 타이밍?"])
+def test_non_quote_terms_go_to_llm(question):
+    route, answer = llm.route_question(question, "삼성전자", QUOTE)
+    assert answer is None
+    assert route.model is not None
+
+
+def test_quote_question_without_quote_goes_to_llm():
+    assert route_name("삼성전자 시가 알려줘", quote=None) == "fast"
+
+
+def test_sentiment_question_uses_scores(monkeypatch):
+    monkeypatch.setattr(llm, "get_company_score", lambda name: {"company_score": 3})
+    monkeypatch.setattr(llm, "format_sentiment_summary", lambda name: f"{name} 요약")
+    route, answer = llm.route_question("뉴스 점수 알려줘", "삼성전자", None)
+    assert (route.name, answer) == ("data", "삼성전자 요약")
+
+
+def test_generic_question_gets_brief(monkeypatch):
+    monkeypatch.setattr(llm, "get_brief", lambda name, model: f"{name} 브리핑")
+    route, answer = llm.route_question("삼성전자 요즘 어때?", "삼성전자", QUOTE)
+    assert (route.name, answer) == ("brief", "삼성전자 브리핑")
+
+
+def test_specific_question_skips_brief(monkeypatch):
+    monkeypatch.setattr(llm, "get_brief", lambda name, model: f"{name} 브리핑")
+    assert route_name("삼성전자 배당 정책 어때?") == "full"
+
+
+def test_generic_question_without_brief_goes_to_full():
+    assert route_name("삼성전자 요즘 어때?") == "full"
+
+
+def test_short_plain_question_goes_fast_and_analysis_goes_full():
+    assert route_name("안녕", stock_name=None) == "fast"
+    assert route_name("삼성전자 왜 떨어졌어?") == "full"
+    assert route_name("삼성전자 " + "오늘 시장 분위기와 반도체 업황 이야기 " * 2) == "full"
+
+
+def test_full_route_uses_retrieval_fast_route_does_not():
+    assert llm.ROUTES["full"].use_retrieval
+    assert not llm.ROUTES["fast"].use_retrieval
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import sys
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+# company_scores.bin 형식 / 리더는 crawling/score_snapshot.py 한 곳에만 있다 (저장소 루트의 crawling/)
+_CRAWLING_DIR = Path(__file__).resolve().parent.parent / "crawling"
+if str(_CRAWLING_DIR) not in sys.path:
+    sys.path.append(str(_CRAWLING_DIR))
+
+from score_snapshot import ColumnarScores, read_version  # noqa: E402
+
 
 # === 경로 상수 ===
 SCORES_PATH = Path("/crawling/db/company_scores.json")
@@ -41,6 +51,74 @@ def _load_json(path: Path) -> Any:
         return json.load(f)
 
 
+def _bin_is_current(json_path: Path, bin_path: Path) -> bool:
+    """
+    company_scores.bin 을 써도 되는지. bin 이 JSON 보다 오래됐으면(JSON 만 새로 복사한 경우 등)
+    JSON 내용 해시가 bin 헤더의 version 과 같을 때만 bin 을 쓴다.
+    """
+    if not bin_path.exists():
+        return False
+    if not json_path.exists() or bin_path.stat().st_mtime_ns >= json_path.stat().st_mtime_ns:
+        return True
+    return hashlib.sha1(json_path.read_bytes()).hexdigest()[:12] == read_version(bin_path)
+
+
+def _load_scores_bin(path: Path) -> Mapping[str, Dict[str, int]]:
+    """
+    company_scores.bin 을 mmap 으로 열어서 company_scores.json 과 같은 모양의 매핑으로 반환.
+    JSON 파싱도, 전체 복사도 없다.
+    """
+    return ColumnarScores(path)
+
+
+class CompanyMap(Mapping):
+    """
+    { 회사이름: CompanyData } 매핑. 점수와 가격 원본을 들고 있다가 조회할 때 CompanyData 를 만든다.
+    (점수가 ColumnarScores 면 회사 수만큼 미리 객체를 만들지 않음)
+    """
+
+    def __init__(self, raw_scores: Mapping[str, Dict[str, Any]], raw_prices: Any):
+        self._scores = raw_scores
+        self._prices = raw_prices if isinstance(raw_prices, dict) else {}
+        # 점수에는 없는데 가격만 있는 종목
+        self._price_only = [name for name in self._prices if name not in raw_scores]
+
+    def __getitem__(self, name: str) -> CompanyData:
+        data = self._scores.get(name)
+        if data is None and name not in self._prices:
+            raise KeyError(name)
+        price = _extract_price(self._prices[name]) if name in self._prices else None
+        if data is None:
+            return CompanyData(name=name, price=price)
+        # company_scores.json 구조 예시 가정:
+        # {
+        #   "대동": {
+        #       "positive_count": 36,
+        #       "negative_count": 0,
+        #       "neutral_count": 14,
+        #       "total_articles": 50,
+        #       "company_score": 36
+        #   },
+        #   ...
+        # }
+        return CompanyData(
+            name=name,
+            score=data.get("company_score"),
+            positive=data.get("positive_count"),
+            negative=data.get("negative_count"),
+            neutral=data.get("neutral_count"),
+            total_articles=data.get("total_articles"),
+            price=price,
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._scores
+        yield from self._price_only
+
+    def __len__(self) -> int:
+        return len(self._scores) + len(self._price_only)
+
+
 # def _extract_price(raw_price_obj: Any) -> Optional[float]:
 #     """
 #     all_prices.json 구조가 어떻게 생겼는지 확정이 안 됐으니까,
@@ -84,62 +162,28 @@ def _load_json(path: Path) -> Any:
 def load_company_data(
     scores_path: Path = SCORES_PATH,
     prices_path: Path = PRICES_PATH,
-) -> Dict[str, CompanyData]:
+) -> Mapping[str, CompanyData]:
     """
     company_scores.json + all_prices.json 두 개를 로드해서
-    { 회사이름: CompanyData } 형태로 합쳐서 반환.
+    { 회사이름: CompanyData } 매핑으로 합쳐서 반환. (CompanyData 는 조회할 때 만든다)
 
     - scores_path: /crawling/db/company_scores.json
     - prices_path: /calling_api/db/all_prices.json
     """
-    raw_scores = _load_json(scores_path)
+    # 같은 디렉터리에 컬럼형 스냅샷이 있고 JSON 과 같은 내용이면 JSON 대신 그걸 읽는다
+    bin_path = scores_path.with_suffix(".bin")
+    if _bin_is_current(scores_path, bin_path):
+        raw_scores = _load_scores_bin(bin_path)
+    else:
+        raw_scores = _load_json(scores_path)
     raw_prices = _load_json(prices_path)
 
-    companies: Dict[str, CompanyData] = {}
-
-    # 1) 점수 기반으로 기본 뼈대 생성
-    for name, data in raw_scores.items():
-        # company_scores.json 구조 예시 가정:
-        # {
-        #   "대동": {
-        #       "positive_count": 36,
-        #       "negative_count": 0,
-        #       "neutral_count": 14,
-        #       "total_articles": 50,
-        #       "company_score": 36
-        #   },
-        #   ...
-        # }
-        companies[name] = CompanyData(
-            name=name,
-            score=data.get("company_score"),
-            positive=data.get("positive_count"),
-            negative=data.get("negative_count"),
-            neutral=data.get("neutral_count"),
-            total_articles=data.get("total_articles"),
-            price=None,  # 나중에 채워 넣음
-        )
-
-    # 2) 가격 정보 합치기
-    # raw_prices가 dict[str, Any] 형태라고 가정
-    if isinstance(raw_prices, dict):
-        for name, price_obj in raw_prices.items():
-            price = _extract_price(price_obj)
-            if name in companies:
-                companies[name].price = price
-            else:
-                # 점수에는 없는데 가격만 있는 종목도 넣고 싶다면 여기서 생성
-                companies[name] = CompanyData(
-                    name=name,
-                    price=price,
-                )
-
-    return companies
+    return CompanyMap(raw_scores, raw_prices)
 
 
 def get_company(
     name: str,
-    companies: Dict[str, CompanyData],
+    companies: Mapping[str, CompanyData],
 ) -> Optional[CompanyData]:
     """
     특정 회사 이름으로 CompanyData 조회.
@@ -149,7 +193,7 @@ def get_company(
 
 
 def pick_top_companies(
-    companies: Dict[str, CompanyData],
+    companies: Mapping[str, CompanyData],
     top_n: int = 5,
     min_articles: int = 0,
 ) -> List[CompanyData]:
@@ -1,36 +1,104 @@
+import argparse
+import hashlib
 import json
+import multiprocessing
+import os
+import re
+from itertools import islice
 from pathlib import Path
 
-from transformers import pipeline
+import torch
+from transformers import AutoTokenizer, pipeline
+
+from article_stream import JsonlWriter, input_signature, iter_articles, iter_windows
+from cascade import DEFAULT_THRESHOLD as CASCADE_THRESHOLD, Cascade, load_fast_classifier
+from dedup import POLICIES as DEDUP_POLICIES, DedupFilter
+from entity_link import Attribution, EntityLinker
+from label_cache import LabelCache
+from score_snapshot import write_snapshot
+from article_store import ArticleStore
+from sentiment_history import SentimentHistory, article_key
 
 # ---- 경로 설정 ----
 BASE_DIR = Path(__file__).resolve().parent
 DB_DIR = BASE_DIR / "db"
 INPUT_PATH = DB_DIR / "crawling.json"
 COMPANY_SCORE_PATH = DB_DIR / "company_scores.json"  # 기업별 점수 저장
-LABELED_DIR = DB_DIR / "labeled"                     # 회사별 라벨링 파일들 모아둘 디렉터리. 2000개만드는건좀부담스러워서안쓸듯
+COMPANY_SCORE_BIN_PATH = DB_DIR / "company_scores.bin"  # 같은 내용의 컬럼형 스냅샷 (웹/ai 에서 mmap)
+LABELS_OUT_PATH = DB_DIR / "labeled_articles.jsonl"  # 기사별 라벨 (한 줄에 기사 하나, 본문 제외)
+CHECKPOINT_PATH = DB_DIR / "analyze_checkpoint.json"  # 중간 진행 상황 (--resume 용, 정상 종료 시 삭제)
 
 
 MODEL_NAME = "snunlp/KR-FinBert-SC"
+MAX_LENGTH = 512
+BATCH_SIZE = 32  # CPU 기준. 메모리 여유가 있으면 64 정도까지 올려도 됨
+WINDOW_SIZE = 2048  # 한 번에 메모리에 올려서 분류하는 기사 수
+
+# 긴 기사 자르는 방식
+#   head      : 앞에서부터 max_length 토큰까지 (기존 방식)
+#   lead      : 제목 + 본문 앞 문장들을 문장 단위로 max_length 안에 들어가는 만큼
+#   head-tail : 본문 앞부분 + 마지막 부분 (결론/전망이 기사 끝에 오는 경우 대비)
+TRUNCATIONS = ("head", "lead", "head-tail")
+HEAD_TAIL_TAIL_RATIO = 0.25  # head-tail 에서 본문 토큰 예산 중 끝부분 비율
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+MAX_ADAPTIVE_BATCH = 256     # --token-budget 으로 짧은 기사 배치를 키울 때 상한
+
+
+def detect_device() -> int:
+    """
+    transformers pipeline 의 device 값. GPU 가 있으면 0, 없으면 -1 (CPU)
+    """
+    return 0 if torch.cuda.is_available() else -1
 
 
-def load_classifier():
+def load_classifier(device: int | None = None, max_length: int = MAX_LENGTH):
     """
     KR-FinBERT 분류 파이프라인 로딩
-    device = -1  → CPU 사용, 0이면 GPU 사용
+    device = -1  → CPU 사용, 0이면 GPU 사용, None 이면 자동 감지
     """
-    device = 0  # GPU 쓰려면 0으로 변경 (지금은 CPU)
+    if device is None:
+        device = detect_device()
     clf = pipeline(
         task="text-classification",
         model=MODEL_NAME,
         tokenizer=MODEL_NAME,
         device=device,
         truncation=True,
-        max_length=512,
+        max_length=max_length,
     )
     return clf
 
 
+def get_classifier(
+    backend: str = "torch",
+    device: int | None = None,
+    threads: int | None = None,
+    max_length: int = MAX_LENGTH,
+    server_url: str | None = None,
+):
+    """
+    backend 이름으로 분류기 로딩. 어떤 백엔드든 호출 방식은 pipeline 과 같다.
+    - torch     : transformers pipeline (기본)
+    - onnx      : ONNX Runtime fp32 (CPU)
+    - onnx-int8 : ONNX Runtime int8 동적 양자화 (CPU)
+    - remote    : 이미 떠 있는 sentiment_server.py 에 요청 (모델 로딩 없음)
+    """
+    if backend == "torch":
+        return load_classifier(device, max_length)
+
+    if backend == "remote":
+        from sentiment_server import SENTIMENT_SERVER_URL, RemoteClassifier
+        return RemoteClassifier(server_url or SENTIMENT_SERVER_URL)
+
+    from onnx_backend import load_onnx_classifier
+    return load_onnx_classifier(
+        MODEL_NAME,
+        quantized=(backend == "onnx-int8"),
+        threads=threads,
+        max_length=max_length,
+    )
+
+
 def make_input_text(title: str, content: str) -> str:
     """
     제목 + 본문을 하나의 텍스트로 합치기
@@ -56,6 +124,45 @@ def label_to_point(label: str | None) -> int:
     return 0  # neutral or 기타
 
 
+def prepare_text(tokenizer, title: str, content: str, truncation: str = "head", max_length: int = MAX_LENGTH) -> str:
+    """
+    truncation 방식에 맞춰 모델 입력 텍스트를 만든다. head 는 make_input_text 그대로
+    (잘라내기는 pipeline 이 max_length 로 함), 나머지는 본문을 max_length 안에 들어가게 미리 줄인다.
+    """
+    title = (title or "").strip()
+    content = (content or "").strip()
+    if truncation == "head" or not content:
+        return make_input_text(title, content)
+
+    # [CLS]/[SEP] + "[제목] ... [본문]" 머리말을 뺀 본문 토큰 예산
+    budget = max_length - 2 - len(tokenizer.tokenize(f"[제목] {title}\n[본문]"))
+    if budget <= 0:
+        return title
+
+    if truncation == "lead":
+        kept: list[str] = []
+        used = 0
+        for sentence in SENTENCE_SPLIT.split(content):
+            n = len(tokenizer.tokenize(sentence))
+            if used + n > budget:
+                break
+            kept.append(sentence)
+            used += n
+        # 첫 문장부터 예산을 넘으면 그 문장을 그대로 넣고 pipeline 이 자르게 둔다
+        return make_input_text(title, " ".join(kept) if kept else content)
+
+    if truncation == "head-tail":
+        ids = tokenizer(content, add_special_tokens=False)["input_ids"]
+        if len(ids) <= budget:
+            return make_input_text(title, content)
+        tail = int(budget * HEAD_TAIL_TAIL_RATIO)
+        head = budget - tail - 1  # 사이에 넣는 "..." 몫
+        text = f"{tokenizer.decode(ids[:head])} ... {tokenizer.decode(ids[-tail:]) if tail else ''}"
+        return make_input_text(title, text.strip())
+
+    raise ValueError(f"unknown truncation: {truncation}")
+
+
 def sanitize_filename(name: str) -> str:
     """
     회사 이름을 파일명에 쓸 수 있게 안전하게 변환
@@ -69,97 +176,672 @@ def sanitize_filename(name: str) -> str:
     return safe
 
 
-def main():
-    # 디렉터리 준비
-    LABELED_DIR.mkdir(parents=True, exist_ok=True)
+def token_lengths(tokenizer, texts: list[str], max_length: int = MAX_LENGTH) -> list[int]:
+    """
+    max_length 로 잘랐을 때의 토큰 수. 배치 정렬용이라 특수 토큰 포함 길이만 본다.
+    """
+    lengths: list[int] = []
+    for start in range(0, len(texts), 1000):
+        enc = tokenizer(
+            texts[start:start + 1000],
+            truncation=True,
+            max_length=max_length,
+        )
+        lengths.extend(len(ids) for ids in enc["input_ids"])
+    return lengths
 
-    # 1) 원본 크롤링 데이터 로드
-    print(f"Loading crawling data from: {INPUT_PATH}")
-    with INPUT_PATH.open("r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    # 2) 모델 로드
-    print("Loading KR-FinBERT model...")
-    classifier = load_classifier()
-    print("Model loaded.")
+def make_batches(
+    tokenizer,
+    texts: list[str],
+    batch_size: int,
+    max_length: int = MAX_LENGTH,
+    token_budget: int | None = None,
+) -> list[list[int]]:
+    """
+    토큰 길이순으로 정렬한 인덱스를 batch_size 씩 묶는다. (배치 안의 padding 최소화)
+    token_budget 을 주면 배치 크기를 고정하지 않고 (기사 수 x 배치 안 최대 길이) 가
+    token_budget 을 넘지 않게 묶는다. → 짧은 기사는 큰 배치, 긴 기사는 작은 배치
+    """
+    lengths = token_lengths(tokenizer, texts, max_length)
+    order = sorted(range(len(texts)), key=lengths.__getitem__)
+    if not token_budget:
+        return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
 
-    company_scores: dict[str, dict] = {}
+    batches: list[list[int]] = []
+    current: list[int] = []
+    for i in order:
+        # 오름차순이라 지금 넣는 기사 길이 = 배치의 padding 길이
+        if current and ((len(current) + 1) * lengths[i] > token_budget or len(current) >= MAX_ADAPTIVE_BATCH):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
 
-    # 3) 회사별로 기사 라벨링 + 회사별 JSON 파일로 저장
-    for company_name, articles in data.items():
-        print(f"Labeling articles for company: {company_name} (count={len(articles)})")
 
-        labeled_articles = []
+def run_batch(classifier, batch: list[str]) -> list[tuple[str | None, float]]:
+    """
+    배치 하나 분류. 실패하면 그 배치만 한 개씩 다시 시도
+    """
+    try:
+        outputs = classifier(batch, batch_size=len(batch))
+    except Exception as e:
+        print(f"[WARN] Batch classification failed, retrying one by one: {e}")
+        outputs = []
+        for text in batch:
+            try:
+                outputs.append(classifier(text)[0])
+            except Exception as e2:
+                print(f"[WARN] Failed to classify article '{text[:40]}': {e2}")
+                outputs.append({})
+    return [(out.get("label"), float(out.get("score", 0.0))) for out in outputs]
 
-        # 기업별 카운터
-        pos_count = 0
-        neg_count = 0
-        neu_count = 0
 
-        for article in articles:
-            title = article.get("title", "")
-            content = article.get("content", "")
-            text = make_input_text(title, content)
+def classify_texts(
+    classifier,
+    texts: list[str],
+    batch_size: int,
+    max_length: int = MAX_LENGTH,
+    token_budget: int | None = None,
+) -> list[tuple[str | None, float]]:
+    """
+    텍스트 여러 개를 배치로 분류해서 입력 순서 그대로 (label, confidence) 목록 반환.
+    """
+    results: list[tuple[str | None, float]] = [(None, 0.0)] * len(texts)
+    if not texts:
+        return results
 
-            try:
-                result = classifier(text)[0]
-                label = result.get("label")
-                confidence = float(result.get("score", 0.0))
-            except Exception as e:
-                print(f"[WARN] Failed to classify article '{title}': {e}")
-                label = None
-                confidence = 0.0
-
-            # -1 / 0 / +1 점수
-            sentiment_point = label_to_point(label)
-
-            # 기업별 카운트
-            if label:
-                l = label.lower()
-                if l == "positive":
-                    pos_count += 1
-                elif l == "negative":
-                    neg_count += 1
+    for idxs in make_batches(classifier.tokenizer, texts, batch_size, max_length, token_budget):
+        for i, result in zip(idxs, run_batch(classifier, [texts[i] for i in idxs])):
+            results[i] = result
+
+    return results
+
+
+# ---------------------------------------------------
+# 멀티 프로세스 (CPU 전용 호스트용)
+# ---------------------------------------------------
+_WORKER_CLASSIFIER = None
+
+
+def _init_worker(threads: int, backend: str, max_length: int = MAX_LENGTH):
+    """
+    워커 프로세스마다 모델을 하나씩 올리고 스레드 수를 고정한다.
+    (워커 N개 x 스레드 T개 ≈ 코어 수가 되도록)
+    """
+    global _WORKER_CLASSIFIER
+    torch.set_num_threads(threads)
+    _WORKER_CLASSIFIER = get_classifier(backend, device=-1, threads=threads, max_length=max_length)
+
+
+def _classify_in_worker(job: tuple[list[int], list[str]]):
+    idxs, batch = job
+    return idxs, run_batch(_WORKER_CLASSIFIER, batch)
+
+
+def classify_texts_parallel(
+    pool,
+    tokenizer,
+    texts: list[str],
+    batch_size: int,
+    max_length: int = MAX_LENGTH,
+    token_budget: int | None = None,
+) -> list[tuple[str | None, float]]:
+    """
+    배치를 워커 프로세스 풀에 나눠서 분류. 결과는 원래 인덱스 자리에 넣기 때문에
+    어떤 워커가 먼저 끝나든 결과 순서는 항상 같다.
+    """
+    results: list[tuple[str | None, float]] = [(None, 0.0)] * len(texts)
+    if not texts:
+        return results
+
+    jobs = [
+        (idxs, [texts[i] for i in idxs])
+        for idxs in make_batches(tokenizer, texts, batch_size, max_length, token_budget)
+    ]
+    for idxs, batch_results in pool.imap_unordered(_classify_in_worker, jobs):
+        for i, result in zip(idxs, batch_results):
+            results[i] = result
+
+    return results
+
+
+class Labeler:
+    """
+    기사 묶음(window) 단위로 라벨을 붙인다.
+    - 라벨 캐시에 있으면 그대로 쓰고, 없는 기사만 모델로 분류
+    - --cascade 를 켜면 제목 분류기가 확신하는 기사는 FinBERT 를 건너뛴다
+    - 모델(또는 워커 풀)은 처음으로 캐시 미스가 났을 때 한 번만 올린다
+
+    결과는 기사마다 (label, confidence, source). source 는 "finbert" 또는 "cascade"
+    """
+
+    def __init__(self, args, device: int):
+        self.args = args
+        self.device = device
+        # 양자화 백엔드는 라벨이 조금 다를 수 있으므로 캐시 키에 백엔드도 넣는다
+        # (remote 는 서버가 실제로 쓰는 백엔드 기준)
+        backend = args.backend
+        if backend == "remote":
+            from sentiment_server import SENTIMENT_SERVER_URL, server_info
+            info = server_info(args.server_url or SENTIMENT_SERVER_URL)
+            backend = info["backend"]
+            # 서버가 자기 max_length 로 자르므로 본문 줄이기/캐시 키도 서버 값에 맞춘다
+            if info.get("max_length", MAX_LENGTH) != args.max_length:
+                print(f"[WARN] 서버 max_length={info['max_length']} 를 씁니다. (--max-length {args.max_length} 무시)")
+                args.max_length = info["max_length"]
+        # 캐시 키에는 모델#백엔드#자르기 방식을 전부 넣는다 (설정이 다르면 같은 기사도 다른 항목)
+        cache_model = f"{MODEL_NAME}#{backend}#{args.truncation}"
+        self.cache = None if args.no_cache else LabelCache(cache_model, args.max_length)
+        self.classifier = None
+        self.pool = None
+        self.tokenizer = None
+        self.cascade = (
+            Cascade(load_fast_classifier(args.cascade), args.cascade_threshold, args.cascade_audit)
+            if args.cascade != "off" else None
+        )
+        self.hits = 0
+        self.classified = 0
+
+    # 체크포인트용 (--resume 뒤 진행 상황 / 요약 숫자가 끊기지 않게)
+    def state(self) -> dict:
+        return {"hits": self.hits, "classified": self.classified}
+
+    def load_state(self, state: dict):
+        self.hits = state["hits"]
+        self.classified = state["classified"]
+
+    def _ensure_model(self):
+        args = self.args
+        if args.workers > 1:
+            if self.pool is None:
+                threads = args.threads or max(1, (os.cpu_count() or 1) // args.workers)
+                print(f"Starting {args.workers} CPU workers x {threads} threads (backend={args.backend})")
+                self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+                if args.backend in ("onnx", "onnx-int8"):
+                    # 워커마다 export_onnx 를 동시에 돌리지 않도록 부모에서 한 번 내보내 둔다
+                    from onnx_backend import export_onnx
+                    export_onnx(MODEL_NAME, quantize=(args.backend == "onnx-int8"))
+                # fork 로 띄우면 부모의 torch 스레드 풀 상태를 물려받아 멈추는 경우가 있어서 spawn 사용
+                ctx = multiprocessing.get_context("spawn")
+                self.pool = ctx.Pool(
+                    args.workers, initializer=_init_worker, initargs=(threads, args.backend, args.max_length)
+                )
+        elif self.classifier is None:
+            print(f"Loading KR-FinBERT model... (backend={args.backend})")
+            self.classifier = get_classifier(
+                args.backend, self.device, args.threads, args.max_length, server_url=args.server_url
+            )
+            device_name = f"cuda:{self.device}" if args.backend == "torch" and self.device != -1 else "cpu"
+            print(
+                f"Model loaded. (device={device_name}, "
+                f"batch_size={args.batch_size}, threads={torch.get_num_threads()})"
+            )
+
+    def _tokenizer(self):
+        return self.tokenizer if self.pool is not None else self.classifier.tokenizer
+
+    def _classify(self, texts: list[str]) -> list[tuple[str | None, float]]:
+        args = self.args
+        if self.pool is not None:
+            return classify_texts_parallel(
+                self.pool, self.tokenizer, texts, args.batch_size, args.max_length, args.token_budget
+            )
+        return classify_texts(self.classifier, texts, args.batch_size, args.max_length, args.token_budget)
+
+    def label_window(self, window: list[tuple[str, dict]]) -> list[tuple[str | None, float, str]]:
+        results: list[tuple[str | None, float, str]] = [(None, 0.0, "finbert")] * len(window)
+        miss_idx: list[int] = []
+        audit: dict[int, str] = {}  # 제목 분류기 라벨을 쓰면서 FinBERT 로도 돌려보는 기사 → 제목 분류기 라벨
+        for i, (_, article) in enumerate(window):
+            cached = self.cache.get(article.get("title", ""), article.get("content", "")) if self.cache else None
+            if cached:
+                results[i] = (*cached, "finbert")
+                self.hits += 1
+                continue
+            if self.cascade:
+                fast, run_finbert = self.cascade.route(article.get("title", ""))
+                if fast:
+                    results[i] = (*fast, "cascade")
+                    if run_finbert:
+                        audit[i] = fast[0]
+                if not run_finbert:
+                    continue
+            miss_idx.append(i)
+
+        if miss_idx:
+            self._ensure_model()
+            tokenizer = self._tokenizer()
+            texts = [
+                prepare_text(
+                    tokenizer,
+                    window[i][1].get("title", ""),
+                    window[i][1].get("content", ""),
+                    self.args.truncation,
+                    self.args.max_length,
+                )
+                for i in miss_idx
+            ]
+            for i, (label, confidence) in zip(miss_idx, self._classify(texts)):
+                if i in audit:
+                    # 일치율 측정용. 라벨은 제목 분류기 것을 그대로 둔다 (audit 여부와 무관하게 결과가 같도록)
+                    self.cascade.stats.record_audit(audit[i], label)
                 else:
-                    neu_count += 1
-
-            # 기사 하나에 라벨 정보 추가
-            article_with_label = {
-                **article,
-                "sentiment_label": label,            # 'positive' / 'negative' / 'neutral'
-                "sentiment_confidence": confidence,  # 0.0 ~ 1.0 (모델 확신도)
-                "sentiment_point": sentiment_point,  # -1 / 0 / +1 (우리 점수)
-            }
-            labeled_articles.append(article_with_label)
-
-        # ----- 회사별 라벨링 결과를 개별 파일로 저장 (db/labeled/ 아래) -----
-        # safe_name = sanitize_filename(company_name)
-        # company_output_path = LABELED_DIR / f"crawling_labeled_{safe_name}.json"
-        # with company_output_path.open("w", encoding="utf-8") as f:
-        #     json.dump(labeled_articles, f, ensure_ascii=False, indent=2)
-        # print(f"Saved labeled articles for '{company_name}' to: {company_output_path}")
-
-        # ----- 회사별 점수 집계 -----
-        company_score = pos_count - neg_count
+                    results[i] = (label, confidence, "finbert")
+                if self.cache:
+                    article = window[i][1]
+                    self.cache.put(article.get("title", ""), article.get("content", ""), label, confidence)
+            self.classified += len(miss_idx)
+            if self.cache:
+                self.cache.flush()
+
+        return results
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+
+
+def new_counter() -> dict:
+    return {"positive_count": 0, "negative_count": 0, "neutral_count": 0, "total_articles": 0}
+
+
+def count_label(counter: dict, label: str | None):
+    """
+    회사별 running counter 에 기사 하나 반영
+    """
+    counter["total_articles"] += 1
+    if label:
+        l = label.lower()
+        if l == "positive":
+            counter["positive_count"] += 1
+        elif l == "negative":
+            counter["negative_count"] += 1
+        else:
+            counter["neutral_count"] += 1
+
+
+def finalize_scores(counters: dict[str, dict]) -> dict[str, dict]:
+    """
+    running counter → company_scores.json 형식
+    """
+    company_scores: dict[str, dict] = {}
+    for company_name, c in counters.items():
+        company_score = c["positive_count"] - c["negative_count"]
         company_scores[company_name] = {
-            "positive_count": pos_count,
-            "negative_count": neg_count,
-            "neutral_count": neu_count,
-            "total_articles": len(labeled_articles),
+            "positive_count": c["positive_count"],
+            "negative_count": c["negative_count"],
+            "neutral_count": c["neutral_count"],
+            "total_articles": c["total_articles"],
             "company_score": company_score,
         }
-
         print(
             f"[SUMMARY] {company_name}: "
-            f"+{pos_count} / -{neg_count} / 0:{neu_count} "
+            f"+{c['positive_count']} / -{c['negative_count']} / 0:{c['neutral_count']} "
             f"→ company_score = {company_score}"
         )
+    return company_scores
+
+
+def resolve_labels(
+    labeler: Labeler,
+    window: list[tuple[str, dict]],
+    base: int,
+    dedup: DedupFilter | None = None,
+    attribution: Attribution | None = None,
+) -> list[tuple[str | None, float, str]]:
+    """
+    window 의 라벨을 정하되 모델에는 처음 보는 기사만 넣는다.
+    - --dedup       : 중복 클러스터 대표가 아닌 기사 → 대표 기사 라벨 (대표는 항상 더 앞에 있음)
+    - --link-entities : 이미 분류한 URL → 그 URL 의 라벨 (같은 기사가 여러 회사로 크롤링된 경우)
+    base 는 window 첫 기사의 입력 파일 안 위치.
+    """
+    results: list = [None] * len(window)
+    same_as: dict[int, int] = {}
+    first_in_window: dict[str, int] = {}
+    todo: list[int] = []
+    for i, (_, article) in enumerate(window):
+        if dedup and dedup.is_duplicate(base + i):
+            continue
+        if attribution:
+            key = article_key(article)
+            if attribution.known(key):
+                results[i] = attribution.label_of(key)
+                continue
+            if key in first_in_window:
+                same_as[i] = first_in_window[key]
+                continue
+            first_in_window[key] = i
+        todo.append(i)
+
+    for i, result in zip(todo, labeler.label_window([window[i] for i in todo])):
+        results[i] = result
+
+    # 앞 기사부터 채워야 같은 window 안의 대표/원본 라벨을 쓸 수 있다
+    for i, (_, article) in enumerate(window):
+        if results[i] is None:
+            results[i] = results[same_as[i]] if i in same_as else dedup.label_of(base + i)
+        if dedup:
+            dedup.remember(base + i, results[i])
+        if attribution:
+            attribution.remember(article_key(article), results[i])
+    return results
+
 
-    # 4) 기업별 점수 결과 저장 (핵심 파일)
-    with COMPANY_SCORE_PATH.open("w", encoding="utf-8") as f:
-        json.dump(company_scores, f, ensure_ascii=False, indent=2)
+def labeled_record(company_name: str, article: dict, label: str | None, confidence: float, source: str) -> dict:
+    """
+    labeled_articles.jsonl 한 줄. 본문은 크기 때문에 빼고 라벨 정보만 붙인다.
+    """
+    record = {"company_name": company_name}
+    record.update((k, v) for k, v in article.items() if k not in ("company_name", "content"))
+    record["sentiment_label"] = label                    # 'positive' / 'negative' / 'neutral'
+    record["sentiment_confidence"] = confidence          # 0.0 ~ 1.0 (모델 확신도)
+    record["sentiment_point"] = label_to_point(label)    # -1 / 0 / +1 (우리 점수)
+    record["sentiment_source"] = source                  # 'finbert' / 'cascade' (제목 분류기)
+    return record
+
+
+def save_checkpoint(state: dict, path: Path = CHECKPOINT_PATH):
+    """
+    임시 파일에 쓴 뒤 교체 (쓰다가 죽어도 이전 체크포인트는 그대로 남음)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def checkpoint_options(args) -> dict:
+    """
+    이어서 실행할 때 같아야 하는 옵션 (다르면 집계 / 요약이 한 번에 돈 것과 달라짐)
+    """
+    return {
+        "cascade": args.cascade,
+        "link_entities": args.link_entities,
+        "dedup": args.dedup,
+        "dedup_policy": args.dedup_policy if args.dedup else None,
+    }
+
+
+def load_checkpoint(args, path: Path = CHECKPOINT_PATH) -> dict | None:
+    """
+    --resume 으로 이어갈 체크포인트. 없으면 None, 입력/출력이 달라졌으면 종료.
+    """
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        state = json.load(f)
+
+    if state.get("input") != input_signature(args.input):
+        raise SystemExit(
+            f"[ERROR] 체크포인트의 입력 파일이 현재 입력({args.input})과 다릅니다. "
+            f"--resume 없이 처음부터 다시 실행하세요."
+        )
+    if state.get("labels_out") != str(args.labels_out.resolve()):
+        raise SystemExit(f"[ERROR] 체크포인트의 --labels-out 이 다릅니다: {state.get('labels_out')}")
+    tmp_labels = args.labels_out.with_suffix(args.labels_out.suffix + ".tmp")
+    if not tmp_labels.exists() or tmp_labels.stat().st_size < state["labels_offset"]:
+        raise SystemExit(f"[ERROR] 이어 쓸 라벨 임시 파일이 없거나 잘려 있습니다: {tmp_labels}")
+    return state
+
+
+def replay_attribution(attribution: Attribution, labels_out: Path, offset: int):
+    """
+    --resume: 체크포인트 시점까지 쓴 라벨 파일을 다시 읽어 URL 라벨 / 회사 연결 상태 복원
+    (체크포인트에 매번 넣기엔 커서 라벨 파일을 원본으로 쓴다)
+    """
+    tmp_path = labels_out.with_suffix(labels_out.suffix + ".tmp")
+    read = 0
+    with tmp_path.open("rb") as f:
+        for line in f:
+            read += len(line)
+            if read > offset:
+                break
+            record = json.loads(line)
+            attribution.replay(record, article_key(record))
+
+
+def save_company_scores(company_scores: dict[str, dict]):
+    """
+    company_scores.json + company_scores.bin 저장.
+    웹 서버가 실행 중에 파일을 다시 읽으므로, 임시 파일에 다 쓴 뒤 한 번에 교체
+    """
+    raw = json.dumps(company_scores, ensure_ascii=False, indent=2).encode("utf-8")
+    tmp_path = COMPANY_SCORE_PATH.with_suffix(".json.tmp")
+    tmp_path.write_bytes(raw)
+    os.replace(tmp_path, COMPANY_SCORE_PATH)
     print(f"Saved company scores to: {COMPANY_SCORE_PATH}")
 
+    # 컬럼형 바이너리 스냅샷 (버전 = 위 JSON 내용 해시)
+    write_snapshot(company_scores, COMPANY_SCORE_BIN_PATH, hashlib.sha1(raw).hexdigest()[:12])
+    print(f"Saved columnar score snapshot to: {COMPANY_SCORE_BIN_PATH}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="crawling.json(l) 기사 감성 분석 → company_scores.json",
+        epilog="메모리: 기사 본문은 --window 개씩만 메모리에 올린다. 다만 라벨 캐시(--no-cache 로 끔), "
+               "--dedup 의 클러스터 / 대표 라벨, --link-entities 의 URL 라벨은 키와 라벨만이지만 "
+               "코퍼스(캐시) 크기에 비례해서 메모리에 남는다. 메모리를 일정하게 유지하려면 셋 다 끌 것",
+    )
+    parser.add_argument("--input", type=Path, default=INPUT_PATH, help=".json(기존 형식) 또는 .jsonl")
+    parser.add_argument("--labels-out", type=Path, default=LABELS_OUT_PATH, help="기사별 라벨 JSONL 출력 경로")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="한 번에 모델에 넣을 기사 수")
+    parser.add_argument("--max-length", type=int, default=MAX_LENGTH, help="모델 입력 최대 토큰 수 (128 / 256 / 512)")
+    parser.add_argument(
+        "--truncation", choices=TRUNCATIONS, default="head",
+        help="max_length 보다 긴 기사 자르는 방식: head(앞부분) / lead(제목 + 앞 문장들) / head-tail(앞 + 끝)",
+    )
+    parser.add_argument(
+        "--token-budget", type=int, default=None,
+        help="배치당 토큰 수 상한 (기사 수 x 최대 길이). 주면 길이에 따라 배치 크기를 바꾼다 (예: 8192)",
+    )
+    parser.add_argument(
+        "--window", type=int, default=WINDOW_SIZE,
+        help="한 번에 메모리에 올려서 길이순 정렬/분류하는 기사 수 (메모리 사용량 상한)",
+    )
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op 스레드 수 (기본: torch 기본값)")
+    parser.add_argument(
+        "--backend", choices=("torch", "onnx", "onnx-int8", "remote"), default="torch",
+        help="추론 백엔드. onnx 계열은 처음 실행 때 db/onnx/ 에 모델을 변환해 둔다. "
+             "remote 는 sentiment_server.py 에 분류를 맡긴다",
+    )
+    parser.add_argument("--server-url", default=None, help="--backend remote 일 때 서버 주소 (기본 http://127.0.0.1:8765)")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="CPU 워커 프로세스 수. 2 이상이면 워커마다 모델을 따로 올려서 배치를 나눠 처리",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="라벨 캐시를 쓰지 않고 전부 다시 분류 (캐시를 쓰면 label_cache.jsonl 전체를 메모리에 올림)",
+    )
+    parser.add_argument(
+        "--cascade", choices=("off", "lexicon", "linear"), default="off",
+        help="FinBERT 앞단 제목 분류기. 확신도가 --cascade-threshold 이상인 기사는 FinBERT 를 건너뜀",
+    )
+    parser.add_argument("--cascade-threshold", type=float, default=CASCADE_THRESHOLD)
+    parser.add_argument(
+        "--cascade-audit", type=float, default=0.0,
+        help="제목 분류기가 처리한 기사 중 이 비율만큼은 FinBERT 로도 돌려서 일치율을 출력 (예: 0.05)",
+    )
+    parser.add_argument(
+        "--dedup", action="store_true",
+        help="dedup.py 가 만든 중복 클러스터를 써서 재전송 기사는 한 번만 분류 "
+             "(클러스터 맵과 대표 기사 라벨을 메모리에 들고 있음, 코퍼스 크기에 비례)",
+    )
+    parser.add_argument(
+        "--dedup-policy", choices=DEDUP_POLICIES, default="company",
+        help="중복 기사 집계 방식: all=전부 셈, company=회사마다 한 번, first=처음 나온 회사에만 한 번",
+    )
+    parser.add_argument(
+        "--link-entities", action="store_true",
+        help="같은 URL 은 한 번만 분류하고, 본문/제목에 나온 다른 상장사(market_code.json)에도 결과를 집계 "
+             "(URL 별 라벨을 메모리에 들고 있음, 코퍼스 크기에 비례)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="이전 실행이 중간에 끊겼으면 마지막 체크포인트 이후부터 이어서 분석",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    device = detect_device()
+    if args.backend == "remote" and args.workers > 1:
+        print("[WARN] --backend remote 는 서버가 배치를 처리하므로 --workers 를 무시합니다.")
+        args.workers = 1
+    if args.workers > 1 and device != -1:
+        print("[WARN] GPU 가 있으면 --workers 없이 한 프로세스로 돌리는 게 빠릅니다. CPU 워커로 진행합니다.")
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    # 1) 기사를 스트림으로 읽으면서 window 단위로 라벨링
+    #    (전체 코퍼스를 메모리에 올리지 않고, 회사별 집계는 running counter 로만 유지)
+    #    window 하나가 끝날 때마다 (읽은 기사 수, 회사별 카운터, 라벨 파일 위치) 를 체크포인트로 남긴다
+    dedup = DedupFilter(args.input, args.dedup_policy) if args.dedup else None
+    attribution = Attribution(EntityLinker.from_market_codes()) if args.link_entities else None
+
+    checkpoint = load_checkpoint(args) if args.resume else None
+    if checkpoint:
+        counters: dict[str, dict] = checkpoint["counters"]
+        processed = checkpoint["processed"]
+        labels_offset = checkpoint["labels_offset"]
+        if checkpoint.get("options", checkpoint_options(args)) != checkpoint_options(args):
+            raise SystemExit(
+                f"[ERROR] 체크포인트와 옵션이 다릅니다: {checkpoint['options']}. 같은 옵션으로 이어서 실행하세요."
+            )
+        if dedup:
+            if "dedup" not in checkpoint:
+                raise SystemExit("[ERROR] 체크포인트가 --dedup 없이 만들어졌습니다. 같은 옵션으로 이어서 실행하세요.")
+            dedup.load_state(checkpoint["dedup"])
+        if attribution:
+            replay_attribution(attribution, args.labels_out, labels_offset)
+            if "attribution" in checkpoint:
+                attribution.load_state(checkpoint["attribution"])
+        print(f"Resuming from checkpoint: {processed} articles, {len(counters)} companies already done")
+    else:
+        if CHECKPOINT_PATH.exists():
+            print(f"[WARN] 이전 체크포인트를 무시하고 처음부터 시작합니다: {CHECKPOINT_PATH}")
+        counters = {}
+        processed = 0
+        labels_offset = None
+
+    print(f"Streaming articles from: {args.input}")
+    labeler = Labeler(args, device)
+    if checkpoint and "labeler" in checkpoint:
+        labeler.load_state(checkpoint["labeler"])
+    if checkpoint and labeler.cascade and "cascade" in checkpoint:
+        labeler.cascade.stats.load_state(checkpoint["cascade"])
+
+    # 일자별 감성 기록 (새로 들어온 기사만 누적, 추세 조회용)
+    # 체크포인트 이후에 반영된 기사가 있어도 seen_articles 때문에 다시 세지 않는다
+    history = SentimentHistory()
+    # 기사별 라벨 조회용 인덱스 (회사 / 라벨 / 발행 시각). 같은 (기사, 회사) 는 덮어쓰므로 resume 해도 안전
+    store = ArticleStore()
+
+    signature = input_signature(args.input)
+    articles = islice(iter_articles(args.input), processed, None)
+    try:
+        with JsonlWriter(args.labels_out, resume_at=labels_offset) as labels_out:
+            for window in iter_windows(articles, args.window):
+                if dedup or attribution:
+                    results = resolve_labels(labeler, window, processed, dedup, attribution)
+                else:
+                    results = labeler.label_window(window)
+
+                for i, ((company_name, article), (label, confidence, source)) in enumerate(zip(window, results)):
+                    # 크롤링한 회사 + (--link-entities) 기사에 언급된 다른 상장사
+                    companies = attribution.companies(company_name, article) if attribution else [company_name]
+
+                    # 기사별 라벨은 바로 파일로
+                    record = labeled_record(company_name, article, label, confidence, source)
+                    if dedup and dedup.is_duplicate(processed + i):
+                        record["duplicate_of"] = dedup.rep_of[processed + i]
+                    if attribution:
+                        record["linked_companies"] = companies
+                    labels_out.write(record)
+
+                    for company in companies:
+                        # 같은 URL 은 회사마다 한 번만
+                        if attribution and not attribution.first_attribution(
+                            article_key(article), company, company == company_name
+                        ):
+                            continue
+                        store.add(company, record, company == company_name)
+
+                        # 중복 기사는 정책에 따라 집계/기록에서 뺀다
+                        if dedup and not dedup.should_count(processed + i, company):
+                            continue
+
+                        # 일자별 기록에 반영 (이미 반영된 기사는 무시됨)
+                        history.add_label(company, article, label)
+
+                        # 기업별 카운트
+                        count_label(counters.setdefault(company, new_counter()), label)
+
+                processed += len(window)
+
+                # 라벨 파일 / 일자별 기록 / 기사 저장소를 먼저 디스크에 내린 뒤 체크포인트 교체
+                history.commit()
+                store.commit()
+                state = {
+                    "input": signature,
+                    "labels_out": str(args.labels_out.resolve()),
+                    "labels_offset": labels_out.offset(),
+                    "processed": processed,
+                    "counters": counters,
+                    "options": checkpoint_options(args),
+                    "labeler": labeler.state(),
+                }
+                if dedup:
+                    state["dedup"] = dedup.state()
+                if labeler.cascade:
+                    state["cascade"] = labeler.cascade.stats.state()
+                if attribution:
+                    state["attribution"] = attribution.state()
+                save_checkpoint(state)
+                print(
+                    f"[PROGRESS] {processed} articles, {len(counters)} companies "
+                    f"(cache hits={labeler.hits}, classified={labeler.classified})"
+                )
+    finally:
+        labeler.close()
+        store.close()
+
+    print(f"Saved {processed} labeled articles to: {args.labels_out} (indexed in {store.path})")
+    if labeler.cascade:
+        print(f"[CASCADE] {labeler.cascade.stats.summary()}")
+    if attribution:
+        print(
+            f"[LINK] {attribution.reused} articles reused a label by URL, "
+            f"{attribution.extra_links} extra company links from article text"
+        )
+    if dedup:
+        print(
+            f"[DEDUP] {len(dedup.rep_of)} duplicates reused a cluster label, "
+            f"{dedup.skipped} not counted (policy={dedup.policy})"
+        )
+
+    # 일자별 기록: 새 기사가 없던 회사도 오늘 기준으로 윈도우를 밀어 둔다
+    history.advance_all()
+    history.close()
+    print("Updated sentiment history.")
+
+    # 2) 기업별 점수 결과 저장 (핵심 파일)
+    save_company_scores(finalize_scores(counters))
+
+    # 끝까지 돌았으면 체크포인트는 필요 없음
+    CHECKPOINT_PATH.unlink(missing_ok=True)
+
 
 if __name__ == "__main__":
     main()
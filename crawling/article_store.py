@@ -0,0 +1,227 @@
+"""
+기사별 감성 라벨 저장소 (SQLite).
+
+labeled_articles.jsonl 은 순서대로 쓰기만 하는 파일이라 "삼성전자 최근 악재 기사" 같은 조회를 하려면
+전체를 읽어야 한다. analyze.py 가 라벨을 쓸 때 같은 내용을 (회사, 기사) 한 행씩 여기에도 넣고,
+회사 / 라벨 / 발행 시각 인덱스로 조회한다. (회사별 파일 2000개 대신 파일 하나)
+
+- 기사 하나가 여러 회사에 연결되면(--link-entities) 회사마다 한 행
+- 같은 (기사 키, 회사) 는 덮어쓰므로 --resume 으로 같은 window 를 다시 돌려도 행이 늘지 않음
+- 재전송 기사(--dedup)는 duplicate_of 에 대표 기사 위치가 들어가고, 조회 기본값은 대표 기사만
+
+    python article_store.py latest 삼성전자 --label negative --limit 5
+    python article_store.py import                    # 기존 db/labeled_articles.jsonl 로 다시 만들기
+    python article_store.py stats
+
+웹에서는 db/labeled_articles.sqlite3 를 Web/recommend/data/ 로 복사해서 읽는다.
+(recommend/services/article_labels.py)
+"""
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from sentiment_history import article_key
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+ARTICLE_DB_PATH = DB_DIR / "labeled_articles.sqlite3"
+LABELS_JSONL_PATH = DB_DIR / "labeled_articles.jsonl"
+
+LABELS = ("positive", "negative", "neutral")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS labeled_articles (
+    article_key  TEXT NOT NULL,
+    company      TEXT NOT NULL,
+    published_at TEXT NOT NULL DEFAULT '',
+    title        TEXT NOT NULL DEFAULT '',
+    url          TEXT NOT NULL DEFAULT '',
+    label        TEXT,
+    confidence   REAL NOT NULL DEFAULT 0,
+    point        INTEGER NOT NULL DEFAULT 0,
+    source       TEXT NOT NULL DEFAULT 'finbert',
+    crawled      INTEGER NOT NULL DEFAULT 1,   -- 0 이면 본문 언급으로 연결된 회사
+    duplicate_of INTEGER,                      -- 재전송 기사면 대표 기사 위치
+    PRIMARY KEY (article_key, company)
+);
+CREATE INDEX IF NOT EXISTS idx_labeled_company_time
+    ON labeled_articles (company, published_at DESC);
+CREATE INDEX IF NOT EXISTS idx_labeled_company_label_time
+    ON labeled_articles (company, label, published_at DESC);
+CREATE INDEX IF NOT EXISTS idx_labeled_label_time
+    ON labeled_articles (label, published_at DESC);
+"""
+
+_UPSERT = """
+INSERT INTO labeled_articles
+    (article_key, company, published_at, title, url, label, confidence, point, source, crawled, duplicate_of)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(article_key, company) DO UPDATE SET
+    published_at = excluded.published_at,
+    title = excluded.title,
+    url = excluded.url,
+    label = excluded.label,
+    confidence = excluded.confidence,
+    point = excluded.point,
+    source = excluded.source,
+    crawled = excluded.crawled,
+    duplicate_of = excluded.duplicate_of
+"""
+
+
+class ArticleStore:
+    def __init__(self, path: Path = ARTICLE_DB_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # analyze.py 가 쓰는 동안에도 웹/CLI 가 읽을 수 있게
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    # ---------------------------------------------------
+    # 갱신
+    # ---------------------------------------------------
+    def add(self, company: str, record: dict, crawled: bool = True):
+        """
+        labeled_record() 한 줄을 회사 하나에 대한 행으로 넣는다.
+        """
+        self.conn.execute(
+            _UPSERT,
+            (
+                article_key(record),
+                company,
+                record.get("published_at") or "",
+                record.get("title") or "",
+                record.get("url") or "",
+                record.get("sentiment_label"),
+                record.get("sentiment_confidence", 0.0),
+                record.get("sentiment_point", 0),
+                record.get("sentiment_source", "finbert"),
+                int(crawled),
+                record.get("duplicate_of"),
+            ),
+        )
+
+    def add_record(self, record: dict):
+        """
+        labeled_articles.jsonl 한 줄 → 연결된 회사 전부 (import 용)
+        """
+        crawled_company = record.get("company_name")
+        for company in record.get("linked_companies") or [crawled_company]:
+            self.add(company, record, company == crawled_company)
+
+    # ---------------------------------------------------
+    # 조회
+    # ---------------------------------------------------
+    def latest(
+        self,
+        company: str,
+        label: str | None = None,
+        limit: int = 10,
+        include_duplicates: bool = False,
+    ) -> list[dict]:
+        """
+        회사의 최근 기사 (발행 시각 내림차순). label 을 주면 그 라벨만.
+        """
+        where = ["company = ?"]
+        params: list = [company]
+        if label:
+            where.append("label = ?")
+            params.append(label)
+        if not include_duplicates:
+            where.append("duplicate_of IS NULL")
+        rows = self.conn.execute(
+            f"SELECT * FROM labeled_articles WHERE {' AND '.join(where)} "
+            f"ORDER BY published_at DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def stats(self) -> dict:
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS rows, COUNT(DISTINCT company) AS companies, "
+            "COUNT(DISTINCT article_key) AS articles FROM labeled_articles"
+        ).fetchone()
+        by_label = dict(
+            self.conn.execute("SELECT label, COUNT(*) FROM labeled_articles GROUP BY label").fetchall()
+        )
+        return {**dict(row), "labels": by_label}
+
+
+def import_jsonl(jsonl_path: Path, path: Path = ARTICLE_DB_PATH) -> int:
+    """
+    labeled_articles.jsonl 전체로 저장소를 새로 만든다. (임시 파일에 만든 뒤 교체)
+    """
+    tmp_path = path.with_suffix(".sqlite3.tmp")
+    tmp_path.unlink(missing_ok=True)
+    store = ArticleStore(tmp_path)
+    # 한 번에 새로 만드는 것이라 WAL 대신 일반 저널로 (파일 하나로 교체하기 위해)
+    store.conn.execute("PRAGMA journal_mode=DELETE")
+    n = 0
+    with jsonl_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            store.add_record(json.loads(line))
+            n += 1
+            if n % 10000 == 0:
+                store.commit()
+                print(f"[STORE] {n} records imported")
+    store.close()
+
+    for suffix in ("-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    tmp_path.replace(path)
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기사별 감성 라벨 저장소")
+    parser.add_argument("--db", type=Path, default=ARTICLE_DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lp = sub.add_parser("latest", help="회사의 최근 기사")
+    lp.add_argument("company")
+    lp.add_argument("--label", choices=LABELS, default=None)
+    lp.add_argument("--limit", type=int, default=10)
+    lp.add_argument("--include-duplicates", action="store_true", help="재전송 기사도 포함")
+
+    ip = sub.add_parser("import", help="labeled_articles.jsonl 로 저장소 다시 만들기")
+    ip.add_argument("--input", type=Path, default=LABELS_JSONL_PATH)
+
+    sub.add_parser("stats", help="행 / 회사 / 라벨 수")
+
+    args = parser.parse_args()
+    if args.command == "import":
+        n = import_jsonl(args.input, args.db)
+        print(f"Imported {n} labeled articles into: {args.db}")
+        return
+
+    if not args.db.exists():
+        print(f"[ERROR] 저장소가 없습니다: {args.db} (analyze.py 를 돌리거나 `python article_store.py import`)")
+        sys.exit(1)
+    store = ArticleStore(args.db)
+    if args.command == "stats":
+        print(json.dumps(store.stats(), ensure_ascii=False, indent=2))
+    elif args.command == "latest":
+        rows = store.latest(args.company, args.label, args.limit, args.include_duplicates)
+        if not rows:
+            print(f"'{args.company}' 기사가 없습니다.")
+        for r in rows:
+            print(f"{r['published_at'][:16]:<16} {r['label'] or '-':<8} {r['confidence']:.2f}  {r['title']}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
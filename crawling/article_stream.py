@@ -0,0 +1,174 @@
+"""
+크롤링 결과를 한 번에 메모리에 올리지 않고 기사 단위로 흘려 읽기 / 쓰기.
+
+입력 형식 두 가지를 모두 지원한다.
+- JSONL  (crawling.jsonl)  : 한 줄에 기사 하나. 기사 안의 company_name 으로 회사를 구분
+- 기존 JSON (crawling.json) : {회사: [기사, ...]} 구조를 조금씩 읽으면서 기사 하나씩 꺼내는 증분 파서
+
+어느 쪽이든 iter_articles() 는 (회사 이름, 기사 dict) 를 입력 순서대로 내보낸다.
+"""
+import json
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+READ_CHUNK_SIZE = 1 << 20  # 1MB
+
+
+def iter_articles(path: Path) -> Iterator[tuple[str, dict]]:
+    if path.suffix == ".jsonl":
+        return _iter_jsonl(path)
+    return _iter_legacy_json(path)
+
+
+def iter_windows(stream, size: int) -> Iterator[list]:
+    """
+    스트림을 size 개씩 끊어서 리스트로. (배치 정렬은 이 창 안에서만 한다)
+    """
+    stream = iter(stream)
+    while True:
+        window = list(islice(stream, size))
+        if not window:
+            return
+        yield window
+
+
+def _iter_jsonl(path: Path) -> Iterator[tuple[str, dict]]:
+    with path.open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                article = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"[WARN] {path}:{line_no} JSON 파싱 실패, 건너뜀: {e}")
+                continue
+            yield article.get("company_name", ""), article
+
+
+def _iter_legacy_json(path: Path, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[tuple[str, dict]]:
+    """
+    {"회사": [ {...}, {...} ], ...} 형식을 chunk_size 씩 읽으면서 기사 단위로 디코딩.
+    메모리에는 현재 읽고 있는 청크 + 기사 하나 정도만 올라간다.
+    """
+    decoder = json.JSONDecoder()
+
+    with path.open("r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+
+        def fill() -> bool:
+            nonlocal buf, pos
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_ws():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf) or not fill():
+                    return
+
+        def peek() -> str:
+            skip_ws()
+            if pos >= len(buf):
+                raise ValueError(f"{path}: 파일이 중간에 끝났습니다")
+            return buf[pos]
+
+        def expect(chars: str) -> str:
+            nonlocal pos
+            ch = peek()
+            if ch not in chars:
+                raise ValueError(f"{path}: '{chars}' 가 와야 하는데 '{ch}' 가 있습니다")
+            pos += 1
+            return ch
+
+        def decode_value():
+            nonlocal pos
+            skip_ws()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    pos = end
+                    return value
+                except json.JSONDecodeError:
+                    # 값이 청크 경계에서 잘린 경우 → 더 읽어서 다시 시도
+                    if not fill():
+                        raise
+
+        expect("{")
+        if peek() == "}":
+            return
+        while True:
+            company_name = decode_value()
+            expect(":")
+            expect("[")
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield company_name, decode_value()
+                    if expect(",]") == "]":
+                        break
+            if expect(",}") == "}":
+                return
+
+
+def input_signature(path: Path) -> dict:
+    """
+    입력 파일 식별용 (경로, 크기, 수정 시각). 기사 위치를 기준으로 저장한 중간 결과가
+    같은 입력에서 나온 것인지 확인할 때 쓴다.
+    """
+    st = path.stat()
+    return {"path": str(path.resolve()), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class JsonlWriter:
+    """
+    기사/라벨을 한 줄씩 바로 파일에 쓰는 writer. 임시 파일에 쓰고 close 때 교체.
+
+    resume_at 을 주면 이전 실행이 남긴 임시 파일을 그 바이트 위치까지 자르고 이어 쓴다.
+    (체크포인트 이후에 쓰인 줄은 버려지므로 중간에 끊겨도 줄이 중복되지 않음)
+    """
+
+    def __init__(self, path: Path, resume_at: int | None = None):
+        self.path = path
+        self.tmp_path = path.with_suffix(path.suffix + ".tmp")
+        self.resume_at = resume_at
+        self.count = 0
+        self._f = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.resume_at is None:
+            self._f = self.tmp_path.open("wb")
+        else:
+            self._f = self.tmp_path.open("r+b")
+            self._f.truncate(self.resume_at)
+            self._f.seek(self.resume_at)
+        return self
+
+    def write(self, record: dict):
+        self._f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.count += 1
+
+    def offset(self) -> int:
+        """
+        지금까지 쓴 내용을 디스크로 내보내고 현재 바이트 위치를 반환 (체크포인트용)
+        """
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def __exit__(self, exc_type, exc, tb):
+        self._f.close()
+        if exc_type is None:
+            self.tmp_path.replace(self.path)
+        return False
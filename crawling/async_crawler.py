@@ -0,0 +1,343 @@
+# async_crawler.py
+"""
+news_crawler.py 의 asyncio 버전.
+
+news_crawler.py 는 종목 2000개 x 기사 50개 x 요청 2번을 한 번에 하나씩 보내고
+사이사이 sleep 까지 하므로 전체 크롤링이 몇 시간 걸린다.
+여기서는 같은 파싱 함수(parse_news_list_from_list_page / WrapperPage / parse_article_page)를 쓰되
+요청을 동시에 보내고, 예의(politeness) 제한은 전역 sleep 대신 호스트마다 건다.
+
+- 호스트별 동시 요청 수 상한 (finance.naver.com, n.news.naver.com 각각)
+- 호스트별 요청 시작 간격 하한 (같은 호스트에 delay 초에 한 번 이상 보내지 않음)
+→ 전체 시간 ≈ 호스트별 요청 수 x delay. 왕복 시간이 아니라 예의 설정이 속도를 정한다.
+
+출력 형식은 news_crawler.py 와 같다. (.json 은 회사 → 기사 목록, .jsonl 은 한 줄에 기사 하나, 종목 순서 유지)
+
+    python async_crawler.py                                       # db/crawling.json
+    python async_crawler.py --output db/crawling.jsonl
+    python async_crawler.py --concurrency 8 --delay 0.05          # 모든 호스트에 같은 제한
+    python async_crawler.py --incremental                         # 새 기사만 받아서 기존 코퍼스에 합치기 (crawl_index.py)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import html_backend
+from article_stream import JsonlWriter
+from crawl_index import SeenIndex, index_path_for, split_new_items
+from news_crawler import (
+    DB_DIR,
+    DEFAULT_HEADERS,
+    DETAIL_STATS,
+    MAX_LIST_PAGES,
+    N_NEWS_PER_STOCK,
+    REQUEST_TIMEOUT,
+    WrapperPage,
+    build_list_url,
+    direct_article_url,
+    finish_incremental,
+    list_item_article,
+    load_targets,
+    parse_article_page,
+    parse_news_list_from_list_page,
+    tag_company,
+)
+
+logger = logging.getLogger(__name__)
+
+# 호스트별 (동시 요청 수, 요청 시작 간격 초). 목록에 없는 호스트는 DEFAULT_HOST_LIMIT
+HOST_LIMITS = {
+    "finance.naver.com": (4, 0.1),
+    "n.news.naver.com": (4, 0.1),
+    "news.naver.com": (2, 0.2),
+}
+DEFAULT_HOST_LIMIT = (2, 0.2)
+
+# 동시에 진행하는 종목 수 (종목 순서대로 이만큼만 띄워 두는 창).
+# 출력은 종목 순서대로 쓰므로 앞 종목이 늦으면 창이 멈추고, 쌓이는 결과는 최대 이 개수
+COMPANY_CONCURRENCY = 16
+
+
+class HostLimiter:
+    """
+    호스트 하나에 대한 동시 요청 수 + 요청 시작 간격 제한.
+
+        async with limiter:
+            await session.get(...)
+    """
+
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        # 요청 시작 시각을 delay 간격으로 예약해 두고 그때까지 기다린다
+        async with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.delay
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+class AsyncFetcher:
+    """
+    aiohttp 세션 + 호스트별 HostLimiter. 실패하면 None (news_crawler 와 같이 경고만 남김)
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, override: tuple[int, float] | None = None):
+        self.session = session
+        self.override = override
+        self.limiters: Dict[str, HostLimiter] = {}
+        self.requests: Dict[str, int] = {}
+        self.failures = 0
+
+    def _limiter(self, host: str) -> HostLimiter:
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            concurrency, delay = self.override or HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT)
+            limiter = self.limiters[host] = HostLimiter(concurrency, delay)
+        return limiter
+
+    async def get_text(self, url: str) -> str | None:
+        host = urlsplit(url).hostname or ""
+        async with self._limiter(host):
+            self.requests[host] = self.requests.get(host, 0) + 1
+            try:
+                async with self.session.get(url) as resp:
+                    resp.raise_for_status()
+                    return await resp.text(errors="replace")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.failures += 1
+                logger.warning(f"Failed to fetch {url}: {e!r}")
+                return None
+
+
+# ---------------------------------------------------
+# 기사 / 종목 크롤링 (news_crawler.py 와 같은 순서, 요청만 비동기)
+# ---------------------------------------------------
+async def fetch_article_detail_async(fetcher: AsyncFetcher, url: str) -> dict | None:
+    # 리스트 링크로 기사 주소를 바로 만들 수 있으면 wrapper 없이 한 번에
+    direct_url = direct_article_url(url)
+    if direct_url:
+        html = await fetcher.get_text(direct_url)
+        article = parse_article_page(url, None, html, direct_url) if html is not None else None
+        if article:
+            DETAIL_STATS.direct += 1
+            return article
+
+    DETAIL_STATS.fallback += 1
+    wrapper_html = await fetcher.get_text(url)
+    if wrapper_html is None:
+        return None
+
+    wrapper = WrapperPage(wrapper_html)
+
+    inner_html = None
+    inner_url = None
+    # JS redirect 가 있으면 먼저, 못 가져오면 iframe 시도
+    for candidate, _ in wrapper.inner_url_candidates():
+        inner_url = candidate
+        inner_html = await fetcher.get_text(candidate)
+        if inner_html is not None:
+            break
+
+    return parse_article_page(url, wrapper, inner_html, inner_url)
+
+
+async def fetch_company_news_async(
+    fetcher: AsyncFetcher,
+    company: Dict[str, Any],
+    max_items: int,
+    known: set[str] | None = None,
+    retry: set[str] | None = None,
+) -> List[Dict[str, Any]]:
+    name = company["name"]
+    code = company["code"]
+
+    # 리스트 페이지는 다음 페이지가 필요한지 알아야 하므로 순서대로
+    items: List[Dict[str, Any]] = []
+    page = 1
+    reached_known = False
+    while len(items) < max_items and page <= MAX_LIST_PAGES:
+        html = await fetcher.get_text(build_list_url(code, page=page))
+        if html is None:
+            break
+        rough_list = parse_news_list_from_list_page(html, max_items=max_items - len(items))
+        if not rough_list:
+            logger.info(f"No more articles found for {name}({code}) at page {page}")
+            break
+        done = False
+        if known is not None:
+            # 증분 크롤링: 이미 본 기사부터는 더 오래된 기사라 (남은 stub 이 없으면) 페이지 넘기기를 멈춘다
+            rough_list, reached_known, done = split_new_items(rough_list, known, retry, reached_known)
+        items.extend(rough_list)
+        if done:
+            break
+        page += 1
+
+    # 상세 페이지는 한꺼번에 (호스트 제한은 AsyncFetcher 가 건다)
+    details = await asyncio.gather(
+        *(fetch_article_detail_async(fetcher, item["detail_url"]) for item in items)
+    )
+    collected = [
+        tag_company(article or list_item_article(item), company)
+        for item, article in zip(items, details)
+    ]
+    logger.info(f"Collected {len(collected)} articles for {name}({code})")
+    return collected
+
+
+async def crawl_all_async(
+    market_code_path: Path,
+    output_path: Path,
+    override: tuple[int, float] | None = None,
+    company_concurrency: int = COMPANY_CONCURRENCY,
+    incremental: bool = False,
+):
+    targets = load_targets(market_code_path)
+    index = SeenIndex(index_path_for(output_path), output_path) if incremental else None
+    t0 = time.monotonic()
+
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    # 호스트별 제한은 HostLimiter 가 하므로 커넥션 풀 자체는 넉넉하게
+    connector = aiohttp.TCPConnector(limit=0, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, timeout=timeout, connector=connector) as session:
+        fetcher = AsyncFetcher(session, override)
+
+        async def run(company: Dict[str, Any]) -> List[Dict[str, Any]]:
+            if index is None:
+                return await fetch_company_news_async(fetcher, company, N_NEWS_PER_STOCK)
+            code = company["code"]
+            retry = index.retry_keys(code)
+            articles = await fetch_company_news_async(
+                fetcher, company, N_NEWS_PER_STOCK, index.known_keys(code), set(retry)
+            )
+            index.mark_retried(code, retry)
+            return articles
+
+        async def in_order():
+            """
+            종목 순서대로 (종목, 기사들). 태스크는 company_concurrency 개까지만 띄워 두고,
+            맨 앞 종목을 내보낼 때 다음 종목을 하나 시작한다. (미리 다 만들면 늦은 종목 뒤로 결과가 끝없이 쌓임)
+            """
+            remaining = iter(targets)
+            window: deque = deque(
+                (company, asyncio.create_task(run(company)))
+                for company in islice(remaining, company_concurrency)
+            )
+            while window:
+                company, task = window.popleft()
+                articles = await task
+                nxt = next(remaining, None)
+                if nxt is not None:
+                    window.append((nxt, asyncio.create_task(run(nxt))))
+                yield company, articles
+
+        total = len(targets)
+
+        # 끝난 순서가 아니라 종목 순서대로 받아서 news_crawler.py 와 같은 출력 순서를 유지
+        if index is not None:
+            new_articles: Dict[str, List[Dict[str, Any]]] = {}
+            async for company, articles in in_order():
+                if articles:
+                    new_articles[company["name"]] = articles
+            companies_with_news = len(new_articles)
+            article_count = sum(len(v) for v in new_articles.values())
+        elif output_path.suffix == ".jsonl":
+            companies_with_news = 0
+            with JsonlWriter(output_path) as writer:
+                idx = 0
+                async for company, articles in in_order():
+                    idx += 1
+                    logger.info(f"=== [{idx}/{total}] {company['name']} ({company['code']}) done ===")
+                    if articles:
+                        companies_with_news += 1
+                        for article in articles:
+                            writer.write(article)
+            article_count = writer.count
+        else:
+            crawling_data: Dict[str, List[Dict[str, Any]]] = {}
+            idx = 0
+            async for company, articles in in_order():
+                idx += 1
+                logger.info(f"=== [{idx}/{total}] {company['name']} ({company['code']}) done ===")
+                if articles:
+                    crawling_data[company["name"]] = articles
+            companies_with_news = len(crawling_data)
+            article_count = sum(len(v) for v in crawling_data.values())
+
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("w", encoding="utf-8", errors="ignore") as f:
+                json.dump(crawling_data, f, ensure_ascii=False, indent=2)
+
+    if index is not None:
+        finish_incremental(index, output_path, new_articles)
+
+    elapsed = time.monotonic() - t0
+    requests_total = sum(fetcher.requests.values())
+    logger.info(
+        f"Crawling finished in {elapsed:.0f}s. Companies with news: {companies_with_news}, "
+        f"articles: {article_count}"
+    )
+    logger.info(
+        f"Requests: {requests_total} ({requests_total / elapsed if elapsed else 0:.1f}/s), "
+        f"failures: {fetcher.failures}, by host: {fetcher.requests}"
+    )
+    logger.info(DETAIL_STATS.summary())
+    logger.info(f"Saved crawling data to: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 금융 종목 뉴스 비동기 크롤러")
+    parser.add_argument("--market-codes", type=Path, default=DB_DIR / "market_code.json")
+    parser.add_argument("--output", type=Path, default=DB_DIR / "crawling.json")
+    parser.add_argument(
+        "--concurrency", type=int, default=None,
+        help="호스트별 동시 요청 수 (주면 모든 호스트에 같은 값, 안 주면 HOST_LIMITS)",
+    )
+    parser.add_argument("--delay", type=float, default=None, help="같은 호스트 요청 시작 간격(초)")
+    parser.add_argument("--companies", type=int, default=COMPANY_CONCURRENCY, help="동시에 진행하는 종목 수")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="이미 받은 기사(<output>.index.sqlite3)는 건너뛰고 새 기사만 받아 --output 에 합친다",
+    )
+    parser.add_argument("--parser", choices=html_backend.BACKENDS, default=None,
+                        help="HTML 파서 (기본: 설치된 것 중 가장 빠른 것)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
+    )
+
+    html_backend.use_backend(args.parser)
+    logger.info(f"HTML parser: {html_backend.backend_name}")
+
+    override = None
+    if args.concurrency is not None or args.delay is not None:
+        override = (
+            args.concurrency if args.concurrency is not None else DEFAULT_HOST_LIMIT[0],
+            args.delay if args.delay is not None else DEFAULT_HOST_LIMIT[1],
+        )
+    asyncio.run(crawl_all_async(args.market_codes, args.output, override, args.companies, args.incremental))
+
+
+if __name__ == "__main__":
+    main()
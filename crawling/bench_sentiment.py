@@ -0,0 +1,302 @@
+"""
+감성 분석 추론 벤치마크.
+
+고정된 기사 샘플(bench/fixture.jsonl)을 설정 조합(backend x batch_size x max_length x truncation x threads)마다
+분류해서 처리량 / 배치 지연 / 최대 메모리 / 기준 설정 대비 라벨 일치율을 잰다.
+설정마다 새 프로세스에서 돌리기 때문에 peak RSS 가 서로 섞이지 않는다.
+
+    python bench_sentiment.py sample --input db/crawling.json --n 500   # fixture + manifest 만들기 (한 번, 둘 다 커밋)
+    python bench_sentiment.py run --batch-sizes 8,16,32 --max-lengths 256,512 --threads 4
+    python bench_sentiment.py run --backends torch,onnx-int8 --out bench/results/onnx.json
+    python bench_sentiment.py run --max-lengths 128,256 --truncations head,lead,head-tail --token-budget 8192
+
+커밋된 fixture 는 종목 이름 x 헤드라인 / 문장 템플릿으로 만든 합성 기사 300개다. (코퍼스는 저장소에 넣지 않으므로
+manifest 의 source 가 "synthetic". 실제 기사로 바꾸려면 sample 로 다시 만들어 둘 다 커밋)
+결과 JSON 은 bench/results/ 에 쌓아서 설정 변경 전후를 비교한다.
+run 은 fixture 의 sha256 을 bench/fixture.manifest.json 과 맞춰 보고 다르면 멈춘다.
+(결과에도 해시가 남으므로 해시가 같은 결과끼리만 비교할 것)
+속도/일치율 기준은 항상 맨 앞에 넣는 512 토큰 head 설정이다. (--backends 첫 번째 백엔드, --batch-sizes 첫 번째 값)
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+
+from article_stream import JsonlWriter, iter_articles
+
+BASE_DIR = Path(__file__).resolve().parent
+BENCH_DIR = BASE_DIR / "bench"
+FIXTURE_PATH = BENCH_DIR / "fixture.jsonl"
+FIXTURE_MANIFEST_SUFFIX = ".manifest.json"
+RESULTS_DIR = BENCH_DIR / "results"
+BASELINE_MAX_LENGTH = 512
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def peak_rss_mb() -> float:
+    # 리눅스는 KB, macOS 는 byte 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# ---------------------------------------------------
+# fixture
+# ---------------------------------------------------
+def manifest_path_for(fixture_path: Path) -> Path:
+    return fixture_path.with_suffix(FIXTURE_MANIFEST_SUFFIX)
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def verify_fixture(fixture_path: Path) -> str:
+    """
+    fixture 해시가 manifest 와 같은지 확인하고 해시를 돌려준다. 다르거나 manifest 가 없으면 종료.
+    """
+    manifest_path = manifest_path_for(fixture_path)
+    if not manifest_path.exists():
+        raise SystemExit(
+            f"[ERROR] fixture manifest 가 없습니다: {manifest_path}\n"
+            f"  bench_sentiment.py sample 로 fixture 와 manifest 를 같이 만들어 커밋하세요."
+        )
+    with manifest_path.open("r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    digest = file_sha256(fixture_path)
+    if digest != manifest.get("sha256"):
+        raise SystemExit(
+            f"[ERROR] fixture 가 manifest 와 다릅니다: {fixture_path}\n"
+            f"  manifest={manifest.get('sha256')} actual={digest}\n"
+            f"  결과를 예전 결과와 비교할 수 없습니다. 의도한 변경이면 sample 로 다시 만들어 둘 다 커밋하세요."
+        )
+    return digest
+
+
+def sample_fixture(input_path: Path, n: int, out_path: Path, seed: int = 42):
+    """
+    코퍼스에서 n 개를 reservoir sampling 으로 뽑아 fixture 로 저장 (입력 순서 유지)
+    분류에 쓰지 않는 URL / 회사 정보는 빼고 제목 / 본문만 남긴다. 해시는 manifest 에 기록.
+    """
+    rng = random.Random(seed)
+    reservoir: list[tuple[int, str, dict]] = []
+    for i, (company, article) in enumerate(iter_articles(input_path)):
+        item = (i, company, article)
+        if len(reservoir) < n:
+            reservoir.append(item)
+        else:
+            j = rng.randint(0, i)
+            if j < n:
+                reservoir[j] = item
+    reservoir.sort(key=lambda x: x[0])
+
+    with JsonlWriter(out_path) as writer:
+        for _, company, article in reservoir:
+            writer.write({"title": article.get("title", ""), "content": article.get("content", "")})
+
+    manifest_path = manifest_path_for(out_path)
+    with manifest_path.open("w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "sha256": file_sha256(out_path),
+                "articles": writer.count,
+                "seed": seed,
+                "source": input_path.name,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    print(f"Saved {writer.count} fixture articles to: {out_path} (manifest: {manifest_path})")
+
+
+def load_texts(path: Path, tokenizer=None, truncation: str = "head", max_length: int = 512) -> list[str]:
+    from analyze import prepare_text
+
+    return [
+        prepare_text(tokenizer, a.get("title", ""), a.get("content", ""), truncation, max_length)
+        for _, a in iter_articles(path)
+    ]
+
+
+# ---------------------------------------------------
+# run (설정 하나 = 프로세스 하나)
+# ---------------------------------------------------
+def run_config(config: dict, fixture_path: str) -> dict:
+    import torch
+
+    from analyze import get_classifier, make_batches, run_batch
+
+    threads = config["threads"]
+    if threads:
+        torch.set_num_threads(threads)
+
+    t0 = time.perf_counter()
+    classifier = get_classifier(config["backend"], device=-1, threads=threads, max_length=config["max_length"])
+    load_s = time.perf_counter() - t0
+
+    # 본문 자르기(prepare_text)도 실제 analyze.py 에서 드는 비용이라 처리 시간에 넣는다
+    t0 = time.perf_counter()
+    texts = load_texts(Path(fixture_path), classifier.tokenizer, config["truncation"], config["max_length"])
+    prepare_s = time.perf_counter() - t0
+
+    batches = make_batches(
+        classifier.tokenizer, texts, config["batch_size"], config["max_length"], config["token_budget"]
+    )
+    # 워밍업 (첫 배치는 메모리 할당/그래프 최적화 때문에 느림)
+    run_batch(classifier, [texts[i] for i in batches[0]])
+
+    labels: list[str | None] = [None] * len(texts)
+    latencies_ms: list[float] = []
+    t0 = time.perf_counter()
+    for idxs in batches:
+        b0 = time.perf_counter()
+        for i, (label, _) in zip(idxs, run_batch(classifier, [texts[i] for i in idxs])):
+            labels[i] = label
+        latencies_ms.append((time.perf_counter() - b0) * 1000)
+    total_s = time.perf_counter() - t0 + prepare_s
+
+    return {
+        "config": config,
+        "articles": len(texts),
+        "load_s": round(load_s, 2),
+        "prepare_s": round(prepare_s, 3),
+        "total_s": round(total_s, 3),
+        "batches": len(batches),
+        "articles_per_s": round(len(texts) / total_s, 2),
+        "batch_ms_p50": round(percentile(latencies_ms, 50), 1),
+        "batch_ms_p99": round(percentile(latencies_ms, 99), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "torch_threads": torch.get_num_threads(),
+        "labels": labels,
+    }
+
+
+def agreement(baseline: list, labels: list) -> float:
+    same = sum(1 for a, b in zip(baseline, labels) if a == b)
+    return same / len(baseline) if baseline else 0.0
+
+
+def run(args):
+    if not args.fixture.exists():
+        raise SystemExit(
+            f"[ERROR] fixture 가 없습니다: {args.fixture}\n"
+            f"  python bench_sentiment.py sample --input db/crawling.json --n 500 으로 만든 뒤 커밋하세요."
+        )
+    fixture_sha256 = verify_fixture(args.fixture)
+
+    backends = args.backends.split(",")
+    batch_sizes = _int_list(args.batch_sizes)
+    threads = _int_list(args.threads) or [0]
+    baseline_config = {
+        "backend": backends[0], "batch_size": batch_sizes[0], "max_length": BASELINE_MAX_LENGTH,
+        "truncation": "head", "token_budget": None, "threads": threads[0],
+    }
+    configs = [baseline_config]
+    for backend, bs, ml, tr, th in product(
+        backends, batch_sizes, _int_list(args.max_lengths), args.truncations.split(","), threads
+    ):
+        config = {
+            "backend": backend, "batch_size": bs, "max_length": ml,
+            "truncation": tr, "token_budget": args.token_budget, "threads": th,
+        }
+        if config not in configs:
+            configs.append(config)
+    print(f"Benchmarking {len(configs)} configurations on {args.fixture}")
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for config in configs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            result = pool.submit(run_config, config, str(args.fixture)).result()
+        results.append(result)
+        print(
+            f"[{config['backend']:>9} bs={config['batch_size']:>3} len={config['max_length']:>3} "
+            f"{config['truncation']:>9} th={result['torch_threads']:>2}] {result['articles_per_s']:7.1f} articles/s | "
+            f"batch p50 {result['batch_ms_p50']:7.1f}ms p99 {result['batch_ms_p99']:7.1f}ms | "
+            f"peak RSS {result['peak_rss_mb']:7.1f}MB"
+        )
+
+    baseline = results[0]["labels"]
+    baseline_speed = results[0]["articles_per_s"]
+    print(f"vs baseline (head / {BASELINE_MAX_LENGTH} tokens):")
+    for result, config in zip(results, configs):
+        result["agreement"] = round(agreement(baseline, result.pop("labels")), 4)
+        result["speedup"] = round(result["articles_per_s"] / baseline_speed, 2) if baseline_speed else 0.0
+        print(f"  {result['speedup']:5.2f}x  agreement {result['agreement']:.2%}  {config}")
+
+    out = args.out or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "fixture": str(args.fixture.relative_to(BASE_DIR) if args.fixture.is_relative_to(BASE_DIR) else args.fixture),
+                "fixture_sha256": fixture_sha256,
+                "machine": {
+                    "platform": platform.platform(),
+                    "python": platform.python_version(),
+                    "cpu_count": os.cpu_count(),
+                },
+                "results": results,
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    print(f"Saved results to: {out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감성 분석 추론 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sp = sub.add_parser("sample", help="코퍼스에서 fixture 추출")
+    sp.add_argument("--input", type=Path, default=BASE_DIR / "db" / "crawling.json")
+    sp.add_argument("--n", type=int, default=500)
+    sp.add_argument("--out", type=Path, default=FIXTURE_PATH)
+
+    rp = sub.add_parser("run", help="설정 조합별 벤치마크")
+    rp.add_argument("--fixture", type=Path, default=FIXTURE_PATH)
+    rp.add_argument("--backends", default="torch", help="쉼표 구분: torch,onnx,onnx-int8")
+    rp.add_argument("--batch-sizes", default="32")
+    rp.add_argument("--max-lengths", default="512")
+    rp.add_argument("--truncations", default="head", help="쉼표 구분: head,lead,head-tail")
+    rp.add_argument("--token-budget", type=int, default=None, help="길이 적응형 배치의 배치당 토큰 수 상한")
+    rp.add_argument("--threads", default="", help="쉼표 구분. 비우면 torch 기본값")
+    rp.add_argument("--out", type=Path, default=None)
+
+    args = parser.parse_args()
+    if args.command == "sample":
+        sample_fixture(args.input, args.n, args.out)
+    elif args.command == "run":
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
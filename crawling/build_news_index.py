@@ -0,0 +1,202 @@
+"""
+crawling.json 기사 본문으로 LLM 근거용 검색 인덱스를 만든다. (오프라인, 하루 1번)
+
+결과물 (db/news_index/):
+    embeddings.npy      float16 (N, D), L2 정규화. 같은 회사 청크끼리 연속으로 저장
+    chunks.jsonl        청크 텍스트/메타데이터 (한 줄에 청크 하나)
+    chunk_offsets.npy   int64 (N+1,) chunks.jsonl 각 줄의 바이트 위치
+    meta.json           임베딩 모델, 차원, 회사별 [start, end) 행 범위
+
+웹 워커가 mmap 으로 열고 있는 파일을 덮어쓰지 않도록, 매번 새 디렉터리(news_index.<시각>)에 만든 뒤
+news_index 심볼릭 링크를 os.replace 로 바꿔 끼운다. 바로 전 버전 하나는 남겨 두고 그보다 오래된 것만 지운다.
+(읽는 쪽은 meta.json 이 바뀐 걸 보고 새 디렉터리를 다시 연다)
+
+웹 쪽(recommend/services/retrieval.py)은 Web/recommend/data/news_index (또는 NEWS_INDEX_DIR 환경 변수 경로)의
+embeddings.npy 를 mmap 으로 열고,
+선택된 종목의 행 범위만 내적해서 top-k 를 고른다. 회사 단위로 나눠 둔 것이
+coarse partition 역할을 해서 종목당 수백 행만 보면 된다.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+
+import numpy as np
+import requests
+
+from article_stream import iter_articles
+
+# ---- 경로 설정 ----
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+INPUT_PATH = DB_DIR / "crawling.json"
+INDEX_DIR = DB_DIR / "news_index"
+
+# CPU 에서 돌아가는 다국어 임베딩 모델 (Ollama 로 서빙, 웹 쪽 질의 임베딩과 같은 모델이어야 함)
+OLLAMA_EMBED_URL = "http://localhost:11434/api/embed"
+EMBED_MODEL = "bge-m3"
+
+CHUNK_CHARS = 300        # 청크 길이(글자)
+CHUNK_OVERLAP = 50       # 청크끼리 겹치는 길이
+MAX_CHUNKS_PER_ARTICLE = 4
+EMBED_BATCH_SIZE = 32
+# 지우지 않고 남겨 두는 예전 버전 수 (아직 예전 인덱스를 들고 있는 워커용)
+KEEP_OLD_VERSIONS = 1
+
+
+def chunk_article(title: str, content: str) -> list[str]:
+    """
+    기사 하나를 제목이 앞에 붙은 청크 여러 개로 자른다.
+    """
+    title = (title or "").strip()
+    content = " ".join((content or "").split())
+    if not content:
+        return [title] if title else []
+
+    chunks = []
+    step = CHUNK_CHARS - CHUNK_OVERLAP
+    for start in range(0, len(content), step):
+        piece = content[start:start + CHUNK_CHARS]
+        chunks.append(f"{title}\n{piece}")
+        if len(chunks) >= MAX_CHUNKS_PER_ARTICLE or start + CHUNK_CHARS >= len(content):
+            break
+    return chunks
+
+
+def embed_texts(texts: list[str], model: str = EMBED_MODEL) -> np.ndarray:
+    """
+    Ollama 임베딩 호출 (배치). 반환값은 L2 정규화된 float32 (len(texts), D)
+    """
+    resp = requests.post(
+        OLLAMA_EMBED_URL,
+        json={"model": model, "input": texts},
+        timeout=300,
+    )
+    resp.raise_for_status()
+    vecs = np.asarray(resp.json()["embeddings"], dtype=np.float32)
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vecs / norms
+
+
+def publish_version(version_dir: Path, out_dir: Path):
+    """
+    out_dir 심볼릭 링크가 version_dir 을 가리키게 원자적으로 바꾸고, 오래된 버전 디렉터리를 지운다.
+    """
+    if out_dir.exists() and not out_dir.is_symlink():
+        # 링크 대신 디렉터리로 복사해 둔 인덱스. 버전 디렉터리 이름으로 옮겨 두고 링크로 바꾼다
+        legacy = out_dir.with_name(f"{out_dir.name}.old")
+        print(f"[INDEX] {out_dir} 를 {legacy} 로 옮기고 심볼릭 링크로 바꿉니다.")
+        os.replace(out_dir, legacy)
+
+    tmp_link = out_dir.with_name(f".{out_dir.name}.link")
+    if tmp_link.is_symlink():
+        tmp_link.unlink()
+    tmp_link.symlink_to(version_dir.name)
+    os.replace(tmp_link, out_dir)
+
+    versions = sorted(
+        (p for p in out_dir.parent.glob(f"{out_dir.name}.*") if p.is_dir() and p != version_dir),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for old in versions[KEEP_OLD_VERSIONS:]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def build_index(input_path: Path, out_dir: Path, model: str = EMBED_MODEL):
+    print(f"Streaming crawling data from: {input_path}")
+
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    # 다 만든 뒤에 이름을 바꿔 publish 하므로 만드는 도중에는 점으로 시작하는 임시 디렉터리
+    build_dir = Path(tempfile.mkdtemp(prefix=f".{out_dir.name}-", dir=out_dir.parent))
+    try:
+        if not _build_into(input_path, build_dir, model):
+            return
+        version_dir = build_dir.rename(out_dir.with_name(f"{out_dir.name}.{datetime.now():%Y%m%d-%H%M%S}"))
+        publish_version(version_dir, out_dir)
+    finally:
+        if build_dir.exists():
+            shutil.rmtree(build_dir, ignore_errors=True)
+    print(f"Published news index: {out_dir} -> {version_dir.name}")
+
+
+def _build_into(input_path: Path, out_dir: Path, model: str) -> bool:
+    """out_dir(빈 임시 디렉터리)에 인덱스 파일을 만든다. 기사가 없으면 False"""
+    chunks_path = out_dir / "chunks.jsonl"
+
+    companies: dict[str, list[int]] = {}
+    offsets = [0]
+    vectors: list[np.ndarray] = []
+    pending: list[str] = []
+
+    def flush():
+        if pending:
+            vectors.append(embed_texts(pending, model).astype(np.float16))
+            pending.clear()
+
+    row = 0
+    with chunks_path.open("wb") as out:
+        # 회사별 행 범위를 연속으로 잡기 위해 같은 회사 기사끼리 묶어서 처리
+        # (news_crawler 출력은 .json / .jsonl 모두 회사별로 연속)
+        for company_name, group in groupby(iter_articles(input_path), key=lambda x: x[0]):
+            if company_name in companies:
+                print(f"[WARN] {company_name}: 기사가 연속되어 있지 않아 앞부분 범위는 무시됩니다.")
+            start = row
+            for _, article in group:
+                for text in chunk_article(article.get("title", ""), article.get("content", "")):
+                    record = {
+                        "company": company_name,
+                        "title": article.get("title", ""),
+                        "url": article.get("url", ""),
+                        "published_at": article.get("published_at", ""),
+                        "text": text,
+                    }
+                    out.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                    offsets.append(out.tell())
+                    pending.append(text)
+                    row += 1
+                    if len(pending) >= EMBED_BATCH_SIZE:
+                        flush()
+            if row > start:
+                companies[company_name] = [start, row]
+            print(f"[INDEX] {company_name}: {row - start} chunks")
+        flush()
+
+    if not vectors:
+        print("[WARN] 인덱싱할 기사가 없습니다.")
+        return False
+
+    embeddings = np.concatenate(vectors, axis=0)
+    np.save(out_dir / "embeddings.npy", embeddings)
+    np.save(out_dir / "chunk_offsets.npy", np.asarray(offsets, dtype=np.int64))
+
+    meta = {
+        "model": model,
+        "dim": int(embeddings.shape[1]),
+        "count": int(embeddings.shape[0]),
+        "companies": companies,
+    }
+    with (out_dir / "meta.json").open("w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    print(f"Saved news index ({meta['count']} chunks, dim={meta['dim']})")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="crawling.json 기사 검색 인덱스 생성")
+    parser.add_argument("--input", type=Path, default=INPUT_PATH)
+    parser.add_argument("--out", type=Path, default=INDEX_DIR)
+    parser.add_argument("--model", default=EMBED_MODEL)
+    args = parser.parse_args()
+
+    build_index(args.input, args.out, args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+FinBERT 앞단에 두는 가벼운 제목 분류기 (cheap-first cascade).
+
+"사상 최대 실적", "상장폐지 우려" 처럼 제목만 봐도 뻔한 기사는 제목 분류기가 바로 라벨을 붙이고,
+확신도가 threshold 보다 낮은 기사만 FinBERT 로 보낸다.
+
+분류기 두 가지:
+- lexicon : 금융 호재/악재 표현 사전 (학습 필요 없음)
+- linear  : 제목 글자 n-gram 해싱 + 소프트맥스 회귀. labeled_articles.jsonl 의 FinBERT 라벨로 학습
+
+    python cascade.py train                              # linear 모델 학습 → db/cascade_linear.npz
+    python cascade.py eval --kind lexicon                # threshold 별 라우팅 비율 / FinBERT 일치율
+"""
+import argparse
+import hashlib
+import json
+import random
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+LABELS_PATH = DB_DIR / "labeled_articles.jsonl"
+LINEAR_MODEL_PATH = DB_DIR / "cascade_linear.npz"
+
+LABELS = ("positive", "negative", "neutral")
+DEFAULT_THRESHOLD = 0.75
+
+# ---------------------------------------------------
+# lexicon
+# ---------------------------------------------------
+# 표현 → 가중치. 제목에 부분 문자열로 들어 있으면 더한다.
+POSITIVE_TERMS = {
+    "사상 최대": 2.0, "사상최대": 2.0, "역대 최대": 2.0, "역대최대": 2.0, "최대 실적": 2.0,
+    "어닝 서프라이즈": 2.0, "어닝서프라이즈": 2.0, "흑자전환": 2.0, "흑자 전환": 2.0,
+    "신고가": 1.5, "상한가": 2.0, "급등": 1.5, "수주": 1.0, "대규모 계약": 1.5, "공급계약": 1.0,
+    "호실적": 2.0, "실적 개선": 1.5, "턴어라운드": 1.5, "목표가 상향": 2.0, "목표주가 상향": 2.0,
+    "투자의견 상향": 2.0, "자사주 매입": 1.5, "자사주 소각": 1.5, "배당 확대": 1.5, "증익": 1.5,
+    "최대 매출": 1.5, "영업익 증가": 1.5, "호재": 1.0, "강세": 1.0, "반등": 0.5,
+}
+NEGATIVE_TERMS = {
+    "상장폐지": 2.0, "상폐": 2.0, "거래정지": 2.0, "관리종목": 2.0, "횡령": 2.0, "배임": 2.0,
+    "적자전환": 2.0, "적자 전환": 2.0, "어닝 쇼크": 2.0, "어닝쇼크": 2.0, "하한가": 2.0,
+    "급락": 1.5, "폭락": 2.0, "신저가": 1.5, "목표가 하향": 2.0, "목표주가 하향": 2.0,
+    "투자의견 하향": 2.0, "영업손실": 1.0, "적자 지속": 1.5, "감익": 1.5, "실적 부진": 1.5,
+    "유상증자": 1.0, "소송": 1.0, "리콜": 1.5, "압수수색": 2.0, "부도": 2.0, "회생절차": 2.0,
+    "감사의견 거절": 2.0, "악재": 1.0, "약세": 1.0,
+}
+
+
+class LexiconClassifier:
+    """
+    호재/악재 표현 점수 차이로 라벨을 정한다.
+    양쪽 표현이 같이 나오면 (예: "적자전환 우려 딛고 급등") 확신도가 크게 떨어져서 FinBERT 로 넘어간다.
+    """
+
+    name = "lexicon"
+
+    def __init__(self, positive: dict[str, float] = POSITIVE_TERMS, negative: dict[str, float] = NEGATIVE_TERMS):
+        self.positive = positive
+        self.negative = negative
+
+    def predict(self, title: str) -> tuple[str, float]:
+        title = title or ""
+        pos = sum(w for term, w in self.positive.items() if term in title)
+        neg = sum(w for term, w in self.negative.items() if term in title)
+        if pos == neg:
+            return "neutral", 0.0
+        margin = abs(pos - neg)
+        confidence = margin / (pos + neg + 0.5)
+        return ("positive" if pos > neg else "negative"), confidence
+
+
+# ---------------------------------------------------
+# linear
+# ---------------------------------------------------
+N_FEATURES = 1 << 18
+NGRAM_SIZES = (2, 3)
+
+
+def title_features(title: str) -> np.ndarray:
+    """
+    공백 정리한 제목의 글자 2/3-gram 을 해싱한 feature 인덱스
+    """
+    text = " ".join((title or "").split())
+    idx = {
+        zlib.crc32(text[i:i + n].encode("utf-8")) % N_FEATURES
+        for n in NGRAM_SIZES
+        for i in range(len(text) - n + 1)
+    }
+    return np.fromiter(idx, dtype=np.int64, count=len(idx))
+
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max()
+    e = np.exp(z)
+    return e / e.sum()
+
+
+class LinearTitleClassifier:
+    """
+    해싱 n-gram 소프트맥스 회귀. 제목 하나 = 수십 개 feature 의 가중치 합이라 수십 µs.
+    """
+
+    name = "linear"
+
+    def __init__(self, weights: np.ndarray | None = None, bias: np.ndarray | None = None):
+        self.weights = weights if weights is not None else np.zeros((N_FEATURES, len(LABELS)), dtype=np.float32)
+        self.bias = bias if bias is not None else np.zeros(len(LABELS), dtype=np.float32)
+
+    def probs(self, title: str) -> np.ndarray:
+        feats = title_features(title)
+        return _softmax(self.weights[feats].sum(axis=0) + self.bias)
+
+    def predict(self, title: str) -> tuple[str, float]:
+        p = self.probs(title)
+        best = int(p.argmax())
+        return LABELS[best], float(p[best])
+
+    def fit(self, titles: list[str], labels: list[str], epochs: int = 5, lr: float = 0.1,
+            l2: float = 1e-6, seed: int = 42):
+        """
+        SGD 로 학습. (FinBERT 라벨을 정답으로 쓰는 distillation)
+        """
+        data = [(title_features(t), LABELS.index(l)) for t, l in zip(titles, labels) if l in LABELS]
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            loss = 0.0
+            for feats, y in data:
+                p = _softmax(self.weights[feats].sum(axis=0) + self.bias)
+                loss -= float(np.log(p[y] + 1e-12))
+                grad = p
+                grad[y] -= 1.0
+                self.weights[feats] -= lr * (grad + l2 * self.weights[feats])
+                self.bias -= lr * grad
+            print(f"[TRAIN] epoch {epoch + 1}/{epochs} loss={loss / max(len(data), 1):.4f}")
+
+    def save(self, path: Path = LINEAR_MODEL_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias)
+
+    @classmethod
+    def load(cls, path: Path = LINEAR_MODEL_PATH) -> "LinearTitleClassifier":
+        data = np.load(path)
+        return cls(data["weights"], data["bias"])
+
+
+def load_fast_classifier(kind: str):
+    if kind == "lexicon":
+        return LexiconClassifier()
+    if kind == "linear":
+        if not LINEAR_MODEL_PATH.exists():
+            raise SystemExit(f"[ERROR] linear 모델이 없습니다. 먼저 `python cascade.py train` 을 실행하세요: {LINEAR_MODEL_PATH}")
+        return LinearTitleClassifier.load()
+    raise ValueError(f"unknown cascade classifier: {kind}")
+
+
+# ---------------------------------------------------
+# cascade
+# ---------------------------------------------------
+@dataclass
+class CascadeStats:
+    total: int = 0
+    fast: int = 0
+    audited: int = 0
+    agreed: int = 0
+    fast_labels: dict = field(default_factory=lambda: {l: 0 for l in LABELS})
+    disagreements: dict = field(default_factory=dict)
+
+    def record_audit(self, fast_label: str, finbert_label: str | None):
+        self.audited += 1
+        if fast_label == finbert_label:
+            self.agreed += 1
+        else:
+            key = f"{fast_label}->{finbert_label}"
+            self.disagreements[key] = self.disagreements.get(key, 0) + 1
+
+    # 체크포인트용 (--resume 뒤 요약이 한 번에 돈 것과 같게)
+    def state(self) -> dict:
+        return asdict(self)
+
+    def load_state(self, state: dict):
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def summary(self) -> str:
+        rate = self.fast / self.total if self.total else 0.0
+        text = f"cascade routed {self.fast}/{self.total} ({rate:.1%}) to the title classifier {self.fast_labels}"
+        if self.audited:
+            text += (
+                f" | audit agreement {self.agreed}/{self.audited} = {self.agreed / self.audited:.1%}"
+                f" disagreements {self.disagreements}"
+            )
+        return text
+
+
+class Cascade:
+    """
+    제목 분류기 확신도가 threshold 이상이면 그 라벨을 쓰고, 아니면 FinBERT 로 넘긴다.
+    audit_rate 비율만큼은 제목 분류기가 맞혔더라도 FinBERT 로 같이 돌려서 일치율을 잰다.
+    (샘플링은 제목 해시 기준이라 같은 입력이면 항상 같은 기사가 뽑힘)
+    """
+
+    def __init__(self, classifier, threshold: float = DEFAULT_THRESHOLD, audit_rate: float = 0.0):
+        self.classifier = classifier
+        self.threshold = threshold
+        self.audit_rate = audit_rate
+        self.stats = CascadeStats()
+
+    def _audit(self, title: str) -> bool:
+        if self.audit_rate <= 0:
+            return False
+        h = int.from_bytes(hashlib.sha1(title.encode("utf-8")).digest()[:4], "big")
+        return h / 2 ** 32 < self.audit_rate
+
+    def route(self, title: str) -> tuple[tuple[str, float] | None, bool]:
+        """
+        (제목 분류기 결과 또는 None, FinBERT 로도 돌릴지) 반환.
+        """
+        self.stats.total += 1
+        label, confidence = self.classifier.predict(title)
+        if confidence < self.threshold:
+            return None, True
+        self.stats.fast += 1
+        self.stats.fast_labels[label] += 1
+        return (label, confidence), self._audit(title)
+
+
+# ---------------------------------------------------
+# CLI
+# ---------------------------------------------------
+def read_labeled(path: Path) -> tuple[list[str], list[str]]:
+    titles, labels = [], []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            # 제목 분류기가 붙인 라벨은 정답으로 쓰지 않는다
+            if record.get("sentiment_source", "finbert") != "finbert":
+                continue
+            if record.get("sentiment_label") in LABELS:
+                titles.append(record.get("title", ""))
+                labels.append(record["sentiment_label"])
+    return titles, labels
+
+
+def evaluate(classifier, titles: list[str], labels: list[str], thresholds: list[float]):
+    preds = [classifier.predict(t) for t in titles]
+    for threshold in thresholds:
+        routed = [(p, y) for (p, c), y in zip(preds, labels) if c >= threshold]
+        agree = sum(1 for p, y in routed if p == y)
+        rate = len(routed) / len(titles) if titles else 0.0
+        acc = agree / len(routed) if routed else 0.0
+        print(f"threshold={threshold:.2f} | fast {len(routed)}/{len(titles)} ({rate:.1%}) | agreement {acc:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FinBERT 앞단 제목 분류기")
+    parser.add_argument("--labels", type=Path, default=LABELS_PATH, help="analyze.py 가 만든 labeled_articles.jsonl")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    tr = sub.add_parser("train", help="linear 제목 분류기 학습 (FinBERT 라벨 기준)")
+    tr.add_argument("--epochs", type=int, default=5)
+    tr.add_argument("--holdout", type=float, default=0.1)
+
+    ev = sub.add_parser("eval", help="threshold 별 라우팅 비율 / FinBERT 일치율")
+    ev.add_argument("--kind", choices=("lexicon", "linear"), default="lexicon")
+    ev.add_argument("--thresholds", default="0.5,0.6,0.7,0.75,0.8,0.9")
+
+    args = parser.parse_args()
+    titles, labels = read_labeled(args.labels)
+    print(f"Loaded {len(titles)} FinBERT-labeled titles from: {args.labels}")
+
+    if args.command == "train":
+        n_hold = int(len(titles) * args.holdout)
+        order = list(range(len(titles)))
+        random.Random(0).shuffle(order)
+        hold, train = order[:n_hold], order[n_hold:]
+
+        clf = LinearTitleClassifier()
+        clf.fit([titles[i] for i in train], [labels[i] for i in train], epochs=args.epochs)
+        clf.save()
+        print(f"Saved linear title classifier to: {LINEAR_MODEL_PATH}")
+        if hold:
+            print(f"Holdout ({len(hold)} titles):")
+            evaluate(clf, [titles[i] for i in hold], [labels[i] for i in hold], [0.5, 0.7, 0.8, 0.9])
+    elif args.command == "eval":
+        thresholds = [float(t) for t in args.thresholds.split(",")]
+        evaluate(load_fast_classifier(args.kind), titles, labels, thresholds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+증분 크롤링용 기사 인덱스.
+
+news_crawler.py / async_crawler.py 는 매번 종목마다 최신 기사 50개를 전부 다시 받는다.
+하루 사이 새 기사는 종목당 한두 개뿐이라 요청 대부분이 이미 가진 기사다.
+
+- seen_articles : (종목 코드, 기사 키) → published_at. 기사 키는 office_id/article_id (없으면 정규화한 URL)
+- 리스트 페이지는 최신순이라, 이미 본 기사가 나오면 그 뒤(더 오래된 기사)는 볼 필요가 없다
+  → 새 기사만 상세 페이지를 받고 페이지 넘기기를 멈춘다
+- 상세 페이지를 못 받아 리스트 정보만으로 만든 기사(stub)는 complete = 0 으로 넣어 두고,
+  다음 크롤링 때 이미 본 기사 뒤에 있더라도 다시 받는다 (MAX_STUB_RETRIES 번까지)
+- 받은 새 기사는 merge_into_corpus 로 기존 crawling.json(.jsonl) 에 합친다 (종목별 최신 keep 개 유지)
+- 인덱스는 코퍼스마다 따로 둔다 (index_path_for: db/crawling.json → db/crawling.json.index.sqlite3).
+  meta 테이블에 코퍼스 경로를 적어 두고 다른 코퍼스로 열면 에러
+
+    python news_crawler.py --incremental
+    python async_crawler.py --incremental --output db/crawling.jsonl
+    python crawl_index.py --corpus db/crawling.jsonl stats
+"""
+import argparse
+import json
+import sqlite3
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+from urllib.parse import parse_qs, urlsplit
+
+from article_stream import JsonlWriter, iter_articles
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+DEFAULT_CORPUS_PATH = DB_DIR / "crawling.json"
+
+# stub 기사 상세 페이지 재시도 횟수. 넘으면 리스트 정보만으로 둔다
+MAX_STUB_RETRIES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_articles (
+    company_code TEXT NOT NULL,
+    article_key  TEXT NOT NULL,
+    published_at TEXT NOT NULL DEFAULT '',
+    first_seen   TEXT NOT NULL,
+    complete     INTEGER NOT NULL DEFAULT 1,
+    tries        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_code, article_key)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def index_path_for(corpus_path: Path) -> Path:
+    """코퍼스 옆에 두는 인덱스 경로 (crawling.json 과 crawling.jsonl 이 겹치지 않게 확장자까지 붙인다)"""
+    return corpus_path.with_name(corpus_path.name + ".index.sqlite3")
+
+
+def article_key_from_url(url: str) -> str:
+    """
+    기사 식별 키.
+    - 네이버 금융 리스트 링크 (news_read.naver?article_id=...&office_id=...) → "office_id/article_id"
+    - 네이버 뉴스 주소 (n.news.naver.com/mnews/article/{office_id}/{article_id}) → 같은 키
+    - 그 외 → 쿼리/프래그먼트를 뗀 URL
+    """
+    parts = urlsplit((url or "").strip())
+    query = parse_qs(parts.query)
+    office = (query.get("office_id") or query.get("oid") or [""])[0]
+    article = (query.get("article_id") or query.get("aid") or [""])[0]
+    if office and article:
+        return f"{office}/{article}"
+
+    segments = [s for s in parts.path.split("/") if s]
+    if "article" in segments:
+        i = segments.index("article")
+        if len(segments) >= i + 3:
+            return f"{segments[i + 1]}/{segments[i + 2]}"
+
+    return f"{parts.netloc}{parts.path}"
+
+
+class SeenIndex:
+    def __init__(self, path: Path, corpus_path: Path | None = None):
+        """
+        corpus_path 를 주면 인덱스가 그 코퍼스 것인지 확인한다. (처음 여는 인덱스면 기록)
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        if corpus_path is not None:
+            self._check_corpus(corpus_path)
+        self.conn.commit()
+
+    def _check_corpus(self, corpus_path: Path):
+        corpus = str(corpus_path.resolve())
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'corpus'").fetchone()
+        if row is None:
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('corpus', ?)", (corpus,))
+        elif row[0] != corpus:
+            self.conn.close()
+            raise ValueError(f"{self.path} 는 {row[0]} 의 인덱스입니다 (지금 코퍼스: {corpus})")
+
+    def known_keys(self, company_code: str) -> set[str]:
+        """
+        종목 하나의 상세 페이지까지 받은 기사 키 전부. (종목당 한 번 읽어 두고 리스트 페이지와 비교)
+        """
+        rows = self.conn.execute(
+            "SELECT article_key FROM seen_articles WHERE company_code = ? AND complete = 1", (company_code,)
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def retry_keys(self, company_code: str) -> set[str]:
+        """
+        종목 하나의 다시 받아 볼 stub 기사 키. (재시도 MAX_STUB_RETRIES 번 미만)
+        """
+        rows = self.conn.execute(
+            "SELECT article_key FROM seen_articles WHERE company_code = ? AND complete = 0 AND tries < ?",
+            (company_code, MAX_STUB_RETRIES),
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def mark_retried(self, company_code: str, keys: Iterable[str]):
+        """
+        retry_keys 로 받은 키를 한 번 시도한 것으로 센다. 리스트에서 못 찾은 stub(밀려난 기사)도
+        세야 MAX_STUB_RETRIES 번 뒤에는 그 기사를 찾으려고 리스트 페이지를 끝까지 넘기지 않는다.
+        """
+        self.conn.executemany(
+            "UPDATE seen_articles SET tries = tries + 1 WHERE company_code = ? AND article_key = ?",
+            [(company_code, key) for key in keys],
+        )
+
+    def add(self, company_code: str, articles: Iterable[Dict[str, Any]]):
+        now = datetime.now().isoformat(timespec="seconds")
+        # 한 번 complete 가 된 기사는 stub 으로 되돌리지 않는다
+        self.conn.executemany(
+            "INSERT INTO seen_articles (company_code, article_key, published_at, first_seen, complete) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(company_code, article_key) DO UPDATE SET published_at = excluded.published_at, "
+            "complete = MAX(complete, excluded.complete)",
+            [
+                (company_code, article_key_from_url(a.get("url", "")), a.get("published_at", ""), now,
+                 int(is_complete(a)))
+                for a in articles
+            ],
+        )
+
+    def add_crawled(self, new_articles: Dict[str, List[Dict[str, Any]]]) -> int:
+        """
+        크롤링한 기사(회사 이름 → 기사 목록)를 인덱스에 반영. 코퍼스에 합친 뒤에 부른다.
+        stub 기사도 complete = 0 으로 넣어서 다음 크롤링 때 retry_keys 로 다시 받는다.
+        반환: 인덱스에 넣은 기사 수 (stub 포함)
+        """
+        n = 0
+        for articles in new_articles.values():
+            if articles and articles[0].get("company_code"):
+                self.add(articles[0]["company_code"], articles)
+                n += len(articles)
+        self.conn.commit()
+        return n
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def stats(self) -> dict:
+        row = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT company_code), MAX(first_seen), "
+            "SUM(complete = 0) FROM seen_articles"
+        ).fetchone()
+        return {"articles": row[0], "companies": row[1], "last_seen": row[2], "stubs": row[3] or 0}
+
+
+def split_new_items(
+    items: List[Dict[str, Any]],
+    known: set[str],
+    retry: set[str] | None = None,
+    reached_known: bool = False,
+) -> tuple[List[Dict[str, Any]], bool, bool]:
+    """
+    리스트 페이지 항목(최신순)에서 받을 항목을 고른다.
+    - 이미 본 기사(known)가 나오기 전까지는 known 이 아닌 항목 전부 (새 기사)
+    - 그 뒤로는 retry(stub 기사)에 있는 항목만
+    retry 에서 찾은 키는 지운다. 페이지를 넘겨 가며 같은 set 과 직전 페이지가 돌려준 reached_known 을
+    넘기면 남은 stub 만 찾는다. (이미 본 기사보다 오래된 기사는 다음 페이지에서도 새 기사로 받지 않음)
+    반환: (받을 항목들, 이미 본 기사에 도달했는지, 더 볼 필요가 없는지 = 도달했고 남은 stub 도 없음)
+    """
+    retry = retry if retry is not None else set()
+    selected: List[Dict[str, Any]] = []
+    for item in items:
+        key = article_key_from_url(item["detail_url"])
+        if key in retry:
+            retry.discard(key)
+            selected.append(item)
+        elif key in known:
+            reached_known = True
+        elif not reached_known:
+            selected.append(item)
+        if reached_known and not retry:
+            return selected, True, True
+    return selected, reached_known, False
+
+
+def is_complete(article: Dict[str, Any]) -> bool:
+    """
+    상세 페이지까지 받은 기사인지. (리스트 정보만으로 만든 기사는 인덱스에 complete = 0 으로 넣고 다음 크롤링 때 다시 시도)
+    """
+    return article.get("source") != "naver_finance_list"
+
+
+def _merge_company(new: List[Dict[str, Any]], old: Iterable[Dict[str, Any]], keep: int) -> List[Dict[str, Any]]:
+    merged: List[Dict[str, Any]] = []
+    seen: set[str] = set()
+    for article in list(new) + list(old):
+        key = article_key_from_url(article.get("url", ""))
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(article)
+    merged.sort(key=lambda a: a.get("published_at", ""), reverse=True)
+    return merged[:keep] if keep else merged
+
+
+def merge_into_corpus(
+    corpus_path: Path,
+    new_articles: Dict[str, List[Dict[str, Any]]],
+    keep: int,
+) -> tuple[int, int]:
+    """
+    새 기사(회사 이름 → 기사 목록)를 기존 코퍼스에 합쳐서 같은 경로에 다시 쓴다.
+    기존 회사 순서를 유지하고, 처음 보는 회사는 뒤에 붙인다. keep 이 0 이 아니면 회사별 최신 keep 개만 남긴다.
+    반환: (회사 수, 기사 수)
+    """
+    pending = dict(new_articles)
+
+    def merged_groups():
+        if corpus_path.exists():
+            for company, group in groupby(iter_articles(corpus_path), key=lambda x: x[0]):
+                yield company, _merge_company(pending.pop(company, []), (a for _, a in group), keep)
+        for company, articles in list(pending.items()):
+            yield company, _merge_company(articles, [], keep)
+
+    companies = 0
+    count = 0
+    if corpus_path.suffix == ".jsonl":
+        # JsonlWriter 는 임시 파일에 쓰고 끝에 교체하므로 같은 파일을 읽으면서 써도 된다
+        with JsonlWriter(corpus_path) as writer:
+            for company, articles in merged_groups():
+                companies += 1
+                for article in articles:
+                    article.setdefault("company_name", company)
+                    writer.write(article)
+        return companies, writer.count
+
+    data: Dict[str, List[Dict[str, Any]]] = {}
+    for company, articles in merged_groups():
+        data[company] = articles
+        companies += 1
+        count += len(articles)
+    corpus_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = corpus_path.with_suffix(corpus_path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8", errors="ignore") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(corpus_path)
+    return companies, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="증분 크롤링 기사 인덱스")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_PATH)
+    parser.add_argument("--db", type=Path, default=None, help="인덱스 경로 (기본: 코퍼스 옆 <코퍼스>.index.sqlite3)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="인덱스에 있는 기사 / 종목 수")
+    sub.add_parser("build", help="기존 코퍼스로 인덱스 채우기 (증분 크롤링 첫 실행 전)")
+    args = parser.parse_args()
+
+    index = SeenIndex(args.db or index_path_for(args.corpus), args.corpus)
+    if args.command == "build":
+        n = 0
+        for company, group in groupby(iter_articles(args.corpus), key=lambda x: x[0]):
+            n += index.add_crawled({company: [a for _, a in group]})
+        print(f"Indexed {n} articles from: {args.corpus}")
+    print(json.dumps(index.stats(), ensure_ascii=False))
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
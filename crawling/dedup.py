@@ -0,0 +1,241 @@
+"""
+통신사 기사(연합뉴스, 뉴스1 등)가 여러 매체에 거의 그대로 다시 실리는 경우를 찾아서 묶는다.
+(크롤링 → dedup → analyze 사이에 한 단계)
+
+- 기사 텍스트(제목 + 본문)의 글자 5-gram 집합으로 MinHash 서명을 만들고
+- LSH banding 으로 후보 쌍만 골라 서명 유사도가 threshold 이상이면 union-find 로 합친다
+
+결과(db/dedup_clusters.json)는 입력 파일 안의 기사 위치(0부터) 기준 클러스터 목록이다.
+analyze.py --dedup 은 클러스터마다 대표 기사(가장 앞 기사) 하나만 분류하고,
+나머지는 같은 라벨을 쓰면서 --dedup-policy 에 따라 집계에 넣을지 정한다.
+
+    python dedup.py                         # db/crawling.json → db/dedup_clusters.json
+    python dedup.py --threshold 0.9 --show 5
+"""
+import argparse
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from article_stream import input_signature, iter_articles
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+INPUT_PATH = DB_DIR / "crawling.json"
+CLUSTERS_PATH = DB_DIR / "dedup_clusters.json"
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 16             # 16 band x 8 row → 유사도 0.7 근처부터 후보로 잡힘
+DEFAULT_THRESHOLD = 0.8
+MAX_TEXT_CHARS = 2000  # 앞부분만 봐도 재전송 기사는 충분히 구분됨
+
+# 집계 방식
+#   all     : 중복도 전부 센다 (분류만 한 번)
+#   company : 같은 클러스터는 회사마다 한 번만 센다
+#   first   : 클러스터 전체를 처음 나온 회사에 한 번만 센다
+POLICIES = ("all", "company", "first")
+
+_PRIME = 4294967311  # 2^32 보다 큰 소수
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text: str) -> np.ndarray:
+    text = " ".join((text or "").split())[:MAX_TEXT_CHARS]
+    if len(text) < SHINGLE_SIZE:
+        grams = {text} if text else set()
+    else:
+        grams = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash(text: str) -> np.ndarray | None:
+    """
+    uint32[NUM_PERM] 서명. 텍스트가 비어 있으면 None (비교하지 않음)
+    """
+    h = shingles(text)
+    if h.size == 0:
+        return None
+    # (a * h + b) mod p 를 순열마다 계산해서 최솟값
+    values = (h[None, :] * _PERM_A[:, None] + _PERM_B[:, None]) % _PRIME
+    return values.min(axis=1).astype(np.uint32)
+
+
+def article_text(article: dict) -> str:
+    return f"{article.get('title', '')} {article.get('content', '')}"
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent: dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent.get(x, x)
+        return root
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 더 앞선 기사를 루트로 → 루트 = 클러스터 대표
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+def find_clusters(input_path: Path, threshold: float = DEFAULT_THRESHOLD) -> tuple[int, list[list[int]]]:
+    """
+    (기사 수, 크기 2 이상 클러스터 목록) 반환. 각 클러스터는 기사 위치 오름차순.
+    """
+    rows = NUM_PERM // BANDS
+    buckets: list[dict[int, list[int]]] = [{} for _ in range(BANDS)]
+    signatures: dict[int, np.ndarray] = {}
+    uf = UnionFind()
+
+    n = 0
+    for pos, (_, article) in enumerate(iter_articles(input_path)):
+        n = pos + 1
+        sig = minhash(article_text(article))
+        if sig is None:
+            continue
+
+        candidates: set[int] = set()
+        for b in range(BANDS):
+            key = hash(sig[b * rows:(b + 1) * rows].tobytes())
+            bucket = buckets[b].setdefault(key, [])
+            candidates.update(bucket)
+            bucket.append(pos)
+
+        for other in candidates:
+            if uf.find(other) == uf.find(pos):
+                continue
+            if float(np.mean(signatures[other] == sig)) >= threshold:
+                uf.union(other, pos)
+        signatures[pos] = sig
+
+        if n % 10000 == 0:
+            print(f"[DEDUP] {n} articles hashed")
+
+    groups: dict[int, list[int]] = {}
+    for pos in uf.parent:
+        groups.setdefault(uf.find(pos), []).append(pos)
+    clusters = sorted(
+        (sorted(set(members) | {root}) for root, members in groups.items()),
+        key=lambda c: c[0],
+    )
+    return n, [c for c in clusters if len(c) > 1]
+
+
+def save_clusters(input_path: Path, n: int, clusters: list[list[int]], threshold: float,
+                  path: Path = CLUSTERS_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "input": input_signature(input_path),
+                "articles": n,
+                "threshold": threshold,
+                "clusters": clusters,
+            },
+            f,
+        )
+    tmp_path.replace(path)
+
+
+class DedupFilter:
+    """
+    analyze.py 에서 쓰는 쪽. 기사 위치로 대표 기사를 찾고, 집계 정책에 따라 셀지 결정.
+    """
+
+    def __init__(self, input_path: Path, policy: str = "company", path: Path = CLUSTERS_PATH):
+        if not path.exists():
+            raise SystemExit(f"[ERROR] 중복 클러스터 파일이 없습니다. 먼저 `python dedup.py --input {input_path}` 실행: {path}")
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("input") != input_signature(input_path):
+            raise SystemExit(f"[ERROR] {path} 는 다른 입력 파일로 만든 것입니다. dedup.py 를 다시 실행하세요.")
+
+        self.policy = policy
+        self.rep_of: dict[int, int] = {}
+        for members in data["clusters"]:
+            for pos in members[1:]:
+                self.rep_of[pos] = members[0]
+        self.reps = {members[0] for members in data["clusters"]}
+        self.rep_labels: dict[int, tuple[str | None, float, str]] = {}
+        self.counted: set = set()
+        self.skipped = 0
+
+    def is_duplicate(self, pos: int) -> bool:
+        return pos in self.rep_of
+
+    def remember(self, pos: int, result: tuple[str | None, float, str]):
+        if pos in self.reps:
+            self.rep_labels[pos] = result
+
+    def label_of(self, pos: int) -> tuple[str | None, float, str]:
+        return self.rep_labels[self.rep_of[pos]]
+
+    def should_count(self, pos: int, company: str) -> bool:
+        rep = self.rep_of.get(pos, pos)
+        if self.policy == "all" or rep not in self.reps:
+            return True
+        key = rep if self.policy == "first" else (rep, company)
+        if key in self.counted:
+            self.skipped += 1
+            return False
+        self.counted.add(key)
+        return True
+
+    # 체크포인트용 (JSON 으로 저장 가능한 형태)
+    def state(self) -> dict:
+        return {
+            "rep_labels": {str(k): list(v) for k, v in self.rep_labels.items()},
+            "counted": [list(k) if isinstance(k, tuple) else k for k in self.counted],
+            "skipped": self.skipped,
+        }
+
+    def load_state(self, state: dict):
+        self.rep_labels = {int(k): tuple(v) for k, v in state["rep_labels"].items()}
+        self.counted = {tuple(k) if isinstance(k, list) else k for k in state["counted"]}
+        self.skipped = state["skipped"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재전송/중복 기사 클러스터링 (MinHash + LSH)")
+    parser.add_argument("--input", type=Path, default=INPUT_PATH)
+    parser.add_argument("--out", type=Path, default=CLUSTERS_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="MinHash 유사도 기준 (0~1)")
+    parser.add_argument("--show", type=int, default=0, help="큰 클러스터 몇 개의 제목을 출력")
+    args = parser.parse_args()
+
+    n, clusters = find_clusters(args.input, args.threshold)
+    save_clusters(args.input, n, clusters, args.threshold, args.out)
+    dup = sum(len(c) - 1 for c in clusters)
+    print(
+        f"{n} articles → {len(clusters)} duplicate clusters, "
+        f"{dup} duplicates ({dup / n if n else 0:.1%} less inference). Saved to: {args.out}"
+    )
+
+    if args.show:
+        wanted = {pos for c in sorted(clusters, key=len, reverse=True)[:args.show] for pos in c}
+        titles = {
+            pos: f"{company} | {article.get('title', '')}"
+            for pos, (company, article) in enumerate(iter_articles(args.input))
+            if pos in wanted
+        }
+        for c in sorted(clusters, key=len, reverse=True)[:args.show]:
+            print(f"--- cluster of {len(c)}")
+            for pos in c:
+                print(f"  [{pos}] {titles[pos]}")
+
+
+if __name__ == "__main__":
+    main()
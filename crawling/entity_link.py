@@ -0,0 +1,196 @@
+"""
+기사 본문/제목에 나오는 상장사 이름을 찾아서 기사를 여러 회사에 연결한다.
+
+market_code.json 의 회사 이름 전체로 Aho-Corasick 오토마톤을 만들어 한 번 훑으면
+몇 천 개 이름을 동시에 찾을 수 있다. 겹치는 매칭은 가장 긴 이름만 남긴다.
+("SK하이닉스" 안의 "SK" 는 SK 로 세지 않음)
+
+짧은 영문 이름(SK, LS, KT 등)은 다른 단어의 일부로 자주 나오므로 앞뒤가 영문/숫자가 아닐 때만 인정하고,
+본문에서는 여러 번 나와야 연결한다. "대상" 처럼 일반 단어와 같은 이름은 본문 매칭으로는 연결하지 않는다.
+
+    python entity_link.py "삼성전자와 SK하이닉스, HBM 공급 경쟁"
+"""
+import json
+import sys
+from collections import deque
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+MARKET_CODE_PATH = DB_DIR / "market_code.json"
+
+SHORT_NAME_LEN = 2              # 이 길이 이하 이름은 경계 검사 + 본문 최소 등장 횟수 적용
+SHORT_NAME_MIN_BODY_MENTIONS = 2
+MAX_BODY_CHARS = 3000           # 본문은 앞부분만 본다 (기사 끝 관련 기사 목록/광고 제외 목적)
+
+# 일반 명사와 같은 회사 이름. 크롤링한 회사로는 그대로 쓰지만 본문 매칭으로는 연결하지 않는다.
+AMBIGUOUS_NAMES = {"대상", "한국", "대성", "동방", "진도", "신성", "부국", "삼일", "대원", "서울", "국보", "지니", "남성"}
+
+
+def _is_ascii_alnum(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+class AhoCorasick:
+    """
+    이름 → 값 사전으로 만드는 기본적인 Aho-Corasick 오토마톤.
+    search() 는 (start, end, 값) 을 겹침 없이 가장 긴 매칭 우선으로 돌려준다.
+    """
+
+    def __init__(self, patterns: dict[str, str]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list[tuple[int, str]]] = [[]]  # 상태별 (패턴 길이, 값)
+
+        for pattern, value in patterns.items():
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((len(pattern), value))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter_matches(self, text: str):
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for length, value in self.out[state]:
+                yield i - length + 1, i + 1, value
+
+    def search(self, text: str) -> list[tuple[int, int, str]]:
+        # 시작 위치 오름차순, 같은 위치면 긴 것 먼저 → 앞에서부터 겹치지 않게 고른다
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        chosen: list[tuple[int, int, str]] = []
+        end = 0
+        for m in matches:
+            if m[0] >= end:
+                chosen.append(m)
+                end = m[1]
+        return chosen
+
+
+class EntityLinker:
+    def __init__(self, names: list[str]):
+        self.names = set(names)
+        self.matcher = AhoCorasick({name: name for name in names})
+
+    @classmethod
+    def from_market_codes(cls, path: Path = MARKET_CODE_PATH) -> "EntityLinker":
+        with path.open("r", encoding="utf-8") as f:
+            market_data = json.load(f)
+        return cls(list(market_data))
+
+    def _mentions(self, text: str) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for start, end, name in self.matcher.search(text):
+            if len(name) <= SHORT_NAME_LEN:
+                before = text[start - 1] if start > 0 else " "
+                after = text[end] if end < len(text) else " "
+                if _is_ascii_alnum(before) or _is_ascii_alnum(after):
+                    continue
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def link(self, title: str, content: str) -> list[str]:
+        """
+        기사에 언급된 상장사 이름 목록 (등장 순서)
+        """
+        title_counts = self._mentions(title or "")
+        body_counts = self._mentions((content or "")[:MAX_BODY_CHARS])
+
+        linked: list[str] = []
+        for name in list(title_counts) + [n for n in body_counts if n not in title_counts]:
+            if name in AMBIGUOUS_NAMES:
+                continue
+            if name not in title_counts:
+                need = SHORT_NAME_MIN_BODY_MENTIONS if len(name) <= SHORT_NAME_LEN else 1
+                if body_counts[name] < need:
+                    continue
+            linked.append(name)
+        return linked
+
+
+class Attribution:
+    """
+    analyze.py 에서 쓰는 쪽. 같은 URL 은 한 번만 분류하고, 그 결과를 크롤링한 회사 + 본문에 나온 회사 모두에 붙인다.
+    한 URL 은 회사마다 한 번만 집계된다.
+    """
+
+    def __init__(self, linker: EntityLinker):
+        self.linker = linker
+        self.url_labels: dict[str, tuple[str | None, float, str]] = {}
+        self.attributed: set[tuple[str, str]] = set()
+        self.reused = 0
+        self.extra_links = 0
+
+    def known(self, key: str) -> bool:
+        return key in self.url_labels
+
+    def label_of(self, key: str) -> tuple[str | None, float, str]:
+        self.reused += 1
+        return self.url_labels[key]
+
+    def remember(self, key: str, result: tuple[str | None, float, str]):
+        self.url_labels.setdefault(key, result)
+
+    def companies(self, crawled_company: str, article: dict) -> list[str]:
+        linked = [crawled_company]
+        for name in self.linker.link(article.get("title", ""), article.get("content", "")):
+            if name != crawled_company:
+                linked.append(name)
+        return linked
+
+    def first_attribution(self, key: str, company: str, crawled: bool) -> bool:
+        if (key, company) in self.attributed:
+            return False
+        self.attributed.add((key, company))
+        if not crawled:
+            self.extra_links += 1
+        return True
+
+    # 체크포인트용 카운터 (URL 라벨 / 연결 상태는 라벨 파일을 replay 해서 복원)
+    def state(self) -> dict:
+        return {"reused": self.reused, "extra_links": self.extra_links}
+
+    def load_state(self, state: dict):
+        self.reused = state["reused"]
+        self.extra_links = state["extra_links"]
+
+    def replay(self, record: dict, key: str):
+        """
+        --resume 때 이미 쓴 labeled_articles 줄로 상태 복원
+        """
+        self.remember(key, (record.get("sentiment_label"), record.get("sentiment_confidence", 0.0),
+                            record.get("sentiment_source", "finbert")))
+        for company in record.get("linked_companies", [record.get("company_name")]):
+            self.attributed.add((key, company))
+
+
+def main():
+    linker = EntityLinker.from_market_codes()
+    text = " ".join(sys.argv[1:])
+    print(linker.link(text, ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+크롤러용 HTML 파서 백엔드.
+
+크롤러 CPU 시간 대부분이 HTML 파싱이라 파서를 바꿔 끼울 수 있게 최소한의 공통 인터페이스만 둔다.
+(news_crawler.py 가 쓰는 CSS 선택자 / 텍스트 / 속성 읽기만)
+
+    selectolax : selectolax(lexbor) - C 파서, 가장 빠름 (설치돼 있으면 기본값)
+    lxml       : BeautifulSoup + lxml 트리 빌더 - requirements.txt 에 이미 있음
+    html.parser: BeautifulSoup + 순수 파이썬 파서 - 예전 방식, 비교 기준
+
+    python html_backend.py record --n 20                  # 실제 페이지를 bench/pages/ 에 저장 (네트워크 필요)
+    python html_backend.py bench                          # 저장한 페이지로 백엔드별 파싱 시간 / 결과 일치 비교
+    python html_backend.py bench --backends lxml,html.parser --repeat 20
+
+결과가 html.parser 와 다르면 bench 가 다른 페이지 수를 같이 출력한다.
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+PAGES_DIR = BASE_DIR / "bench" / "pages"
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+# selectolax text() 는 빈 텍스트 조각에도 separator 를 붙이므로 이 문자로 나눠서 빈 조각을 버린다
+_PART_SEP = "\x00"
+
+
+# ---------------------------------------------------
+# BeautifulSoup (html.parser / lxml)
+# ---------------------------------------------------
+class SoupNode:
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def select_one(self, css: str) -> "SoupNode | None":
+        el = self.el.select_one(css)
+        return SoupNode(el) if el is not None else None
+
+    def select(self, css: str) -> list["SoupNode"]:
+        return [SoupNode(el) for el in self.el.select(css)]
+
+    def text(self, separator: str = "") -> str:
+        """공백을 뗀 텍스트 조각들을 separator 로 이은 것 (BeautifulSoup get_text(separator, strip=True))"""
+        return self.el.get_text(separator, strip=True)
+
+    def raw_text(self) -> str:
+        """script 등 본문 그대로"""
+        return self.el.get_text() or ""
+
+    def attr(self, name: str) -> str:
+        return self.el.get(name) or ""
+
+    def drop(self, css: str):
+        for el in self.el.select(css):
+            el.decompose()
+
+
+def _soup_parser(features: str):
+    from bs4 import BeautifulSoup
+
+    def parse(html: str) -> SoupNode:
+        return SoupNode(BeautifulSoup(html, features))
+
+    return parse
+
+
+# ---------------------------------------------------
+# selectolax (lexbor)
+# ---------------------------------------------------
+class LexborNode:
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def select_one(self, css: str) -> "LexborNode | None":
+        el = self.el.css_first(css)
+        return LexborNode(el) if el is not None else None
+
+    def select(self, css: str) -> list["LexborNode"]:
+        return [LexborNode(el) for el in self.el.css(css)]
+
+    def text(self, separator: str = "") -> str:
+        parts = self.el.text(deep=True, separator=_PART_SEP, strip=True).split(_PART_SEP)
+        return separator.join(p for p in parts if p)
+
+    def raw_text(self) -> str:
+        return self.el.text(deep=True) or ""
+
+    def attr(self, name: str) -> str:
+        return self.el.attributes.get(name) or ""
+
+    def drop(self, css: str):
+        for el in self.el.css(css):
+            el.decompose()
+
+
+def _lexbor_parser():
+    from selectolax.lexbor import LexborHTMLParser
+
+    def parse(html: str) -> LexborNode:
+        tree = LexborHTMLParser(html)
+        # 문서 전체 선택/텍스트는 html 루트 노드 기준 (BeautifulSoup 객체와 같은 역할)
+        return LexborNode(tree.root if tree.root is not None else tree.body)
+
+    return parse
+
+
+def load_parser(name: str | None = None):
+    """
+    (백엔드 이름, html 문자열 → 노드 함수). name 이 없으면 설치된 것 중 가장 빠른 백엔드.
+    """
+    if name is None:
+        for candidate in BACKENDS:
+            try:
+                return load_parser(candidate)
+            except ImportError:
+                continue
+        raise ImportError("beautifulsoup4 또는 selectolax 가 필요합니다")
+    if name == "selectolax":
+        return name, _lexbor_parser()
+    if name == "lxml":
+        import lxml  # noqa: F401  (없으면 여기서 ImportError)
+        return name, _soup_parser("lxml")
+    if name == "html.parser":
+        return name, _soup_parser("html.parser")
+    raise ValueError(f"unknown html backend: {name}")
+
+
+def available(name: str) -> bool:
+    try:
+        load_parser(name)
+        return True
+    except ImportError:
+        return False
+
+
+_parse = None
+backend_name = None
+
+
+def use_backend(name: str | None = None):
+    """크롤러 전체에서 쓸 백엔드를 정한다. (--parser 옵션)"""
+    global _parse, backend_name
+    backend_name, _parse = load_parser(name)
+
+
+def parse(html: str):
+    if _parse is None:
+        use_backend()
+    return _parse(html)
+
+
+# ---------------------------------------------------
+# record / bench
+# ---------------------------------------------------
+def record_pages(n: int, code: str, out_dir: Path):
+    """
+    종목 하나의 리스트 페이지 + 기사 n 개의 wrapper / 실제 기사 페이지를 그대로 저장.
+    (wrapper_007.html 과 article_007.html 이 한 쌍)
+    """
+    import requests
+
+    from news_crawler import DEFAULT_HEADERS, REQUEST_TIMEOUT, WrapperPage, build_list_url, \
+        parse_news_list_from_list_page
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    list_html = session.get(build_list_url(code), timeout=REQUEST_TIMEOUT).text
+    (out_dir / "list_000.html").write_text(list_html, encoding="utf-8")
+    saved = 0
+    for i, item in enumerate(parse_news_list_from_list_page(list_html, n)):
+        wrapper_html = session.get(item["detail_url"], timeout=REQUEST_TIMEOUT).text
+        (out_dir / f"wrapper_{i:03d}.html").write_text(wrapper_html, encoding="utf-8")
+        inner_url = next(WrapperPage(wrapper_html).inner_url_candidates(), (None, None))[0]
+        if inner_url:
+            article_html = session.get(inner_url, timeout=REQUEST_TIMEOUT).text
+            (out_dir / f"article_{i:03d}.html").write_text(article_html, encoding="utf-8")
+        saved += 1
+        time.sleep(0.2)
+    print(f"Saved 1 list page + {saved} articles to: {out_dir}")
+
+
+def load_pages(pages_dir: Path) -> dict:
+    """
+    {"list": [html, ...], "articles": [(wrapper html, 기사 html 또는 None), ...]}
+    """
+    def read(path: Path) -> str:
+        return path.read_text(encoding="utf-8")
+
+    articles = []
+    for wrapper_path in sorted(pages_dir.glob("wrapper_*.html")):
+        article_path = wrapper_path.with_name(wrapper_path.name.replace("wrapper_", "article_"))
+        articles.append((read(wrapper_path), read(article_path) if article_path.exists() else None))
+    return {"list": [read(p) for p in sorted(pages_dir.glob("list_*.html"))], "articles": articles}
+
+
+def _extract_all(pages: dict) -> list:
+    """
+    크롤러와 같은 경로로 저장된 페이지 전부 추출 (리스트 / wrapper → 기사 주소 / 기사 → 제목, 본문, 날짜)
+    """
+    from news_crawler import WrapperPage, parse_article_page, parse_news_list_from_list_page
+
+    out: list = []
+    for html in pages["list"]:
+        out.append([(x["title"], x["detail_url"]) for x in parse_news_list_from_list_page(html, 100)])
+    for wrapper_html, article_html in pages["articles"]:
+        wrapper = WrapperPage(wrapper_html)
+        inner_url = next(wrapper.inner_url_candidates(), (None, None))[0]
+        article = parse_article_page("", wrapper, article_html, inner_url)
+        if article:
+            # 날짜를 못 찾으면 현재 시각이 들어가므로 비교는 분 단위까지만
+            article["published_at"] = article["published_at"][:16]
+        out.append(article)
+    return out
+
+
+def _extract_legacy(pages: dict):
+    """
+    바꾸기 전 방식의 파싱 비용: html.parser 로 wrapper 전체 파싱 + script 태그마다 정규식,
+    기사 HTML 은 날짜용 / 본문용으로 두 번 파싱.
+    """
+    import re
+
+    from bs4 import BeautifulSoup
+
+    for html in pages["list"]:
+        BeautifulSoup(html, "html.parser").select("table.type2 tr")
+    for wrapper_html, article_html in pages["articles"]:
+        wrapper_soup = BeautifulSoup(wrapper_html, "html.parser")
+        for script in wrapper_soup.find_all("script"):
+            if re.search(r"top\.location\.href\s*=\s*['\"]([^'\"]+)['\"]", script.get_text() or ""):
+                break
+        target_html = article_html or wrapper_html
+        BeautifulSoup(target_html, "html.parser").select_one(".media_end_head_info_datestamp_time")
+        BeautifulSoup(target_html, "html.parser").select_one("#dic_area")
+
+
+def _time_ms(fn, pages: dict, repeat: int, n_pages: int) -> float:
+    fn(pages)  # 워밍업
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(pages)
+    return (time.perf_counter() - t0) * 1000 / (repeat * n_pages)
+
+
+def bench(pages_dir: Path, backends: list[str], repeat: int) -> list[dict]:
+    pages = load_pages(pages_dir)
+    n_pages = len(pages["list"]) + sum(1 + (a is not None) for _, a in pages["articles"])
+    if not n_pages:
+        raise SystemExit(f"[ERROR] 저장된 페이지가 없습니다: {pages_dir} (python html_backend.py record)")
+    print(
+        f"Benchmarking {n_pages} pages ({len(pages['list'])} list, {len(pages['articles'])} articles) "
+        f"x {repeat} repeats"
+    )
+
+    results = []
+    if available("html.parser"):
+        ms = _time_ms(_extract_legacy, pages, repeat, n_pages)
+        results.append({"backend": "before (html.parser, 3 parses)", "ms_per_page": round(ms, 3)})
+        print(f"[{'before':>11}] {ms:8.3f} ms/page  (html.parser, wrapper + article parsed twice)")
+
+    # python html_backend.py 로 실행하면 이 파일은 __main__ 이라 news_crawler 가 import 한 모듈에 설정해야 한다
+    import html_backend
+
+    baseline = None
+    for name in backends:
+        if not available(name):
+            print(f"[{name:>11}] not installed, skipped")
+            continue
+        html_backend.use_backend(name)
+        extracted = _extract_all(pages)
+        ms = _time_ms(_extract_all, pages, repeat, n_pages)
+
+        if baseline is None:
+            baseline = extracted
+        diff = sum(1 for a, b in zip(baseline, extracted) if a != b)
+        results.append({"backend": name, "ms_per_page": round(ms, 3), "pages_differ": diff})
+        print(f"[{name:>11}] {ms:8.3f} ms/page  ({diff} pages differ from {backends[0]})")
+
+    if results and "pages_differ" not in results[0]:
+        before = results[0]["ms_per_page"]
+        for r in results[1:]:
+            print(f"  {r['backend']:>11}: {before / r['ms_per_page']:5.1f}x faster than before")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤러 HTML 파서 백엔드 비교")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rp = sub.add_parser("record", help="실제 페이지 저장")
+    rp.add_argument("--code", default="005930", help="종목 코드 (기본 삼성전자)")
+    rp.add_argument("--n", type=int, default=20)
+    rp.add_argument("--out", type=Path, default=PAGES_DIR)
+
+    bp = sub.add_parser("bench", help="저장한 페이지로 백엔드별 파싱 시간 비교")
+    bp.add_argument("--pages", type=Path, default=PAGES_DIR)
+    bp.add_argument("--backends", default="html.parser,lxml,selectolax", help="쉼표 구분. 첫 번째가 결과 비교 기준")
+    bp.add_argument("--repeat", type=int, default=10)
+    bp.add_argument("--out", type=Path, default=None, help="결과 JSON 저장 경로")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record_pages(args.n, args.code, args.out)
+    elif args.command == "bench":
+        results = bench(args.pages, args.backends.split(","), args.repeat)
+        if args.out:
+            args.out.parent.mkdir(parents=True, exist_ok=True)
+            args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
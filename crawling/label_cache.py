@@ -0,0 +1,154 @@
+"""
+기사 감성 라벨 캐시.
+
+키 = sha1(모델 이름 + max_length + 제목 + 본문) 이라서 같은 기사를 같은 설정으로
+다시 분석할 때는 모델을 돌리지 않고 저장된 label/confidence 를 그대로 쓴다.
+모델 이름은 analyze.py 의 cache_model ("모델#백엔드#자르기 방식") 이다.
+
+저장 형식은 한 줄에 항목 하나인 JSONL 이고 새 항목은 뒤에 덧붙이기만 한다.
+항목마다 키를 만든 모델 이름(m)과 max_length(n)를 같이 적어 두어서
+compact --corpus 가 설정마다 키를 다시 계산한다. (onnx / int8 캐시도 지워지지 않음)
+오래 쓰면 파일이 커지므로 가끔 compact 로 정리한다.
+
+    python label_cache.py stats
+    python label_cache.py compact                     # 중복 키 정리
+    python label_cache.py compact --corpus db/crawling.json   # 현재 코퍼스(.json / .jsonl)에 없는 기사는 버림
+"""
+import argparse
+import hashlib
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+LABEL_CACHE_PATH = DB_DIR / "label_cache.jsonl"
+
+
+def make_key(title: str, content: str, model_name: str, max_length: int) -> str:
+    raw = "\0".join([model_name, str(max_length), (title or "").strip(), (content or "").strip()])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _read_entries(path: Path) -> dict[str, dict]:
+    entries: dict[str, dict] = {}
+    if not path.exists():
+        return entries
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # 쓰다가 끊긴 마지막 줄 등은 무시
+                continue
+            entries[entry["k"]] = entry
+    return entries
+
+
+class LabelCache:
+    def __init__(self, model_name: str, max_length: int, path: Path = LABEL_CACHE_PATH):
+        self.model_name = model_name
+        self.max_length = max_length
+        self.path = path
+        self.entries = _read_entries(path)
+        self._pending: list[dict] = []
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, title: str, content: str) -> str:
+        return make_key(title, content, self.model_name, self.max_length)
+
+    def get(self, title: str, content: str) -> tuple[str, float] | None:
+        entry = self.entries.get(self.key(title, content))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["label"], entry["score"]
+
+    def put(self, title: str, content: str, label: str | None, score: float):
+        if not label:
+            return  # 실패한 분류는 캐시하지 않는다 (다음 실행 때 다시 시도)
+        entry = {
+            "k": self.key(title, content),
+            "label": label,
+            "score": score,
+            "m": self.model_name,
+            "n": self.max_length,
+        }
+        self.entries[entry["k"]] = entry
+        self._pending.append(entry)
+
+    def flush(self):
+        if not self._pending:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            for entry in self._pending:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._pending.clear()
+
+
+def compact(path: Path = LABEL_CACHE_PATH, corpus_path: Path | None = None) -> tuple[int, int]:
+    """
+    같은 키는 마지막 값만 남기고, corpus_path 를 주면 그 코퍼스에 있는 기사만 남긴다.
+    항목에 적힌 (m, n) 설정마다 코퍼스 키를 다시 계산하므로 모델 / 백엔드 / 자르기 방식과 상관없이
+    본문이 아직 코퍼스에 있으면 남는다.
+    (이전 항목 수, 남은 항목 수) 반환.
+    """
+    if not path.exists():
+        return 0, 0
+    with path.open("r", encoding="utf-8") as f:
+        before = sum(1 for line in f if line.strip())
+    entries = _read_entries(path)
+
+    if corpus_path is not None:
+        from article_stream import iter_articles
+
+        variants = {(e["m"], e["n"]) for e in entries.values()}
+        keep: set[str] = set()
+        for _, a in iter_articles(corpus_path):
+            title, content = a.get("title", ""), a.get("content", "")
+            for m, n in variants:
+                keep.add(make_key(title, content, m, n))
+        entries = {k: v for k, v in entries.items() if k in keep}
+
+    tmp_path = path.with_suffix(".jsonl.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        for entry in entries.values():
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+    return before, len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감성 라벨 캐시 관리")
+    parser.add_argument("--path", type=Path, default=LABEL_CACHE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("stats", help="캐시 항목 수 출력")
+
+    comp = sub.add_parser("compact", help="중복 제거 (+ 코퍼스에 없는 항목 삭제)")
+    comp.add_argument("--corpus", type=Path, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        entries = _read_entries(args.path)
+        size = args.path.stat().st_size if args.path.exists() else 0
+        print(f"{args.path}: {len(entries)} entries, {size / 1024 / 1024:.1f} MB")
+        # 설정(모델#백엔드#자르기, max_length)별 항목 수
+        by_variant = Counter(f"{e['m']} max_length={e['n']}" for e in entries.values())
+        for variant, n in by_variant.most_common():
+            print(f"  {n:>8}  {variant}")
+    elif args.command == "compact":
+        before, after = compact(args.path, args.corpus)
+        print(f"Compacted {args.path}: {before} lines → {after} entries")
+
+
+if __name__ == "__main__":
+    main()
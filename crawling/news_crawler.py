@@ -5,10 +5,14 @@ import time
 from pathlib import Path
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlsplit
 import re
 
 import requests
-from bs4 import BeautifulSoup
+
+import html_backend
+from article_stream import JsonlWriter
+from crawl_index import SeenIndex, index_path_for, merge_into_corpus, split_new_items
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,17 @@ N_KOSDAQ = 1000  # 검색할 코스닥 종목 개수 (최대 1000개)
 N_NEWS_PER_STOCK = 50  # 검색할 종목당 뉴스 개수
 
 REQUEST_TIMEOUT = 10
+MAX_LIST_PAGES = 3  # 종목당 리스트 페이지 탐색 상한
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/129.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Referer": "https://finance.naver.com/",
+}
 
 # 네이버 증권 "뉴스·공시" 탭에서 실제 뉴스 리스트를 뿌리는 iframe 주소
 BASE_LIST_URL = (
@@ -32,6 +47,8 @@ BASE_LIST_URL = (
     "?code={code}&page={page}&clusterId="
 )
 BASE_READ_URL = "https://finance.naver.com"  # 상대 경로용 베이스 URL
+# 리스트 링크의 office_id / article_id 로 바로 만드는 네이버 뉴스 기사 주소 (wrapper 를 거치지 않음)
+DIRECT_ARTICLE_URL = "https://n.news.naver.com/mnews/article/{office_id}/{article_id}"
 
 
 # ---------------------------------------------------
@@ -98,6 +115,21 @@ def select_top_codes(
     return items[:limit]
 
 
+def load_targets(market_code_path: Path) -> List[Dict[str, Any]]:
+    """크롤링 대상 종목 목록 (코스피 상위 N_KOSPI + 코스닥 상위 N_KOSDAQ)"""
+    logger.info(f"Loading market codes from: {market_code_path}")
+    market_data = load_market_codes(market_code_path)
+
+    kospi_list = select_top_codes(market_data, KOSPI_MARKET_KEY, N_KOSPI)
+    kosdaq_list = select_top_codes(market_data, KOSDAQ_MARKET_KEY, N_KOSDAQ)
+
+    logger.info(
+        f"Selected {len(kospi_list)} KOSPI + {len(kosdaq_list)} KOSDAQ = "
+        f"{len(kospi_list) + len(kosdaq_list)} total companies"
+    )
+    return kospi_list + kosdaq_list
+
+
 def build_list_url(code: str, page: int = 1) -> str:
     return BASE_LIST_URL.format(code=code, page=page)
 
@@ -110,11 +142,11 @@ def parse_news_list_from_list_page(html: str, max_items: int) -> List[Dict[str,
     /item/news_news.naver 의 HTML에서
     뉴스 제목 + 상세 URL(네이버 뉴스 읽기 페이지) + 날짜를 뽑는다.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    doc = html_backend.parse(html)
     results: List[Dict[str, Any]] = []
 
     # 기본 구조: table.type2 안의 tr 들
-    rows = soup.select("table.type2 tr")
+    rows = doc.select("table.type2 tr")
 
     for tr in rows:
         if len(results) >= max_items:
@@ -124,8 +156,8 @@ def parse_news_list_from_list_page(html: str, max_items: int) -> List[Dict[str,
         if not title_link:
             continue
 
-        title = title_link.get_text(strip=True)
-        href = title_link.get("href", "").strip()
+        title = title_link.text()
+        href = title_link.attr("href").strip()
         if not title or not href:
             continue
 
@@ -140,7 +172,7 @@ def parse_news_list_from_list_page(html: str, max_items: int) -> List[Dict[str,
         # 날짜(td.date) 추출 시도
         date_td = tr.select_one("td.date")
         if date_td:
-            date_text = date_td.get_text(strip=True)
+            date_text = date_td.text()
             published_at = _parse_date(date_text).isoformat()
         else:
             published_at = datetime.now().isoformat()
@@ -155,19 +187,19 @@ def parse_news_list_from_list_page(html: str, max_items: int) -> List[Dict[str,
 
     # 그래도 아무것도 안 나왔으면, 예전 방식으로 한 번 더 시도
     if not results:
-        links = soup.select("table.type2 td.title a")
+        links = doc.select("table.type2 td.title a")
         if not links:
-            links = soup.select("td.title a")
+            links = doc.select("td.title a")
         if not links:
-            all_links = soup.find_all("a", href=True)
+            all_links = doc.select("a[href]")
             links = [
                 a for a in all_links
-                if "item/news_read.naver" in a["href"]
+                if "item/news_read.naver" in a.attr("href")
             ]
 
         for a in links[:max_items]:
-            title = a.get_text(strip=True)
-            href = a.get("href", "").strip()
+            title = a.text()
+            href = a.attr("href").strip()
             if not title or not href:
                 continue
 
@@ -197,164 +229,142 @@ def parse_news_list_from_list_page(html: str, max_items: int) -> List[Dict[str,
 # ---------------------------------------------------
 # 상세 기사 파싱 (네이버 뉴스 일반 페이지용)
 # ---------------------------------------------------
-def _parse_naver_news_html(html: str) -> Dict[str, str]:
-    """네이버 뉴스(통합/모바일 등) HTML에서 제목/본문 텍스트 추출."""
-    soup = BeautifulSoup(html, "html.parser")
-
+def extract_article(doc) -> Dict[str, str]:
+    """네이버 뉴스(통합/모바일 등) 문서(html_backend.parse 결과)에서 제목/본문 텍스트 추출."""
     # 제목 후보들
     title_el = (
-        soup.select_one("h2#title_area")
-        or soup.select_one("h2.media_end_head_headline")
-        or soup.select_one("h3#articleTitle")          # 예전 스타일
-        or soup.select_one("h1#news_headline")         # 기타 예외
+        doc.select_one("h2#title_area")
+        or doc.select_one("h2.media_end_head_headline")
+        or doc.select_one("h3#articleTitle")          # 예전 스타일
+        or doc.select_one("h1#news_headline")         # 기타 예외
     )
-    title = title_el.get_text(strip=True) if title_el else ""
+    title = title_el.text() if title_el else ""
 
     # 본문 후보들
     content_el = (
-        soup.select_one("article#dic_area")           # 통합 뉴스
-        or soup.select_one("#dic_area")               # 혹시 태그가 바뀐 경우
-        or soup.select_one("div#newsct_article")      # 통합 뉴스 다른 케이스
-        or soup.select_one("div#articleBodyContents") # 예전 스타일
-        or soup.select_one("div.article_view")        # 일부 언론사 자체 템플릿
+        doc.select_one("article#dic_area")           # 통합 뉴스
+        or doc.select_one("#dic_area")               # 혹시 태그가 바뀐 경우
+        or doc.select_one("div#newsct_article")      # 통합 뉴스 다른 케이스
+        or doc.select_one("div#articleBodyContents") # 예전 스타일
+        or doc.select_one("div.article_view")        # 일부 언론사 자체 템플릿
     )
 
     content = ""
     if content_el:
-        for tag in content_el(["script", "style"]):
-            tag.decompose()
-        content = content_el.get_text(" ", strip=True)
+        content_el.drop("script, style")
+        content = content_el.text(" ")
 
     return {"title": title, "content": content}
 
 
-def fetch_article_detail(session, url: str) -> dict | None:
-    """
-    네이버 금융 기사 상세 페이지 크롤링
+def _parse_naver_news_html(html: str) -> Dict[str, str]:
+    """네이버 뉴스(통합/모바일 등) HTML에서 제목/본문 텍스트 추출."""
+    return extract_article(html_backend.parse(html))
 
-    1) finance.naver.com 의 wrapper 페이지를 요청
-    2) 그 안에서
-       - JS redirect (top.location.href='...')
-       - 또는 iframe(src)
-       를 찾아서 실제 news.naver.com 기사 URL을 얻음
-    3) 실제 기사 HTML을 _parse_naver_news_html()으로 파싱
-    """
-    logger.info(f"Requesting article page (wrapper): {url}")
-    try:
-        resp = session.get(url, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-    except Exception as e:
-        logger.warning(f"Failed to fetch article page {url}: {e}")
-        return None
 
-    wrapper_html = resp.text
-    wrapper_soup = BeautifulSoup(wrapper_html, "html.parser")
+def _absolute_news_url(href: str) -> str:
+    """redirect / iframe 에 들어 있는 기사 주소의 프로토콜/도메인 보정"""
+    href = href.strip()
+    if href.startswith("//"):
+        return "https:" + href
+    if href.startswith("/"):
+        return "https://news.naver.com" + href
+    if href.startswith("http"):
+        return href
+    return "https://news.naver.com/" + href.lstrip("/")
 
-    inner_html = None
-    inner_url = None
 
-    # --------------------------------------------------
-    # 0) JS redirect (top.location.href='...') 처리
-    #    예) <SCRIPT>top.location.href='https://n.news.naver.com/...';</SCRIPT>
-    # --------------------------------------------------
-    redirect_url = None
-    for script in wrapper_soup.find_all("script"):
-        script_text = script.get_text() or ""
-        m = re.search(
-            r"top\.location\.href\s*=\s*['\"]([^'\"]+)['\"]",
-            script_text
-        )
-        if m:
-            redirect_url = m.group(1).strip()
-            break
+# 예) <SCRIPT>top.location.href='https://n.news.naver.com/...';</SCRIPT>
+REDIRECT_PATTERN = re.compile(r"top\.location\.href\s*=\s*['\"]([^'\"]+)['\"]")
 
-    if redirect_url:
-        # 프로토콜/도메인 보정
-        if redirect_url.startswith("//"):
-            inner_url = "https:" + redirect_url
-        elif redirect_url.startswith("/"):
-            inner_url = "https://news.naver.com" + redirect_url
-        elif redirect_url.startswith("http"):
-            inner_url = redirect_url
-        else:
-            inner_url = "https://news.naver.com/" + redirect_url.lstrip("/")
 
-        logger.info(f"Detected JS redirect to article: {inner_url}")
-        try:
-            inner_resp = session.get(inner_url, timeout=REQUEST_TIMEOUT)
-            inner_resp.raise_for_status()
-            inner_html = inner_resp.text
-        except Exception as e:
-            logger.warning(f"Failed to fetch redirected article {inner_url}: {e}")
-            inner_html = None
+class WrapperPage:
+    """
+    finance.naver.com 의 기사 wrapper 페이지.
 
-    # --------------------------------------------------
-    # 1) JS redirect 못 찾았으면 iframe(news_frame) 시도 (구형 구조 대비)
-    # --------------------------------------------------
-    if inner_html is None:
+    요즘 wrapper 는 거의 JS redirect 한 줄이라 원문 HTML 에 정규식만 돌려서 기사 주소를 얻고,
+    파싱(doc)은 iframe 을 찾거나 날짜를 wrapper 에서 읽어야 할 때만 한 번 한다.
+    """
+
+    def __init__(self, html: str):
+        self.html = html
+        self._doc = None
+        m = REDIRECT_PATTERN.search(html)
+        self.redirect_url = _absolute_news_url(m.group(1)) if m else None
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            self._doc = html_backend.parse(self.html)
+        return self._doc
+
+    @property
+    def iframe_url(self) -> str | None:
+        """iframe(news_frame) 주소 (구형 구조 대비)"""
         iframe = (
-            wrapper_soup.select_one("iframe#news_frame")
-            or wrapper_soup.select_one("iframe[name='news_frame']")
+            self.doc.select_one("iframe#news_frame")
+            or self.doc.select_one("iframe[name='news_frame']")
         )
 
         if not iframe:
-            for tag in wrapper_soup.find_all("iframe"):
-                src = tag.get("src", "")
+            for tag in self.doc.select("iframe"):
+                src = tag.attr("src")
                 if "news.naver.com" in src or "n.news.naver.com" in src:
                     iframe = tag
                     break
 
-        if iframe and iframe.get("src"):
-            src = iframe["src"]
-
-            if src.startswith("//"):
-                inner_url = "https:" + src
-            elif src.startswith("/"):
-                inner_url = "https://news.naver.com" + src
-            elif src.startswith("http"):
-                inner_url = src
-            else:
-                inner_url = "https://news.naver.com/" + src.lstrip("/")
-
-            logger.info(f"Requesting article iframe: {inner_url}")
-            try:
-                inner_resp = session.get(inner_url, timeout=REQUEST_TIMEOUT)
-                inner_resp.raise_for_status()
-                inner_html = inner_resp.text
-            except Exception as e:
-                logger.warning(f"Failed to fetch iframe page {inner_url}: {e}")
-                inner_html = None
-
-    # --------------------------------------------------
-    # 2) 실제 파싱에 사용할 HTML 선택
-    # --------------------------------------------------
-    target_html = inner_html or wrapper_html
-    target_soup = BeautifulSoup(target_html, "html.parser")
-
-    parsed = _parse_naver_news_html(target_html)
-    title = parsed.get("title", "") or ""
-    content = parsed.get("content", "") or ""
+        src = iframe.attr("src") if iframe else ""
+        return _absolute_news_url(src) if src else None
+
+    def inner_url_candidates(self):
+        """
+        실제 기사 주소 후보를 JS redirect → iframe 순서로.
+        (redirect 로 받아오면 iframe 을 찾으려고 wrapper 를 파싱하지 않는다)
+        """
+        if self.redirect_url:
+            yield self.redirect_url, "JS redirect"
+        iframe_url = self.iframe_url
+        if iframe_url:
+            yield iframe_url, "iframe"
+
+
+def parse_article_page(
+    url: str,
+    wrapper: WrapperPage | None,
+    inner_html: str | None,
+    inner_url: str | None,
+) -> dict | None:
+    """
+    실제 기사 HTML(없으면 wrapper)을 한 번 파싱해서 제목/본문/날짜를 뽑아 기사 dict 를 만든다.
+    wrapper 없이(기사 주소로 바로 받은 경우) 부르면 날짜는 기사 페이지에서만 찾는다.
+    제목이 없거나 본문이 너무 짧으면 None.
+    """
+    target_doc = html_backend.parse(inner_html) if inner_html is not None else wrapper.doc
 
-    # 날짜 파싱
+    # 날짜 파싱 (본문 추출이 script 등을 지우므로 먼저)
     published_at = datetime.now()
     date_text = ""
 
     # news.naver.com 스타일 날짜
-    time_el = target_soup.select_one(".media_end_head_info_datestamp_time")
+    time_el = target_doc.select_one(".media_end_head_info_datestamp_time")
     if time_el:
-        date_text = time_el.get_text(strip=True)
+        date_text = time_el.text()
 
     # 없으면 finance wrapper 스타일 날짜
-    if not date_text:
-        date_el = wrapper_soup.select_one(".article_info .dates")
+    if not date_text and wrapper is not None:
+        date_el = wrapper.doc.select_one(".article_info .dates")
         if date_el:
-            date_text = date_el.get_text(strip=True)
+            date_text = date_el.text()
 
     if date_text:
         published_at = _parse_date(date_text)
 
+    parsed = extract_article(target_doc)
+    title = parsed.get("title", "") or ""
+    content = parsed.get("content", "") or ""
+
     # --------------------------------------------------
-    # 3) 최종 유효성 체크 + 디버그 저장
+    # 최종 유효성 체크
     # --------------------------------------------------
     if not title or len(content) < 50:
         logger.warning(
@@ -368,10 +378,117 @@ def fetch_article_detail(session, url: str) -> dict | None:
         "title": title,
         "content": content,
         "url": inner_url or url,
-        "published_at": published_at.isoformat(),       
+        "published_at": published_at.isoformat(),
+    }
+
+
+def direct_article_url(detail_url: str) -> str | None:
+    """
+    리스트 링크(news_read.naver?article_id=...&office_id=...)에서 네이버 뉴스 기사 주소를 바로 만든다.
+    파라미터가 없거나 숫자가 아니면 None (→ wrapper 경유)
+    """
+    query = parse_qs(urlsplit(detail_url).query)
+    office_id = (query.get("office_id") or [""])[0]
+    article_id = (query.get("article_id") or [""])[0]
+    if not (office_id.isdigit() and article_id.isdigit()):
+        return None
+    return DIRECT_ARTICLE_URL.format(office_id=office_id, article_id=article_id)
+
+
+class DetailStats:
+    """기사 주소를 바로 만들어 받은 횟수 / wrapper 를 거친 횟수"""
+
+    def __init__(self):
+        self.direct = 0
+        self.fallback = 0
+
+    def summary(self) -> str:
+        total = self.direct + self.fallback
+        rate = self.fallback / total if total else 0.0
+        return f"article pages: {self.direct} direct, {self.fallback} via wrapper fallback ({rate:.1%})"
+
+
+DETAIL_STATS = DetailStats()
+
+
+def fetch_article_detail(session, url: str) -> dict | None:
+    """
+    네이버 금융 기사 상세 페이지 크롤링
+
+    0) 리스트 링크의 office_id / article_id 로 n.news.naver.com 기사를 바로 요청 (direct_article_url)
+       → 성공하면 여기서 끝 (요청 1번)
+    아래는 주소를 못 만들었거나 바로 받은 페이지가 기사가 아닐 때만 (DETAIL_STATS.fallback)
+    1) finance.naver.com 의 wrapper 페이지를 요청
+    2) 그 안에서
+       - JS redirect (top.location.href='...')
+       - 또는 iframe(src)
+       를 찾아서 실제 news.naver.com 기사 URL을 얻음 (WrapperPage)
+    3) 실제 기사 HTML을 parse_article_page()로 파싱
+    """
+    direct_url = direct_article_url(url)
+    if direct_url:
+        logger.info(f"Requesting article page (direct): {direct_url}")
+        try:
+            resp = session.get(direct_url, timeout=REQUEST_TIMEOUT)
+            resp.raise_for_status()
+            article = parse_article_page(url, None, resp.text, direct_url)
+        except Exception as e:
+            logger.warning(f"Failed to fetch article page {direct_url}: {e}")
+            article = None
+        if article:
+            DETAIL_STATS.direct += 1
+            return article
+
+    DETAIL_STATS.fallback += 1
+    logger.info(f"Requesting article page (wrapper): {url}")
+    try:
+        resp = session.get(url, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+    except Exception as e:
+        logger.warning(f"Failed to fetch article page {url}: {e}")
+        return None
+
+    wrapper = WrapperPage(resp.text)
+
+    inner_html = None
+    inner_url = None
+
+    # JS redirect 가 있으면 먼저, 못 가져오면 iframe 시도
+    for candidate, kind in wrapper.inner_url_candidates():
+        logger.info(f"Requesting article via {kind}: {candidate}")
+        inner_url = candidate
+        try:
+            inner_resp = session.get(candidate, timeout=REQUEST_TIMEOUT)
+            inner_resp.raise_for_status()
+            inner_html = inner_resp.text
+            break
+        except Exception as e:
+            logger.warning(f"Failed to fetch {kind} article {candidate}: {e}")
+
+    return parse_article_page(url, wrapper, inner_html, inner_url)
+
+
+def list_item_article(item: Dict[str, Any]) -> Dict[str, Any]:
+    """상세 페이지를 못 가져온 경우 리스트 정보만으로 만드는 기사 객체"""
+    return {
+        "title": item["title"],
+        "content": "",
+        "url": item["detail_url"],
+        "published_at": item.get(
+            "published_at", datetime.now().isoformat()
+        ),
+        "source": "naver_finance_list",
     }
 
 
+def tag_company(article: Dict[str, Any], company: Dict[str, Any]) -> Dict[str, Any]:
+    """공통으로 회사 정보 붙여주기"""
+    article["company_name"] = company["name"]
+    article["company_code"] = company["code"]
+    article["market"] = company["market"]
+    return article
+
+
 # ---------------------------------------------------
 # 종목별 뉴스 크롤링
 # ---------------------------------------------------
@@ -379,7 +496,13 @@ def fetch_company_news(
     session: requests.Session,
     company: Dict[str, Any],
     max_items: int,
+    known: set[str] | None = None,
+    retry: set[str] | None = None,
 ) -> List[Dict[str, Any]]:
+    """
+    known(이미 본 기사 키)을 주면 증분 크롤링: 새 기사만 받고, 이미 본 기사가 나오면 페이지 넘기기를 멈춘다.
+    retry(다시 받을 stub 기사 키)가 있으면 이미 본 기사 뒤에서도 그 기사들을 찾을 때까지 페이지를 넘긴다.
+    """
     name = company["name"]
     code = company["code"]
     market = company["market"]
@@ -388,9 +511,10 @@ def fetch_company_news(
 
     collected: List[Dict[str, Any]] = []
     page = 1
+    reached_known = False
 
-    # 페이지를 3페이지까지만 탐색 (너무 많이 타지 않도록 제한)
-    while len(collected) < max_items and page <= 3:
+    # 페이지를 MAX_LIST_PAGES 페이지까지만 탐색 (너무 많이 타지 않도록 제한)
+    while len(collected) < max_items and page <= MAX_LIST_PAGES:
         url = build_list_url(code, page=page)
         logger.info(f"Requesting list page {page}: {url}")
 
@@ -411,37 +535,29 @@ def fetch_company_news(
             logger.info(f"No more articles found for {name}({code}) at page {page}")
             break
 
+        done = False
+        if known is not None:
+            rough_list, reached_known, done = split_new_items(rough_list, known, retry, reached_known)
+
         # 각 리스트 아이템에 대해 실제 기사 상세 페이지에서 내용 추출
         for item in rough_list:
             if len(collected) >= max_items:
                 break
 
-            detail_url = item["detail_url"]
-
             # 1차: 상세 페이지 시도
-            article = fetch_article_detail(session, detail_url)
+            article = fetch_article_detail(session, item["detail_url"])
 
             # 2차: 실패하면 리스트 정보만으로라도 기사 객체 생성
             if not article:
-                article = {
-                    "title": item["title"],
-                    "content": "",
-                    "url": detail_url,
-                    "published_at": item.get(
-                        "published_at", datetime.now().isoformat()
-                    ),
-                    "source": "naver_finance_list",
-                }
+                article = list_item_article(item)
 
-            # 공통으로 회사 정보 붙여주기
-            article["company_name"] = name
-            article["company_code"] = code
-            article["market"] = market
-
-            collected.append(article)
+            collected.append(tag_company(article, company))
             # 너무 빠르게 도배하지 않도록 살짝 딜레이
             time.sleep(0.1)
 
+        # 리스트는 최신순이라 이미 본 기사 뒤로는 전부 본 기사 (남은 stub 도 없으면 끝)
+        if done:
+            break
         page += 1
 
     logger.info(f"Collected {len(collected)} articles for {name}({code})")
@@ -455,31 +571,59 @@ def crawl_all_to_file(
     market_code_path: Path,
     output_path: Path,
     sleep_seconds: float = 0.2,
+    incremental: bool = False,
 ):
-    logger.info(f"Loading market codes from: {market_code_path}")
-    market_data = load_market_codes(market_code_path)
-
-    kospi_list = select_top_codes(market_data, KOSPI_MARKET_KEY, N_KOSPI)
-    kosdaq_list = select_top_codes(market_data, KOSDAQ_MARKET_KEY, N_KOSDAQ)
-    targets = kospi_list + kosdaq_list
-
-    logger.info(
-        f"Selected {len(kospi_list)} KOSPI + {len(kosdaq_list)} KOSDAQ = "
-        f"{len(targets)} total companies"
-    )
+    targets = load_targets(market_code_path)
 
     session = requests.Session()
-    session.headers.update(
-        {
-            "User-Agent": (
-                "Mozilla/5.0 (X11; Linux x86_64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/129.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Referer": "https://finance.naver.com/",
-        }
-    )
+    session.headers.update(DEFAULT_HEADERS)
+
+    if incremental:
+        # 새 기사만 받아서 기존 output_path 코퍼스에 합친다
+        index = SeenIndex(index_path_for(output_path), output_path)
+        new_articles: Dict[str, List[Dict[str, Any]]] = {}
+        total = len(targets)
+        for idx, company in enumerate(targets, start=1):
+            name = company["name"]
+            code = company["code"]
+            logger.info(f"=== [{idx}/{total}] {name} ({code}) ===")
+            retry = index.retry_keys(code)
+            articles = fetch_company_news(
+                session, company, N_NEWS_PER_STOCK, index.known_keys(code), set(retry)
+            )
+            index.mark_retried(code, retry)
+            if articles:
+                new_articles[name] = articles
+
+            time.sleep(sleep_seconds)
+
+        finish_incremental(index, output_path, new_articles)
+        logger.info(DETAIL_STATS.summary())
+        return
+
+    # .jsonl 이면 회사 하나 끝날 때마다 기사 단위로 바로 써서 메모리에 쌓아두지 않는다
+    if output_path.suffix == ".jsonl":
+        companies_with_news = 0
+        with JsonlWriter(output_path) as writer:
+            total = len(targets)
+            for idx, company in enumerate(targets, start=1):
+                name = company["name"]
+                logger.info(f"=== [{idx}/{total}] {name} ({company['code']}) ===")
+                articles = fetch_company_news(session, company, N_NEWS_PER_STOCK)
+                if articles:
+                    companies_with_news += 1
+                    for article in articles:
+                        writer.write(article)
+
+                time.sleep(sleep_seconds)
+
+        logger.info(
+            f"Crawling finished. Companies with news: {companies_with_news}, "
+            f"articles: {writer.count}"
+        )
+        logger.info(DETAIL_STATS.summary())
+        logger.info(f"Saved crawling data to: {output_path}")
+        return
 
     crawling_data: Dict[str, List[Dict[str, Any]]] = {}
 
@@ -496,6 +640,7 @@ def crawl_all_to_file(
     logger.info(
         f"Crawling finished. Companies with news: {len(crawling_data)}"
     )
+    logger.info(DETAIL_STATS.summary())
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8", errors="ignore") as f:
@@ -504,17 +649,49 @@ def crawl_all_to_file(
     logger.info(f"Saved crawling data to: {output_path}")
 
 
+def finish_incremental(
+    index: SeenIndex,
+    output_path: Path,
+    new_articles: Dict[str, List[Dict[str, Any]]],
+):
+    """증분 크롤링 마무리: 코퍼스에 합친 뒤 인덱스 갱신 (중간에 죽으면 다음 실행에서 다시 받아 합침)"""
+    new_count = sum(len(v) for v in new_articles.values())
+    companies, total = merge_into_corpus(output_path, new_articles, keep=N_NEWS_PER_STOCK)
+    indexed = index.add_crawled(new_articles)
+    index.close()
+    logger.info(
+        f"Incremental crawl finished. New articles: {new_count} "
+        f"({len(new_articles)} companies, {indexed} indexed)"
+    )
+    logger.info(f"Merged into {output_path}: {companies} companies, {total} articles")
+
+
 # ---------------------------------------------------
 # 실행 엔트리
 # ---------------------------------------------------
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="네이버 금융 종목 뉴스 크롤러")
+    parser.add_argument("--output", type=Path, default=DB_DIR / "crawling.json")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="이미 받은 기사(<output>.index.sqlite3)는 건너뛰고 새 기사만 받아 --output 에 합친다",
+    )
+    parser.add_argument("--parser", choices=html_backend.BACKENDS, default=None,
+                        help="HTML 파서 (기본: 설치된 것 중 가장 빠른 것)")
+    args = parser.parse_args()
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
     )
+    html_backend.use_backend(args.parser)
+    logger.info(f"HTML parser: {html_backend.backend_name}")
 
     crawl_all_to_file(
         market_code_path=DB_DIR / "market_code.json",
-        output_path=DB_DIR / "crawling.json",
+        output_path=args.output,
         sleep_seconds=0.2,
+        incremental=args.incremental,
     )
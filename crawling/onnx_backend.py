@@ -0,0 +1,245 @@
+"""
+KR-FinBert-SC 를 ONNX Runtime 으로 돌리는 추론 백엔드.
+
+처음 한 번 PyTorch 모델을 ONNX 로 내보내고 (선택적으로 int8 동적 양자화),
+db/onnx/ 아래에 저장해 두고 재사용한다. OnnxClassifier 는 analyze.load_classifier() 가
+돌려주는 pipeline 과 같은 방식으로 호출할 수 있다.
+
+    python onnx_backend.py export                  # fp32 + int8 둘 다 생성
+    python onnx_backend.py compare --sample 500    # PyTorch 기준 라벨 일치율 비교
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+from transformers import AutoTokenizer
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+ONNX_DIR = DB_DIR / "onnx"
+
+DEFAULT_MODEL_NAME = "snunlp/KR-FinBert-SC"
+DEFAULT_MAX_LENGTH = 512
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+
+def model_dir_for(model_name: str) -> Path:
+    return ONNX_DIR / model_name.replace("/", "__")
+
+
+def export_onnx(model_name: str = DEFAULT_MODEL_NAME, quantize: bool = True) -> Path:
+    """
+    PyTorch 모델 → ONNX (+ int8 동적 양자화). 이미 있으면 건너뛴다.
+    임시 디렉터리 / 임시 파일에 만든 뒤 os.replace 로 옮기므로 중간에 끊기거나 여러 프로세스가 동시에
+    내보내도 반쯤 쓴 model.onnx 가 남지 않는다. (model.onnx 는 토크나이저 / labels.json 다음 마지막에 옮김)
+    """
+    out_dir = model_dir_for(model_name)
+    fp32_path = out_dir / FP32_FILE
+    int8_path = out_dir / INT8_FILE
+
+    if not fp32_path.exists():
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        print(f"Exporting {model_name} to ONNX: {fp32_path}")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".export-", dir=out_dir))
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            model.eval()
+
+            dummy = tokenizer(["더미 입력 문장"], return_tensors="pt")
+            input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+            with torch.no_grad():
+                # torch 2.9 는 dynamo 내보내기가 기본인데, onnxscript 가 필요하고 dynamic_axes 를 다르게 다룬다.
+                # 예전 TorchScript 내보내기를 명시적으로 쓴다
+                torch.onnx.export(
+                    model,
+                    tuple(dummy[name] for name in input_names),
+                    str(tmp_dir / FP32_FILE),
+                    input_names=input_names,
+                    output_names=["logits"],
+                    dynamic_axes={
+                        **{name: {0: "batch", 1: "sequence"} for name in input_names},
+                        "logits": {0: "batch"},
+                    },
+                    opset_version=17,
+                    dynamo=False,
+                )
+            tokenizer.save_pretrained(tmp_dir)
+            with (tmp_dir / "labels.json").open("w", encoding="utf-8") as f:
+                json.dump({str(k): v for k, v in model.config.id2label.items()}, f, ensure_ascii=False)
+
+            for path in sorted(tmp_dir.iterdir(), key=lambda p: p.name == FP32_FILE):
+                os.replace(path, out_dir / path.name)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if quantize and not int8_path.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print(f"Quantizing to int8: {int8_path}")
+        tmp_path = out_dir / f".{INT8_FILE}.{os.getpid()}.onnx"
+        try:
+            quantize_dynamic(str(fp32_path), str(tmp_path), weight_type=QuantType.QInt8)
+            os.replace(tmp_path, int8_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    return out_dir
+
+
+class OnnxClassifier:
+    """
+    transformers text-classification pipeline 과 같은 호출 방식:
+        clf("문장")            → [{"label": ..., "score": ...}]
+        clf([문장들], batch_size=32) → [{"label": ..., "score": ...}, ...]
+    """
+
+    def __init__(self, model_dir: Path, quantized: bool = True, threads: int | None = None,
+                 max_length: int = DEFAULT_MAX_LENGTH):
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        with (model_dir / "labels.json").open("r", encoding="utf-8") as f:
+            self.id2label = {int(k): v for k, v in json.load(f).items()}
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        model_path = model_dir / (INT8_FILE if quantized else FP32_FILE)
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _run(self, texts: list[str]) -> list[dict]:
+        enc = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self.input_names}
+        logits = self.session.run(["logits"], feeds)[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        return [
+            {"label": self.id2label[int(b)], "score": float(p[b])}
+            for b, p in zip(best, probs)
+        ]
+
+    def __call__(self, inputs, batch_size: int | None = None, **_):
+        if isinstance(inputs, str):
+            return self._run([inputs])
+        batch_size = batch_size or len(inputs) or 1
+        outputs: list[dict] = []
+        for start in range(0, len(inputs), batch_size):
+            outputs.extend(self._run(inputs[start:start + batch_size]))
+        return outputs
+
+
+def load_onnx_classifier(
+    model_name: str = DEFAULT_MODEL_NAME,
+    quantized: bool = True,
+    threads: int | None = None,
+    max_length: int = DEFAULT_MAX_LENGTH,
+) -> OnnxClassifier:
+    """
+    캐시된 ONNX 모델이 없으면 먼저 내보낸 뒤 로드.
+    """
+    model_dir = export_onnx(model_name, quantize=quantized)
+    return OnnxClassifier(model_dir, quantized=quantized, threads=threads, max_length=max_length)
+
+
+# ---------------------------------------------------
+# PyTorch 기준 정확도 비교
+# ---------------------------------------------------
+def sample_texts(input_path: Path, sample: int, seed: int = 42) -> list[str]:
+    """
+    코퍼스에서 sample 개를 reservoir sampling 으로 뽑는다. (코퍼스 전체를 메모리에 올리지 않음)
+    """
+    from analyze import make_input_text
+
+    from article_stream import iter_articles
+
+    rng = random.Random(seed)
+    reservoir: list[str] = []
+    for i, (_, a) in enumerate(iter_articles(input_path)):
+        if len(reservoir) < sample:
+            reservoir.append(make_input_text(a.get("title", ""), a.get("content", "")))
+        else:
+            j = rng.randint(0, i)
+            if j < sample:
+                reservoir[j] = make_input_text(a.get("title", ""), a.get("content", ""))
+    return reservoir
+
+
+def compare(input_path: Path, sample: int, batch_size: int, threads: int | None):
+    from analyze import load_classifier, classify_texts
+
+    texts = sample_texts(input_path, sample)
+    print(f"Comparing backends on {len(texts)} sampled articles")
+
+    baseline_clf = load_classifier(device=-1)
+    t0 = time.perf_counter()
+    baseline = [label for label, _ in classify_texts(baseline_clf, texts, batch_size)]
+    base_sec = time.perf_counter() - t0
+    print(f"[torch]     {len(texts) / base_sec:7.1f} articles/s")
+
+    for quantized in (False, True):
+        name = "onnx-int8" if quantized else "onnx-fp32"
+        clf = load_onnx_classifier(quantized=quantized, threads=threads)
+        t0 = time.perf_counter()
+        labels = [label for label, _ in classify_texts(clf, texts, batch_size)]
+        sec = time.perf_counter() - t0
+
+        agree = sum(1 for a, b in zip(baseline, labels) if a == b)
+        confusion: dict[str, int] = {}
+        for a, b in zip(baseline, labels):
+            if a != b:
+                key = f"{a}->{b}"
+                confusion[key] = confusion.get(key, 0) + 1
+        print(
+            f"[{name}] {len(texts) / sec:7.1f} articles/s (x{base_sec / sec:.2f}) | "
+            f"agreement {agree}/{len(texts)} = {agree / len(texts):.2%} | "
+            f"disagreements {confusion}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KR-FinBert-SC ONNX 백엔드")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    exp = sub.add_parser("export", help="ONNX 변환 (+ int8 양자화)")
+    exp.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    exp.add_argument("--no-quantize", action="store_true")
+
+    cmp_ = sub.add_parser("compare", help="PyTorch 기준 라벨 일치율/속도 비교")
+    cmp_.add_argument("--input", type=Path, default=DB_DIR / "crawling.json")
+    cmp_.add_argument("--sample", type=int, default=500)
+    cmp_.add_argument("--batch-size", type=int, default=32)
+    cmp_.add_argument("--threads", type=int, default=None)
+
+    args = parser.parse_args()
+    if args.command == "export":
+        out_dir = export_onnx(args.model, quantize=not args.no_quantize)
+        print(f"ONNX model ready: {out_dir}")
+    elif args.command == "compare":
+        compare(args.input, args.sample, args.batch_size, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+company_scores.json 과 같은 내용을 담은 바이너리 컬럼형 스냅샷 (company_scores.bin).
+
+웹/ai 쪽 프로세스들이 이 파일을 mmap 으로 열면 JSON 파싱 없이 바로 쓸 수 있고,
+모든 워커가 OS page cache 에 올라간 사본 하나를 같이 쓴다.
+
+파일 구조 (리틀 엔디언):
+    header   32 bytes  magic b"CSCO", format(u32), count(u32), names_len(u32), version(16 bytes ascii)
+    int32[count] x 5   positive, negative, neutral, total, score (컬럼별로 연속)
+    uint32[count + 1]  names blob 안에서 각 이름의 시작 위치
+    bytes[names_len]   이름 UTF-8 (바이트 순으로 정렬 → 이진 탐색)
+
+version 은 같이 쓴 company_scores.json 내용의 sha1 앞 12자리라서,
+JSON 으로 읽든 bin 으로 읽든 같은 스냅샷이면 같은 버전이 나온다.
+
+형식 / 쓰기(write_snapshot) / 읽기(ColumnarScores) 가 전부 이 파일 하나에 있다.
+웹(recommend/services/score_snapshot.py)과 ai/stock_data.py 는 이 파일을 그대로 import 하므로
+형식을 바꿀 때는 여기만 고치면 된다. (표준 라이브러리만 쓸 것)
+"""
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+MAGIC = b"CSCO"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIII16s")
+
+# (bin 컬럼 이름, company_scores.json 키)
+COLUMNS = (
+    ("positive", "positive_count"),
+    ("negative", "negative_count"),
+    ("neutral", "neutral_count"),
+    ("total", "total_articles"),
+    ("score", "company_score"),
+)
+
+
+def read_version(path: Path) -> str:
+    """
+    헤더의 version 만 읽는다. (JSON 과 같은 스냅샷인지 비교할 때, 전체를 mmap 하지 않고)
+    """
+    with path.open("rb") as f:
+        return HEADER.unpack(f.read(HEADER.size))[4].rstrip(b"\0").decode("ascii")
+
+
+class ColumnarScores(Mapping):
+    """
+    company_scores.bin 을 mmap 으로 연 읽기 전용 매핑. company_scores.json 과 같은 모양으로 보인다.
+    미리 dict 로 풀어 두지 않고 조회할 때 그 행만 읽으므로, 여러 프로세스가 page cache 사본 하나를 같이 쓴다.
+    """
+
+    def __init__(self, path: Path):
+        with path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, count, names_len, version = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {path}")
+
+        self.count = count
+        self.version = version.rstrip(b"\0").decode("ascii")
+        view = memoryview(self._mm)
+
+        pos = HEADER.size
+        self.columns = {}
+        for col, _ in COLUMNS:
+            self.columns[col] = view[pos:pos + 4 * count].cast("i")
+            pos += 4 * count
+        self._offsets = view[pos:pos + 4 * (count + 1)].cast("I")
+        pos += 4 * (count + 1)
+        self._names = view[pos:pos + names_len]
+
+    def _name_bytes(self, i: int) -> bytes:
+        return self._names[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+    def index_of(self, name: str) -> int:
+        # 이름이 UTF-8 바이트 순으로 정렬돼 있어서 이진 탐색
+        key = name.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.count and self._name_bytes(lo) == key else -1
+
+    def row(self, i: int) -> dict[str, int]:
+        return {key: self.columns[col][i] for col, key in COLUMNS}
+
+    def __getitem__(self, name: str) -> dict[str, int]:
+        i = self.index_of(name)
+        if i < 0:
+            raise KeyError(name)
+        return self.row(i)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.index_of(name) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self.count):
+            yield self._name_bytes(i).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def write_snapshot(company_scores: dict[str, dict], path: Path, version: str):
+    """
+    company_scores (analyze.py 결과) 를 bin 으로 저장. 임시 파일에 쓴 뒤 교체.
+    """
+    names = sorted(company_scores, key=lambda n: n.encode("utf-8"))
+    encoded = [n.encode("utf-8") for n in names]
+
+    offsets = array("I", [0])
+    for raw in encoded:
+        offsets.append(offsets[-1] + len(raw))
+    blob = b"".join(encoded)
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(names), len(blob), version.encode("ascii")[:16]))
+        for _, key in COLUMNS:
+            col = array("i", (int(company_scores[n].get(key, 0)) for n in names))
+            f.write(col.tobytes())
+        f.write(offsets.tobytes())
+        f.write(blob)
+    os.replace(tmp_path, path)
+
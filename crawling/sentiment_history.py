@@ -0,0 +1,256 @@
+"""
+기업별 일자별 감성 집계 (시계열) 저장소.
+
+company_scores.json 은 매번 덮어쓰는 스냅샷이라 추세를 볼 수 없어서,
+라벨이 붙은 기사를 published_at 날짜 기준으로 SQLite 에 쌓아 둔다.
+
+- daily_sentiment : (회사, 날짜) 별 호재/악재/중립 개수 (fact 테이블)
+- company_trend   : 회사별 1일/7일/30일 누적합 + 지수 감쇠 점수 (running sum)
+- seen_articles   : 이미 반영한 기사 키. 같은 기사를 다음 날 다시 분석해도 두 번 세지 않음
+
+새 라벨이 들어오면 fact 행과 누적합을 같이 갱신하고, 날짜가 넘어가면
+윈도우 밖으로 나간 날짜의 fact 만 빼 준다. 그래서 추세 조회는 company_trend 한 행 읽기(O(1)).
+
+    python sentiment_history.py trend 삼성전자
+"""
+import argparse
+import hashlib
+import sqlite3
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_DIR = BASE_DIR / "db"
+HISTORY_DB_PATH = DB_DIR / "sentiment_history.sqlite3"
+
+WINDOWS = (1, 7, 30)
+# 지수 감쇠 점수의 반감기(일)
+HALF_LIFE_DAYS = 7.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_articles (
+    article_key TEXT NOT NULL,
+    company     TEXT NOT NULL,
+    PRIMARY KEY (article_key, company)
+);
+CREATE TABLE IF NOT EXISTS daily_sentiment (
+    company  TEXT NOT NULL,
+    day      TEXT NOT NULL,
+    positive INTEGER NOT NULL DEFAULT 0,
+    negative INTEGER NOT NULL DEFAULT 0,
+    neutral  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (company, day)
+);
+CREATE TABLE IF NOT EXISTS company_trend (
+    company TEXT PRIMARY KEY,
+    as_of   TEXT NOT NULL,
+    pos_1d  INTEGER NOT NULL DEFAULT 0, neg_1d  INTEGER NOT NULL DEFAULT 0, neu_1d  INTEGER NOT NULL DEFAULT 0,
+    pos_7d  INTEGER NOT NULL DEFAULT 0, neg_7d  INTEGER NOT NULL DEFAULT 0, neu_7d  INTEGER NOT NULL DEFAULT 0,
+    pos_30d INTEGER NOT NULL DEFAULT 0, neg_30d INTEGER NOT NULL DEFAULT 0, neu_30d INTEGER NOT NULL DEFAULT 0,
+    decayed_score REAL NOT NULL DEFAULT 0
+);
+"""
+
+# label → (컬럼 접두어, 점수)
+_LABEL_COLUMNS = {
+    "positive": ("pos", 1),
+    "negative": ("neg", -1),
+    "neutral": ("neu", 0),
+}
+
+
+def article_key(article: dict) -> str:
+    """
+    기사 식별 키. URL 이 있으면 URL, 없으면 제목 + 발행일 해시.
+    """
+    url = (article.get("url") or "").strip()
+    if url:
+        return url
+    raw = f"{article.get('title', '')}|{article.get('published_at', '')}"
+    return "sha1:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def article_day(article: dict) -> str:
+    published_at = article.get("published_at") or ""
+    try:
+        return datetime.fromisoformat(published_at).date().isoformat()
+    except ValueError:
+        return date.today().isoformat()
+
+
+def _decay(days: int) -> float:
+    return 0.5 ** (days / HALF_LIFE_DAYS)
+
+
+class SentimentHistory:
+    def __init__(self, path: Path = HISTORY_DB_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    # ---------------------------------------------------
+    # 갱신
+    # ---------------------------------------------------
+    def add_label(self, company: str, article: dict, label: str | None) -> bool:
+        """
+        라벨 하나 반영. 이미 반영한 기사면 False.
+        """
+        l = (label or "").lower()
+        if l not in _LABEL_COLUMNS:
+            return False
+
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO seen_articles (article_key, company) VALUES (?, ?)",
+            (article_key(article), company),
+        )
+        if cur.rowcount == 0:
+            return False
+
+        day = article_day(article)
+        prefix, point = _LABEL_COLUMNS[l]
+        col = {"pos": "positive", "neg": "negative", "neu": "neutral"}[prefix]
+        self.conn.execute(
+            f"INSERT INTO daily_sentiment (company, day, {col}) VALUES (?, ?, 1) "
+            f"ON CONFLICT(company, day) DO UPDATE SET {col} = {col} + 1",
+            (company, day),
+        )
+
+        trend = self._get_or_create_trend(company, day)
+        if day > trend["as_of"]:
+            self._advance(company, trend, day)
+            trend = self._trend_row(company)
+
+        as_of = date.fromisoformat(trend["as_of"])
+        age = (as_of - date.fromisoformat(day)).days
+        updates = [
+            f"{prefix}_{w}d = {prefix}_{w}d + 1"
+            for w in WINDOWS
+            if age < w
+        ]
+        updates.append("decayed_score = decayed_score + ?")
+        self.conn.execute(
+            f"UPDATE company_trend SET {', '.join(updates)} WHERE company = ?",
+            (point * _decay(age), company),
+        )
+        return True
+
+    def advance_all(self, today: date | None = None):
+        """
+        모든 회사의 기준일을 오늘로 옮긴다. (새 기사가 없는 회사도 윈도우가 밀리도록, 분석 끝에 1번)
+        """
+        day = (today or date.today()).isoformat()
+        rows = self.conn.execute(
+            "SELECT * FROM company_trend WHERE as_of < ?", (day,)
+        ).fetchall()
+        for trend in rows:
+            self._advance(trend["company"], trend, day)
+        self.conn.commit()
+
+    def _trend_row(self, company: str):
+        return self.conn.execute(
+            "SELECT * FROM company_trend WHERE company = ?", (company,)
+        ).fetchone()
+
+    def _get_or_create_trend(self, company: str, day: str):
+        trend = self._trend_row(company)
+        if trend is None:
+            self.conn.execute(
+                "INSERT INTO company_trend (company, as_of) VALUES (?, ?)", (company, day)
+            )
+            trend = self._trend_row(company)
+        return trend
+
+    def _advance(self, company: str, trend, new_day: str):
+        """
+        기준일을 new_day 로 옮기면서 각 윈도우에서 빠지는 날짜의 fact 를 뺀다.
+        """
+        old = date.fromisoformat(trend["as_of"])
+        new = date.fromisoformat(new_day)
+        sets = []
+        params: list = []
+        for w in WINDOWS:
+            # (old - w, new - w] 구간의 날짜가 윈도우에서 빠진다
+            lo = (old - timedelta(days=w)).isoformat()
+            hi = (new - timedelta(days=w)).isoformat()
+            out = self.conn.execute(
+                "SELECT COALESCE(SUM(positive), 0), COALESCE(SUM(negative), 0), COALESCE(SUM(neutral), 0) "
+                "FROM daily_sentiment WHERE company = ? AND day > ? AND day <= ?",
+                (company, lo, hi),
+            ).fetchone()
+            for prefix, value in zip(("pos", "neg", "neu"), out):
+                if value:
+                    sets.append(f"{prefix}_{w}d = {prefix}_{w}d - ?")
+                    params.append(value)
+        sets.append("decayed_score = decayed_score * ?")
+        params.append(_decay((new - old).days))
+        sets.append("as_of = ?")
+        params.append(new_day)
+        self.conn.execute(
+            f"UPDATE company_trend SET {', '.join(sets)} WHERE company = ?",
+            (*params, company),
+        )
+
+    # ---------------------------------------------------
+    # 조회
+    # ---------------------------------------------------
+    def get_trend(self, company: str) -> dict | None:
+        """
+        회사 하나의 1일/7일/30일 합계와 감쇠 점수. (company_trend 한 행 조회)
+        """
+        row = self._trend_row(company)
+        if row is None:
+            return None
+        trend = {"company": company, "as_of": row["as_of"], "decayed_score": row["decayed_score"]}
+        for w in WINDOWS:
+            pos, neg, neu = row[f"pos_{w}d"], row[f"neg_{w}d"], row[f"neu_{w}d"]
+            trend[f"{w}d"] = {
+                "positive": pos,
+                "negative": neg,
+                "neutral": neu,
+                "score": pos - neg,
+            }
+        return trend
+
+    def get_daily(self, company: str, days: int = 30) -> list[dict]:
+        """
+        차트용 일자별 집계 (최근 days 일).
+        """
+        since = (date.today() - timedelta(days=days)).isoformat()
+        rows = self.conn.execute(
+            "SELECT day, positive, negative, neutral FROM daily_sentiment "
+            "WHERE company = ? AND day > ? ORDER BY day",
+            (company, since),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기업 감성 추세 조회")
+    sub = parser.add_subparsers(dest="command", required=True)
+    trend = sub.add_parser("trend", help="회사 하나의 1일/7일/30일 추세")
+    trend.add_argument("company")
+    parser.add_argument("--db", type=Path, default=HISTORY_DB_PATH)
+    args = parser.parse_args()
+
+    history = SentimentHistory(args.db)
+    result = history.get_trend(args.company)
+    if result is None:
+        print(f"'{args.company}' 기록이 없습니다.")
+        sys.exit(1)
+    for key in ("1d", "7d", "30d"):
+        t = result[key]
+        print(f"{key:>3}: +{t['positive']} / -{t['negative']} / 0:{t['neutral']} → score = {t['score']}")
+    print(f"decayed_score = {result['decayed_score']:.2f} (as_of={result['as_of']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+KR-FinBert-SC 를 한 번만 올려 두고 HTTP 로 감성 분류를 해 주는 로컬 서버.
+
+analyze.py (--backend remote) 와 웹(recommend/services/sentiment.py 의 score_headline)이 같이 쓴다.
+동시에 들어온 요청은 max_wait_ms 동안 모아서 한 배치로 돌린다 (micro-batching).
+
+    python sentiment_server.py                         # 127.0.0.1:8765, torch
+    python sentiment_server.py --backend onnx-int8 --threads 4 --max-wait-ms 10
+    python sentiment_server.py --max-length 256                      # analyze.py 도 256 기준으로 맞춘다
+
+API
+    POST /classify  {"texts": ["...", ...]}  또는  {"articles": [{"title": ..., "content": ...}, ...]}
+                    → {"model": ..., "backend": ..., "results": [{"label": ..., "score": ...}, ...]}
+    GET  /health    → 모델 정보 + 배치 통계
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SENTIMENT_SERVER_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 10.0     # 첫 요청이 들어온 뒤 같은 배치로 묶을 요청을 기다리는 시간
+MAX_TEXTS_PER_REQUEST = 4096
+RESULT_TIMEOUT = 300.0
+
+
+class _Pending:
+    __slots__ = ("text", "result", "event")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.result: tuple[str | None, float] = (None, 0.0)
+        self.event = threading.Event()
+
+
+class MicroBatcher:
+    """
+    요청 스레드들은 submit() 으로 텍스트를 큐에 넣고 기다리고,
+    배치 스레드 하나가 큐에서 최대 batch_size 개를 max_wait_ms 안에 모아 모델을 한 번 돌린다.
+    """
+
+    def __init__(self, classifier, batch_size: int = DEFAULT_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.classifier = classifier
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue: queue.Queue[_Pending] = queue.Queue()
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "texts": 0, "batches": 0, "batch_ms_total": 0.0}
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def submit(self, texts: list[str]) -> list[tuple[str | None, float]]:
+        items = [_Pending(t) for t in texts]
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["texts"] += len(items)
+        for item in items:
+            self.queue.put(item)
+        for item in items:
+            if not item.event.wait(RESULT_TIMEOUT):
+                raise TimeoutError("classification timed out")
+        return [item.result for item in items]
+
+    def _collect(self) -> list[_Pending]:
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # 이미 큐에 쌓여 있는 건 기다리지 않고 바로 가져온다
+                item = self.queue.get_nowait() if remaining <= 0 else self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _loop(self):
+        from analyze import run_batch
+
+        while True:
+            batch = self._collect()
+            t0 = time.perf_counter()
+            results = run_batch(self.classifier, [item.text for item in batch])
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            for item, result in zip(batch, results):
+                item.result = result
+                item.event.set()
+            with self.lock:
+                self.stats["batches"] += 1
+                self.stats["batch_ms_total"] += elapsed_ms
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+        batches = stats.pop("batches")
+        total_ms = stats.pop("batch_ms_total")
+        stats["batches"] = batches
+        stats["avg_batch_size"] = round(stats["texts"] / batches, 2) if batches else 0.0
+        stats["avg_batch_ms"] = round(total_ms / batches, 1) if batches else 0.0
+        stats["queued"] = self.queue.qsize()
+        return stats
+
+
+def make_handler(batcher: MicroBatcher, info: dict):
+    from analyze import make_input_text
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, data: dict):
+            raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send(404, {"error": "not found"})
+                return
+            self._send(200, {"status": "ok", **info, "stats": batcher.snapshot()})
+
+        def do_POST(self):
+            if self.path != "/classify":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if "articles" in body:
+                    texts = [make_input_text(a.get("title", ""), a.get("content", "")) for a in body["articles"]]
+                else:
+                    texts = [str(t) for t in body.get("texts", [])]
+            except (ValueError, AttributeError, TypeError) as e:
+                self._send(400, {"error": f"bad request: {e}"})
+                return
+            if len(texts) > MAX_TEXTS_PER_REQUEST:
+                self._send(413, {"error": f"too many texts (max {MAX_TEXTS_PER_REQUEST})"})
+                return
+
+            try:
+                results = batcher.submit(texts)
+            except TimeoutError as e:
+                self._send(503, {"error": str(e)})
+                return
+            self._send(
+                200,
+                {
+                    "model": info["model"],
+                    "backend": info["backend"],
+                    "results": [{"label": label, "score": score} for label, score in results],
+                },
+            )
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(
+    host: str,
+    port: int,
+    backend: str,
+    threads: int | None,
+    batch_size: int,
+    max_wait_ms: float,
+    max_length: int | None = None,
+):
+    import torch
+
+    from analyze import MAX_LENGTH, MODEL_NAME, detect_device, get_classifier
+
+    max_length = max_length or MAX_LENGTH
+
+    if threads:
+        torch.set_num_threads(threads)
+    device = detect_device() if backend == "torch" else -1
+
+    print(f"Loading KR-FinBERT model... (backend={backend})")
+    t0 = time.perf_counter()
+    classifier = get_classifier(backend, device, threads, max_length)
+    print(f"Model loaded in {time.perf_counter() - t0:.1f}s")
+
+    info = {"model": MODEL_NAME, "backend": backend, "max_length": max_length}
+    batcher = MicroBatcher(classifier, batch_size, max_wait_ms)
+    server = ThreadingHTTPServer((host, port), make_handler(batcher, info))
+    server.daemon_threads = True
+    print(f"Sentiment server listening on http://{host}:{port} (batch_size={batch_size}, max_wait={max_wait_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ---------------------------------------------------
+# 클라이언트 (analyze.py --backend remote)
+# ---------------------------------------------------
+def server_info(url: str = SENTIMENT_SERVER_URL, timeout: float = 5.0) -> dict:
+    resp = requests.get(f"{url}/health", timeout=timeout)
+    resp.raise_for_status()
+    return resp.json()
+
+
+class RemoteClassifier:
+    """
+    pipeline 과 같은 호출 방식으로 서버에 분류를 맡긴다.
+    tokenizer 는 배치를 길이순으로 묶는 데만 쓰므로 로컬에서 토크나이저만 올린다.
+    """
+
+    def __init__(self, url: str = SENTIMENT_SERVER_URL, timeout: float = RESULT_TIMEOUT):
+        from transformers import AutoTokenizer
+
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.info = server_info(self.url)
+        self.tokenizer = AutoTokenizer.from_pretrained(self.info["model"])
+        self.session = requests.Session()
+
+    def __call__(self, inputs, batch_size: int | None = None, **_):
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        outputs: list[dict] = []
+        step = min(batch_size or len(texts) or 1, MAX_TEXTS_PER_REQUEST)
+        for start in range(0, len(texts), step):
+            resp = self.session.post(
+                f"{self.url}/classify",
+                json={"texts": texts[start:start + step]},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+            outputs.extend(resp.json()["results"])
+        return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KR-FinBert-SC 감성 분류 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=("torch", "onnx", "onnx-int8"), default="torch")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument("--max-length", type=int, default=None, help="모델 입력 최대 토큰 수 (기본 512)")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.backend, args.threads, args.batch_size, args.max_wait_ms, args.max_length)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# crawling/ 모듈들은 스크립트처럼 같은 디렉터리에서 서로 import 하므로 그 경로를 넣는다
+CRAWLING_DIR = Path(__file__).resolve().parent.parent
+if str(CRAWLING_DIR) not in sys.path:
+    sys.path.insert(0, str(CRAWLING_DIR))
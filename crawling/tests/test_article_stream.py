@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from article_stream import JsonlWriter, _iter_legacy_json, iter_articles, iter_windows
+
+CORPUS = {
+    "삼성전자": [
+        {"title": "HBM \"수주\" 확대", "content": "본문\n줄바꿈 \\ 역슬래시 é", "n": [1, {"x": None}]},
+        {"title": "둘째", "content": "", "published_at": "2024-07-13T15:30:00"},
+    ],
+    "빈 회사": [],
+    "카카오": [{"title": "{중괄호} [대괄호], 쉼표", "content": "가" * 300}],
+}
+
+
+def expected_pairs(data: dict) -> list[tuple[str, dict]]:
+    return [(company, article) for company, articles in data.items() for article in articles]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+def test_legacy_json_matches_json_load_at_any_chunk_boundary(tmp_path, chunk_size):
+    path = tmp_path / "crawling.json"
+    path.write_text(json.dumps(CORPUS, ensure_ascii=False, indent=2), encoding="utf-8")
+    assert list(_iter_legacy_json(path, chunk_size=chunk_size)) == expected_pairs(CORPUS)
+
+
+def test_legacy_json_compact_and_empty(tmp_path):
+    path = tmp_path / "crawling.json"
+    path.write_text(json.dumps(CORPUS, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    assert list(_iter_legacy_json(path, chunk_size=5)) == expected_pairs(CORPUS)
+
+    path.write_text(" { } ", encoding="utf-8")
+    assert list(iter_articles(path)) == []
+
+
+def test_legacy_json_truncated_file_raises(tmp_path):
+    path = tmp_path / "crawling.json"
+    text = json.dumps(CORPUS, ensure_ascii=False)
+    path.write_text(text[: len(text) // 2], encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(_iter_legacy_json(path, chunk_size=16))
+
+
+def test_jsonl_skips_blank_and_broken_lines(tmp_path, capsys):
+    path = tmp_path / "crawling.jsonl"
+    path.write_text(
+        '{"company_name": "삼성전자", "title": "a"}\n'
+        "\n"
+        '{"company_name": "카카오", "title": \n'
+        '{"title": "회사 없음"}\n',
+        encoding="utf-8",
+    )
+    assert list(iter_articles(path)) == [
+        ("삼성전자", {"company_name": "삼성전자", "title": "a"}),
+        ("", {"title": "회사 없음"}),
+    ]
+    assert "crawling.jsonl:3" in capsys.readouterr().out
+
+
+def test_jsonl_writer_round_trip_and_resume(tmp_path):
+    path = tmp_path / "labels.jsonl"
+    with JsonlWriter(path) as writer:
+        writer.write({"i": 0})
+        checkpoint = writer.offset()
+        writer.write({"i": 1})
+    assert [a for _, a in iter_articles(path)] == [{"i": 0}, {"i": 1}]
+
+    # 체크포인트 이후에 쓴 줄은 버리고 이어 쓴다
+    writer.tmp_path.write_bytes(path.read_bytes())
+    with JsonlWriter(path, resume_at=checkpoint) as writer:
+        writer.write({"i": 2})
+    assert [a for _, a in iter_articles(path)] == [{"i": 0}, {"i": 2}]
+
+
+def test_jsonl_writer_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "labels.jsonl"
+    path.write_text('{"old": true}\n', encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with JsonlWriter(path) as writer:
+            writer.write({"new": True})
+            raise RuntimeError
+    assert path.read_text(encoding="utf-8") == '{"old": true}\n'
+
+
+def test_iter_windows():
+    assert list(iter_windows(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_windows([], 3)) == []
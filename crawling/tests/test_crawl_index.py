@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from crawl_index import (
+    MAX_STUB_RETRIES,
+    SeenIndex,
+    article_key_from_url,
+    index_path_for,
+    merge_into_corpus,
+    split_new_items,
+)
+
+
+def item(n: int) -> dict:
+    return {"detail_url": f"https://finance.naver.com/item/news_read.naver?article_id={n:010d}&office_id=001"}
+
+
+def key(n: int) -> str:
+    return f"001/{n:010d}"
+
+
+def article(n: int, code: str = "005930", stub: bool = False, day: int = 1) -> dict:
+    a = {
+        "company_code": code,
+        "company_name": "삼성전자",
+        "url": f"https://n.news.naver.com/mnews/article/001/{n:010d}",
+        "published_at": f"2026-10-{day:02d}T09:00:00",
+    }
+    if stub:
+        a["source"] = "naver_finance_list"
+    return a
+
+
+def test_article_key_is_shared_by_list_and_article_urls():
+    assert article_key_from_url(item(7)["detail_url"]) == key(7)
+    assert article_key_from_url(article(7)["url"]) == key(7)
+    assert article_key_from_url("https://example.com/a/b?x=1#frag") == "example.com/a/b"
+
+
+def test_split_stops_at_first_known_article():
+    selected, reached, done = split_new_items([item(5), item(4), item(3), item(2)], known={key(3)})
+    assert selected == [item(5), item(4)]
+    assert reached and done
+
+
+def test_split_keeps_paging_when_nothing_known():
+    selected, reached, done = split_new_items([item(5), item(4)], known=set())
+    assert selected == [item(5), item(4)]
+    assert not reached and not done
+
+
+def test_split_picks_up_stub_after_known_article():
+    # 최신순 [A(본 기사), B(stub), C(본 기사)] → B 만 다시 받고 끝
+    retry = {key(2)}
+    selected, _, done = split_new_items([item(3), item(2), item(1)], known={key(3), key(1)}, retry=retry)
+    assert selected == [item(2)]
+    assert done
+    assert retry == set()
+
+
+def test_split_carries_reached_known_and_stubs_to_next_page():
+    retry = {key(2), key(0)}
+    known = {key(3), key(1)}
+    selected, reached, done = split_new_items([item(3), item(2), item(1)], known, retry)
+    assert selected == [item(2)]
+    assert reached and not done
+    assert retry == {key(0)}
+
+    # 다음 페이지: 인덱스에 없는 오래된 기사(-1)는 새 기사로 받지 않고 남은 stub 만
+    selected, reached, done = split_new_items([item(-1), item(0), item(-2)], known, retry, reached)
+    assert selected == [item(0)]
+    assert done
+
+
+def test_split_does_not_select_unknown_items_after_known():
+    selected, reached, done = split_new_items([item(3), item(2), item(1)], known={key(3)}, retry={key(9)})
+    assert selected == []
+    assert reached and not done
+
+
+@pytest.fixture
+def index(tmp_path):
+    corpus = tmp_path / "crawling.jsonl"
+    idx = SeenIndex(index_path_for(corpus), corpus)
+    yield idx
+    idx.close()
+
+
+def test_index_path_is_per_corpus(tmp_path):
+    assert index_path_for(tmp_path / "crawling.json") != index_path_for(tmp_path / "crawling.jsonl")
+    assert index_path_for(tmp_path / "crawling.jsonl").name == "crawling.jsonl.index.sqlite3"
+
+
+def test_index_rejects_other_corpus(tmp_path):
+    path = tmp_path / "shared.index.sqlite3"
+    SeenIndex(path, tmp_path / "a.jsonl").close()
+    SeenIndex(path, tmp_path / "a.jsonl").close()
+    with pytest.raises(ValueError):
+        SeenIndex(path, tmp_path / "b.jsonl")
+
+
+def test_stub_is_retried_until_limit(index):
+    index.add_crawled({"삼성전자": [article(1), article(2, stub=True)]})
+    assert index.known_keys("005930") == {key(1)}
+    assert index.stats()["stubs"] == 1
+
+    for _ in range(MAX_STUB_RETRIES):
+        retry = index.retry_keys("005930")
+        assert retry == {key(2)}
+        index.mark_retried("005930", retry)
+    assert index.retry_keys("005930") == set()
+
+
+def test_complete_article_never_reverts_to_stub(index):
+    index.add_crawled({"삼성전자": [article(2, stub=True)]})
+    index.add_crawled({"삼성전자": [article(2)]})
+    assert index.known_keys("005930") == {key(2)}
+    index.add_crawled({"삼성전자": [article(2, stub=True)]})
+    assert index.known_keys("005930") == {key(2)}
+    assert index.retry_keys("005930") == set()
+    assert index.stats() == {"articles": 1, "companies": 1, "last_seen": index.stats()["last_seen"], "stubs": 0}
+
+
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_merge_into_corpus_dedups_and_keeps_latest(tmp_path, suffix):
+    corpus = tmp_path / f"crawling{suffix}"
+    merge_into_corpus(corpus, {"삼성전자": [article(1, day=1), article(2, day=2)]}, keep=0)
+    companies, count = merge_into_corpus(
+        corpus, {"삼성전자": [article(3, day=3), article(2, day=2)], "SK하이닉스": [article(9, code="000660")]}, keep=2
+    )
+    assert (companies, count) == (2, 3)
+
+    if suffix == ".jsonl":
+        rows = [json.loads(line) for line in corpus.read_text(encoding="utf-8").splitlines()]
+    else:
+        rows = [a for arts in json.loads(corpus.read_text(encoding="utf-8")).values() for a in arts]
+    assert [article_key_from_url(a["url"]) for a in rows] == [key(3), key(2), key(9)]
@@ -0,0 +1,133 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from dedup import (
+    DedupFilter,
+    UnionFind,
+    article_text,
+    find_clusters,
+    minhash,
+    save_clusters,
+    shingles,
+)
+
+WORDS = ["삼성전자", "반도체", "실적", "증가", "감소", "외국인", "매수", "매도", "전망", "발표", "공시", "수주",
+         "영업이익", "주가", "상승", "하락", "시장", "투자", "계약", "글로벌", "공급", "확대", "둔화", "우려"]
+
+
+def random_body(rng: random.Random, n_words: int = 150) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)) + f" {rng.random()}"
+
+
+def write_corpus(path, articles):
+    path.write_text("".join(json.dumps(a, ensure_ascii=False) + "\n" for a in articles), encoding="utf-8")
+
+
+def jaccard(a: str, b: str) -> float:
+    x, y = set(shingles(a).tolist()), set(shingles(b).tolist())
+    return len(x & y) / len(x | y)
+
+
+def test_minhash_is_deterministic_and_skips_empty_text():
+    assert np.array_equal(minhash("같은 기사 본문입니다"), minhash("같은  기사\n본문입니다"))
+    assert minhash("") is None
+    assert minhash("   ") is None
+
+
+def test_minhash_agreement_estimates_jaccard():
+    rng = random.Random(0)
+    base = random_body(rng)
+    for variant in (base + " (끝)", base[: len(base) // 2] + random_body(rng, 75), random_body(rng)):
+        estimate = float(np.mean(minhash(base) == minhash(variant)))
+        assert estimate == pytest.approx(jaccard(base, variant), abs=0.15)
+
+
+def test_union_find_keeps_earliest_position_as_root():
+    uf = UnionFind()
+    uf.union(5, 3)
+    uf.union(3, 9)
+    uf.union(7, 8)
+    assert uf.find(9) == uf.find(5) == 3
+    assert uf.find(8) == 7
+    uf.union(8, 9)
+    assert uf.find(7) == 3
+
+
+def test_find_clusters_groups_rewires_only(tmp_path):
+    rng = random.Random(1)
+    wire = random_body(rng)
+    other = random_body(rng)
+    articles = [
+        {"company_name": "삼성전자", "title": "삼성전자 실적 발표", "content": f"(서울=연합뉴스) {wire}"},
+        {"company_name": "삼성전자", "title": "다른 기사", "content": other},
+        {"company_name": "삼성전자", "title": "삼성전자 실적 발표", "content": f"(서울=뉴스1) {wire}"},
+        {"company_name": "SK하이닉스", "title": "", "content": ""},
+        {"company_name": "SK하이닉스", "title": "무관한 기사", "content": random_body(rng)},
+        {"company_name": "SK하이닉스", "title": "삼성전자 실적 발표", "content": f"{wire} 무단 전재 금지"},
+    ]
+    path = tmp_path / "crawling.jsonl"
+    write_corpus(path, articles)
+
+    n, clusters = find_clusters(path, threshold=0.8)
+    assert n == len(articles)
+    assert clusters == [[0, 2, 5]]
+
+
+@pytest.fixture
+def clusters_file(tmp_path):
+    path = tmp_path / "crawling.jsonl"
+    write_corpus(path, [{"company_name": c, "title": str(i)} for i, c in enumerate("AABBA")])
+    out = tmp_path / "dedup_clusters.json"
+    # 0, 2, 4 가 같은 기사 (A, B, A 회사), 1 은 단독
+    save_clusters(path, 5, [[0, 2, 4]], 0.8, out)
+    return path, out
+
+
+@pytest.mark.parametrize("policy, counted", [
+    ("all", [True, True, True, True]),
+    ("company", [True, True, True, False]),
+    ("first", [True, True, False, False]),
+])
+def test_dedup_filter_policies(clusters_file, policy, counted):
+    path, out = clusters_file
+    f = DedupFilter(path, policy, out)
+    assert [f.is_duplicate(p) for p in range(5)] == [False, False, True, False, True]
+
+    f.remember(0, ("positive", 0.9, "finbert"))
+    f.remember(1, ("negative", 0.8, "finbert"))  # 대표가 아니면 기억하지 않음
+    assert f.label_of(2) == f.label_of(4) == ("positive", 0.9, "finbert")
+    assert 1 not in f.rep_labels
+
+    got = [f.should_count(0, "A"), f.should_count(1, "A"), f.should_count(2, "B"), f.should_count(4, "A")]
+    assert got == counted
+    assert f.skipped == counted.count(False)
+
+
+def test_dedup_filter_state_round_trip(clusters_file):
+    path, out = clusters_file
+    f = DedupFilter(path, "company", out)
+    f.remember(0, ("positive", 0.9, "finbert"))
+    f.should_count(0, "A")
+    f.should_count(4, "A")
+
+    restored = DedupFilter(path, "company", out)
+    restored.load_state(json.loads(json.dumps(f.state())))
+    assert restored.rep_labels == f.rep_labels
+    assert restored.counted == f.counted
+    assert restored.skipped == f.skipped == 1
+    assert not restored.should_count(2, "A")
+
+
+def test_dedup_filter_rejects_other_input(clusters_file):
+    path, out = clusters_file
+    path.write_text(path.read_text(encoding="utf-8") + '{"company_name": "C"}\n', encoding="utf-8")
+    with pytest.raises(SystemExit):
+        DedupFilter(path, "company", out)
+
+
+def test_article_text_joins_title_and_content():
+    assert article_text({"title": "제목", "content": "본문"}) == "제목 본문"
+    assert article_text({}) == " "
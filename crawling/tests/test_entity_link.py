@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from entity_link import AhoCorasick, Attribution, EntityLinker
+
+
+def brute_force(patterns, text):
+    """
+    모든 위치에서 모든 패턴을 비교하는 기준 구현 (search 와 같은 겹침 규칙)
+    """
+    matches = [
+        (i, i + len(p), p)
+        for i in range(len(text))
+        for p in patterns
+        if p and text.startswith(p, i)
+    ]
+    matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+    chosen, end = [], 0
+    for m in matches:
+        if m[0] >= end:
+            chosen.append(m)
+            end = m[1]
+    return chosen
+
+
+def test_iter_matches_reports_overlapping_and_suffix_patterns():
+    ac = AhoCorasick({p: p for p in ["he", "she", "his", "hers"]})
+    assert sorted(ac.iter_matches("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_search_prefers_longest_non_overlapping_match():
+    ac = AhoCorasick({p: p for p in ["SK", "SK하이닉스", "하이닉스", "삼성", "삼성전자"]})
+    text = "SK하이닉스와 삼성전자, 그리고 SK"
+    assert [(text[s:e], v) for s, e, v in ac.search(text)] == [
+        ("SK하이닉스", "SK하이닉스"),
+        ("삼성전자", "삼성전자"),
+        ("SK", "SK"),
+    ]
+
+
+def test_search_ignores_empty_pattern():
+    ac = AhoCorasick({"": "x", "ab": "ab"})
+    assert ac.search("abab") == [(0, 2, "ab"), (2, 4, "ab")]
+
+
+def test_search_matches_brute_force_on_random_text():
+    rng = random.Random(0)
+    alphabet = "abc"
+    for _ in range(200):
+        patterns = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(6)}
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        ac = AhoCorasick({p: p for p in patterns})
+        assert ac.search(text) == brute_force(patterns, text), (patterns, text)
+
+
+@pytest.fixture
+def linker():
+    return EntityLinker(["삼성전자", "SK하이닉스", "SK", "LS", "대상", "현대차"])
+
+
+def test_link_orders_title_first_then_body(linker):
+    assert linker.link("현대차 실적", "삼성전자 와 SK하이닉스 이야기, 현대차 다시") == ["현대차", "삼성전자", "SK하이닉스"]
+
+
+def test_short_names_need_word_boundary_and_repeated_body_mentions(linker):
+    assert linker.link("", "SKT 와 LSAT 은 다른 단어") == []
+    assert linker.link("", "SK 가 한 번만 나오면 연결 안 함") == []
+    assert linker.link("", "SK 는 오늘, SK 가 또") == ["SK"]
+    assert linker.link("SK 그룹 소식", "") == ["SK"]
+
+
+def test_ambiguous_names_are_never_linked(linker):
+    assert linker.link("대상 기업", "이번 대상 은 대상 이다") == []
+
+
+def test_attribution_counts_each_company_once_per_url(linker):
+    attr = Attribution(linker)
+    article = {"title": "삼성전자 와 SK하이닉스", "content": ""}
+    companies = attr.companies("SK하이닉스", article)
+    assert companies == ["SK하이닉스", "삼성전자"]
+
+    assert attr.first_attribution("u1", "SK하이닉스", crawled=True)
+    assert attr.first_attribution("u1", "삼성전자", crawled=False)
+    assert not attr.first_attribution("u1", "삼성전자", crawled=False)
+    assert attr.extra_links == 1
+
+    attr.remember("u1", ("positive", 0.9, "finbert"))
+    attr.remember("u1", ("negative", 0.1, "finbert"))
+    assert attr.known("u1")
+    assert attr.label_of("u1") == ("positive", 0.9, "finbert")
+    assert attr.reused == 1
+
+
+def test_attribution_replay_restores_links(linker):
+    attr = Attribution(linker)
+    attr.replay({"sentiment_label": "negative", "sentiment_confidence": 0.7,
+                 "linked_companies": ["현대차", "삼성전자"]}, "u2")
+    assert attr.label_of("u2") == ("negative", 0.7, "finbert")
+    assert not attr.first_attribution("u2", "현대차", crawled=True)
+    assert not attr.first_attribution("u2", "삼성전자", crawled=False)
@@ -0,0 +1,94 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from sentiment_history import WINDOWS, SentimentHistory, _decay
+
+START = date(2024, 7, 1)
+POINTS = {"positive": 1, "negative": -1, "neutral": 0}
+
+
+@pytest.fixture
+def history(tmp_path):
+    h = SentimentHistory(tmp_path / "history.sqlite3")
+    yield h
+    h.close()
+
+
+def article(i: int, day: date) -> dict:
+    return {"url": f"https://n.news.naver.com/mnews/article/001/{i:010d}", "published_at": f"{day.isoformat()}T09:00:00"}
+
+
+def brute_force(added: list[tuple[date, str]], as_of: date) -> dict:
+    """윈도우 합계 / 감쇠 점수를 기사 목록에서 처음부터 다시 계산"""
+    expected = {"decayed_score": 0.0}
+    for w in WINDOWS:
+        counts = {"positive": 0, "negative": 0, "neutral": 0}
+        for day, label in added:
+            if 0 <= (as_of - day).days < w:
+                counts[label] += 1
+        counts["score"] = counts["positive"] - counts["negative"]
+        expected[f"{w}d"] = counts
+    for day, label in added:
+        age = (as_of - day).days
+        if age >= 0:
+            expected["decayed_score"] += POINTS[label] * _decay(age)
+    return expected
+
+
+def assert_trend(history, company, added, as_of):
+    trend = history.get_trend(company)
+    expected = brute_force(added, as_of)
+    assert trend["as_of"] == as_of.isoformat()
+    for w in WINDOWS:
+        assert trend[f"{w}d"] == expected[f"{w}d"], f"{w}d window"
+    assert trend["decayed_score"] == pytest.approx(expected["decayed_score"])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_running_windows_match_recomputation(history, seed):
+    rng = random.Random(seed)
+    added: list[tuple[date, str]] = []
+    # 기준일은 지금까지 들어온 기사 중 가장 늦은 날짜
+    as_of = START
+    for i in range(300):
+        # 대부분은 기준일 근처, 가끔 며칠씩 건너뛰거나 한참 예전 기사가 늦게 들어온다
+        offset = rng.choice([0, 0, 1, 2, 5, 13, -1, -3, -8, -40]) if i else 0
+        day = as_of + timedelta(days=offset)
+        label = rng.choice(list(POINTS))
+        assert history.add_label("삼성전자", article(i, day), label)
+        added.append((day, label))
+        as_of = max(as_of, day)
+        if i % 37 == 0:
+            assert_trend(history, "삼성전자", added, as_of)
+    assert_trend(history, "삼성전자", added, as_of)
+
+    # 새 기사가 없어도 advance_all 로 기준일이 옮겨지면 윈도우 밖 날짜가 빠진다
+    for jump in (1, 6, 29, 31):
+        target = as_of + timedelta(days=jump)
+        history.advance_all(target)
+        assert_trend(history, "삼성전자", added, target)
+        as_of = target
+
+
+def test_same_article_counted_once_per_company(history):
+    a = article(1, START)
+    assert history.add_label("삼성전자", a, "positive")
+    assert not history.add_label("삼성전자", a, "negative")
+    # 같은 기사라도 다른 회사에는 따로 집계
+    assert history.add_label("SK하이닉스", a, "negative")
+    assert history.get_trend("삼성전자")["1d"]["positive"] == 1
+    assert history.get_trend("SK하이닉스")["1d"]["negative"] == 1
+
+
+def test_unknown_label_is_ignored(history):
+    assert not history.add_label("삼성전자", article(1, START), None)
+    assert not history.add_label("삼성전자", article(2, START), "LABEL_3")
+    assert history.get_trend("삼성전자") is None
+
+
+def test_advance_all_leaves_current_companies_alone(history):
+    history.add_label("삼성전자", article(1, START), "positive")
+    history.advance_all(START)
+    assert history.get_trend("삼성전자")["1d"]["positive"] == 1